@@ -0,0 +1,419 @@
+import errno
+import fcntl
+import functools
+import os
+from itertools import islice
+
+import trollius as asyncio
+from trollius import From, Return
+
+from pyvertica.batch import DEFAULT_FIFO_BUFFER_SIZE, FifoWriter, VerticaBatch
+
+
+_COMMIT_POLICY_ARGUMENTS = (
+    'commit_max_rows', 'commit_max_bytes', 'commit_max_seconds')
+
+INSERT_LISTS_CHUNK_ROW_COUNT = 1000
+"""
+Number of rows :py:meth:`.AsyncVerticaBatch.insert_lists` formats before
+handing control back to the event loop.
+"""
+
+
+class AsyncFifoWriter(FifoWriter):
+    """
+    A :py:class:`~pyvertica.batch.FifoWriter` which does not block the event
+    loop.
+
+    The FIFO is opened in non-blocking mode. Writing gathers the data in
+    memory and writes as much of it as the FIFO accepts, and
+    :py:meth:`~.AsyncFifoWriter.drain` waits (without blocking the event
+    loop) until less than ``buffer_size`` bytes are buffered. This provides
+    backpressure when the ``COPY`` query is reading slower than the data is
+    produced.
+
+    :param fifo_path:
+        A ``str`` representing the path of the fifo file.
+
+    :param buffer_size:
+        An ``int`` representing the number of bytes to buffer before
+        :py:meth:`~.AsyncFifoWriter.drain` starts waiting.
+
+    :param loop:
+        The event loop used to wait for the FIFO to become writable.
+
+    """
+    def __init__(self, fifo_path, buffer_size, loop):
+        super(AsyncFifoWriter, self).__init__(fifo_path, buffer_size)
+        self.loop = loop
+        self._writable_future = None
+        self._set_blocking(False)
+
+    def _set_blocking(self, blocking):
+        """
+        Set or clear the ``O_NONBLOCK`` flag of the FIFO.
+
+        :param blocking:
+            A ``bool``.
+
+        """
+        flags = fcntl.fcntl(self._fd, fcntl.F_GETFL)
+        if blocking:
+            flags &= ~os.O_NONBLOCK
+        else:
+            flags |= os.O_NONBLOCK
+        fcntl.fcntl(self._fd, fcntl.F_SETFL, flags)
+
+    def flush(self):
+        """
+        Write as much of the buffered data as the FIFO accepts, without
+        blocking.
+        """
+        if not self._buffer_list:
+            return
+
+        if len(self._buffer_list) == 1:
+            data = self._buffer_list[0]
+        else:
+            data = ''.join(self._buffer_list)
+
+        try:
+            written = os.write(self._fd, data)
+        except OSError as e:
+            if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                raise
+            written = 0
+
+        if written:
+            data = data[written:]
+        self._buffer_list = [data] if data else []
+        self._buffer_length = len(data)
+
+    def _on_writable(self):
+        """
+        Wake up the coroutines waiting for the FIFO to become writable.
+        """
+        self.loop.remove_writer(self._fd)
+        writable_future, self._writable_future = self._writable_future, None
+        if not writable_future.done():
+            writable_future.set_result(None)
+
+    @asyncio.coroutine
+    def drain(self):
+        """
+        Wait until less than ``buffer_size`` bytes are buffered.
+
+        This is a coroutine.
+
+        """
+        while self._buffer_length >= self.buffer_size:
+            self.flush()
+            if self._buffer_length < self.buffer_size:
+                break
+
+            if self._writable_future is None:
+                self._writable_future = asyncio.Future(loop=self.loop)
+                self.loop.add_writer(self._fd, self._on_writable)
+            # the future is shared by all waiting coroutines
+            yield From(asyncio.shield(self._writable_future, loop=self.loop))
+
+    def close(self):
+        """
+        Write the remaining data and close the FIFO.
+
+        .. note:: This blocks until all the data is written, thus it should
+            be called in an executor.
+
+        """
+        try:
+            self._set_blocking(True)
+            if self._buffer_list:
+                self._write_all(''.join(self._buffer_list))
+                self._buffer_list = []
+                self._buffer_length = 0
+        finally:
+            os.close(self._fd)
+
+
+class _LoopVerticaBatch(VerticaBatch):
+    """
+    A :py:class:`~pyvertica.batch.VerticaBatch` writing to the FIFO with an
+    :py:class:`.AsyncFifoWriter`.
+    """
+    def __init__(self, loop, **kwargs):
+        super(_LoopVerticaBatch, self).__init__(**kwargs)
+        self._loop = loop
+        self._async_writer = None
+
+        # writes happen in the event loop, so no writer thread is needed
+        self._writer_queue_size = None
+        self._fifo_buffer_size = (
+            self._fifo_buffer_size or DEFAULT_FIFO_BUFFER_SIZE)
+
+    def _open_fifo(self):
+        self._async_writer = AsyncFifoWriter(
+            self._fifo_path, self._fifo_buffer_size, self._loop)
+        return self._async_writer
+
+
+class AsyncVerticaBatch(object):
+    """
+    Object for writing multiple records to Vertica in a batch, from
+    coroutines running in a (`trollius`_) event loop.
+
+    Usage example::
+
+        import trollius as asyncio
+        from trollius import From
+
+        from pyvertica.async_batch import AsyncVerticaBatch
+
+        batch = AsyncVerticaBatch(
+            odbc_kwargs={'dsn': 'VerticaDWH'},
+            table_name='schema.my_table',
+            column_list=['column_1', 'column_2'],
+        )
+
+        @asyncio.coroutine
+        def produce(row_list):
+            for row in row_list:
+                yield From(batch.insert_list(row))
+
+        @asyncio.coroutine
+        def load():
+            yield From(asyncio.gather(*[produce(rows) for rows in sources]))
+            error_bool, error_file_obj = yield From(batch.get_errors())
+            yield From(batch.commit())
+
+        asyncio.get_event_loop().run_until_complete(load())
+
+    All the methods writing data, and the methods ending the batch, are
+    coroutines. Formatting the rows and writing to the FIFO happens in the
+    event loop, without blocking it: when the ``COPY`` query is reading
+    slower than the rows are inserted, the inserting coroutines wait until
+    the FIFO is writable again (see :py:class:`.AsyncFifoWriter`). Calls
+    which block on the database (connecting, starting the ``COPY`` query,
+    :py:meth:`~.AsyncVerticaBatch.get_errors`,
+    :py:meth:`~.AsyncVerticaBatch.commit` and
+    :py:meth:`~.AsyncVerticaBatch.rollback`) are executed in the
+    ``executor``.
+
+    Any number of coroutines can insert into the same batch. The inserts are
+    serialized, and a commit or rollback waits for the pending inserts.
+
+    .. note:: This requires the `trollius`_ package.
+
+    .. _trollius: https://pypi.python.org/pypi/trollius
+
+    :param table_name:
+        A ``str`` representing the table name (including the schema) to write
+        to. Example: ``'staging.my_table'``.
+
+    :param loop:
+        The event loop to use. Default: the current event loop. *Optional*.
+
+    :param executor:
+        A :py:class:`!concurrent.futures.Executor` used to execute the
+        blocking calls. Default: ``None`` (the default executor of the event
+        loop). *Optional*.
+
+    All other keyword arguments are passed to
+    :py:class:`~pyvertica.batch.VerticaBatch`. The ``writer_queue_size``
+    argument is ignored, and ``fifo_buffer_size`` defaults to
+    :py:data:`~pyvertica.batch.DEFAULT_FIFO_BUFFER_SIZE`. The commit policy
+    arguments (``commit_max_rows``, ``commit_max_bytes`` and
+    ``commit_max_seconds``) are not supported, since the automatic commits
+    would block the event loop.
+
+    """
+    def __init__(self, table_name, loop=None, executor=None, **kwargs):
+        for name in _COMMIT_POLICY_ARGUMENTS:
+            if kwargs.get(name):
+                raise ValueError(
+                    '{0} is not supported by AsyncVerticaBatch'.format(name))
+
+        self._loop = loop or asyncio.get_event_loop()
+        self._executor = executor
+        self._batch_kwargs = dict(kwargs, table_name=table_name)
+        self._batch = None
+        self._lock = asyncio.Lock(loop=self._loop)
+
+    def _run_in_executor(self, func, *args):
+        """
+        Execute ``func`` in the executor.
+
+        :return:
+            A future.
+
+        """
+        return self._loop.run_in_executor(self._executor, func, *args)
+
+    @asyncio.coroutine
+    def _get_batch(self):
+        """
+        Return the :py:class:`~pyvertica.batch.VerticaBatch`, creating (and
+        connecting) it when needed.
+
+        This is a coroutine.
+
+        """
+        if self._batch is None:
+            self._batch = yield From(self._run_in_executor(functools.partial(
+                _LoopVerticaBatch, self._loop, **self._batch_kwargs)))
+        raise Return(self._batch)
+
+    @asyncio.coroutine
+    def _get_started_batch(self):
+        """
+        Return the :py:class:`~pyvertica.batch.VerticaBatch`, starting the
+        batch when needed.
+
+        This is a coroutine.
+
+        """
+        batch = yield From(self._get_batch())
+        if not batch._in_batch:
+            yield From(self._run_in_executor(batch._start_batch))
+        raise Return(batch)
+
+    @asyncio.coroutine
+    def _insert(self, method_name, *args):
+        """
+        Call the insert method ``method_name`` and wait until the buffered
+        data is written.
+
+        This is a coroutine.
+
+        """
+        with (yield From(self._lock)):
+            batch = yield From(self._get_started_batch())
+            getattr(batch, method_name)(*args)
+            yield From(batch._async_writer.drain())
+
+    @asyncio.coroutine
+    def _end(self, method_name):
+        """
+        Call the method ``method_name``, which ends the batch, in the
+        executor.
+
+        This is a coroutine.
+
+        """
+        with (yield From(self._lock)):
+            batch = yield From(self._get_batch())
+            result = yield From(
+                self._run_in_executor(getattr(batch, method_name)))
+        raise Return(result)
+
+    def get_batch_count(self):
+        """
+        Return the number of rows inserted since the last commit.
+
+        :return:
+            An ``int``.
+
+        """
+        if self._batch is None:
+            return 0
+        return self._batch.get_batch_count()
+
+    def get_total_count(self):
+        """
+        Return the total number of rows inserted.
+
+        :return:
+            An ``int``.
+
+        """
+        if self._batch is None:
+            return 0
+        return self._batch.get_total_count()
+
+    def insert_line(self, line_str):
+        """
+        Insert a ``str`` representing a line. See
+        :py:meth:`.VerticaBatch.insert_line`.
+
+        This is a coroutine.
+
+        """
+        return self._insert('insert_line', line_str)
+
+    def insert_list(self, value_list):
+        """
+        Insert a ``list`` of values. See
+        :py:meth:`.VerticaBatch.insert_list`.
+
+        This is a coroutine.
+
+        """
+        return self._insert('insert_list', value_list)
+
+    @asyncio.coroutine
+    def insert_lists(self, value_lists, row_count=None):
+        """
+        Insert an ``iterable`` of ``iterable`` values. See
+        :py:meth:`.VerticaBatch.insert_lists`.
+
+        The values are inserted in chunks of
+        :py:data:`.INSERT_LISTS_CHUNK_ROW_COUNT` rows, waiting for the FIFO
+        between the chunks, so a large ``iterable`` does not block the event
+        loop.
+
+        This is a coroutine.
+
+        """
+        value_lists = iter(value_lists)
+
+        with (yield From(self._lock)):
+            batch = yield From(self._get_started_batch())
+            while True:
+                chunk_list = list(
+                    islice(value_lists, INSERT_LISTS_CHUNK_ROW_COUNT))
+                if not chunk_list:
+                    break
+                batch.insert_lists(chunk_list)
+                yield From(batch._async_writer.drain())
+                # let other tasks run, also when the FIFO keeps up
+                yield From(asyncio.sleep(0, loop=self._loop))
+
+    def get_errors(self):
+        """
+        Get the errors that were raised since the last commit. See
+        :py:meth:`.VerticaBatch.get_errors`.
+
+        This is a coroutine.
+
+        """
+        return self._end('get_errors')
+
+    def commit(self):
+        """
+        Commit the current transaction.
+
+        This is a coroutine.
+
+        """
+        return self._end('commit')
+
+    def rollback(self):
+        """
+        Rollback the current transaction.
+
+        This is a coroutine.
+
+        """
+        return self._end('rollback')
+
+    @asyncio.coroutine
+    def close_batch(self):
+        """
+        Close out the batch, when it was created with ``multi_batch=True``.
+        See :py:meth:`.VerticaBatch.close_batch`.
+
+        This is a coroutine.
+
+        """
+        with (yield From(self._lock)):
+            if self._batch is not None and self._batch._batch_initialized:
+                yield From(self._run_in_executor(self._batch.close_batch))
@@ -1,14 +1,29 @@
+import array
+import bz2
 import codecs
 import copy
+import ctypes
+import ctypes.util
+import errno
+import fcntl
 import logging
+import multiprocessing
 import os
+import re
+import sys
 import tempfile
 import threading
+import time
 import taskthread
+import zlib
 from Queue import Queue
+from collections import deque, namedtuple
 from functools import wraps
+from itertools import (
+    chain, cycle, imap, islice, izip, izip_longest, repeat)
 
-from pyvertica.connection import get_connection
+from pyvertica.connection import get_connection, get_connection_list
+from pyvertica.native import get_native_row_encoder
 
 
 logger = logging.getLogger(__name__)
@@ -35,320 +50,1590 @@ def require_started_batch(func):
     return inner_func
 
 
-class Query(object):
+F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031)
+"""
+The ``fcntl`` command to resize a pipe (Linux >= 2.6.35 only).
+"""
+
+DEFAULT_FIFO_BUFFER_SIZE = 1024 * 1024
+"""
+Default ``fifo_buffer_size`` for batches writing binary data.
+"""
+
+COMPRESSION_TYPES = ('GZIP', 'BZIP')
+"""
+Supported ``compression`` types of :py:class:`.VerticaBatch`.
+"""
+
+LOAD_METHODS = ('AUTO', 'DIRECT', 'TRICKLE', 'ADAPTIVE')
+"""
+Supported ``load_method`` values of :py:class:`.VerticaBatch`.
+"""
+
+ADAPTIVE_DIRECT_MIN_BYTES = 100 * 1024 * 1024
+"""
+Batch size (in bytes) from which the ``ADAPTIVE`` load method loads
+``DIRECT`` into the ROS.
+"""
+
+ADAPTIVE_TRICKLE_MAX_BYTES = 10 * 1024 * 1024
+"""
+Batch size (in bytes) up to which the ``ADAPTIVE`` load method loads
+``TRICKLE`` into the WOS.
+"""
+
+_COMMIT_POLICY_ARGUMENTS = (
+    'commit_max_rows', 'commit_max_bytes', 'commit_max_seconds',
+    'commit_callback')
+
+NUMERIC_TYPES = (int, long, float)
+"""
+Python types which are formatted without escaping the ``ENCLOSED BY``
+character.
+"""
+
+NUMERIC_ARRAY_TYPECODES = 'bBhHiIlLfd'
+"""
+Type codes of :py:class:`!array.array` objects holding numbers.
+"""
+
+QUARANTINE_COLUMNS = (
+    'table_name', 'row_number', 'record_offset', 'reason', 'raw_data')
+"""
+Columns of the ``quarantine_table`` of :py:class:`.VerticaBatch` (following
+the ``quarantine_metadata`` columns).
+"""
+
+CONSTRAINT_CACHE_TTL = 300
+"""
+Default number of seconds the constraint metadata of a table is cached, see
+the ``constraint_cache_ttl`` argument of :py:class:`.VerticaBatch`.
+"""
+
+# (schema name, table name) => (expiry time, bool indicating if the table has
+# constraints)
+_constraint_cache = {}
+_constraint_cache_lock = threading.Lock()
+
+_EXCEPTION_RE = re.compile(r'Input record (\d+) has been rejected \((.*)\)\.')
+
+
+def _get_numeric_template(enclosed_by):
     """
-    An object that executes the ``COPY`` query for batch loading.
-
-    :param cursor:
-        A :py:mod:`!pyodbc` cursor object.
+    Return the ``%`` template for formatting numbers.
 
-    :param sql_query_str:
-        A ``str`` representing the ``COPY`` query.
+    :param enclosed_by:
+        A ``str`` representing the ``ENCLOSED BY`` character.
 
-    :param semaphore_obj:
-        An instance of :py:class:`!threading.Semaphore`.
+    :return:
+        A ``unicode`` template, or ``None`` when the string representation of
+        a number could contain the ``ENCLOSED BY`` character (in that case
+        numbers need to be escaped).
 
-    :param fifo_path:
-        A ``str`` representing the path of the fifo file.
+    """
+    if not enclosed_by or any(
+            char.isalnum() or char in '.+-' for char in enclosed_by):
+        return None
+    return u'{0}%s{0}'.format(enclosed_by.replace('%', '%%'))
 
-    :param exc_queue:
-        An instance of class:`Queue.Queue` instance to put exceptions in.
 
+def _get_value_formatter(copy_options_dict, value_type=None):
     """
+    Return a function formatting a single column value.
+
+    :param copy_options_dict:
+        A ``dict`` containing the copy options (see
+        :py:attr:`.VerticaBatch.copy_options_dict`).
+
+    :param value_type:
+        The expected Python type of the column values. When this is one of
+        :py:data:`.NUMERIC_TYPES`, the values will not be escaped. When
+        ``None``, the type will be determined for every value. Any other type
+        results in the value being converted to ``unicode`` and escaped.
+        *Optional*.
+
+    :return:
+        A function taking one value and returning a ``unicode`` object.
 
-    daemon = True
     """
-    If the script is interrupted (^C) it will kill all threads marked as daemon
-    if only those are left.
+    enclosed_by = copy_options_dict['ENCLOSED BY']
+    escaped_enclosed_by = '\\%s' % enclosed_by
+    numeric_template = _get_numeric_template(enclosed_by)
+
+    def format_text(value):
+        if value is None:
+            return ''
+        return (enclosed_by +
+                unicode(value).replace(enclosed_by, escaped_enclosed_by) +
+                enclosed_by)
+
+    def format_numeric(value):
+        if value is None:
+            return ''
+        return numeric_template % value
+
+    def format_any(value):
+        if value is None:
+            return ''
+        if type(value) in NUMERIC_TYPES:
+            return numeric_template % value
+        return (enclosed_by +
+                unicode(value).replace(enclosed_by, escaped_enclosed_by) +
+                enclosed_by)
+
+    if numeric_template is None:
+        return format_text
+    if value_type is None:
+        return format_any
+    if value_type in NUMERIC_TYPES:
+        return format_numeric
+    return format_text
+
+
+def get_row_serializer(copy_options_dict, column_type_list=None):
     """
+    Return a function converting an ``iterable`` of values to a ``unicode``
+    object representing one record (without ``RECORD TERMINATOR``).
 
-    def __init__(
-            self, cursor, sql_query_str, fifo_path, exc_queue):
-        super(Query, self).__init__()
-        self.cursor = cursor
-        self.sql_query_str = sql_query_str
-        self.exc_queue = exc_queue
-        self.fifo_path = fifo_path
+    All the lookups that do not depend on the values (delimiter, enclosing
+    and escaping characters, the formatter per column) are done once, when
+    creating the serializer.
 
-    def run_query(self):
-        """
-        Handle executing the SQL query.
+    Usage example::
 
-        This method is intended to be called on a task_thread.
+        serialize_row = get_row_serializer(
+            VerticaBatch.copy_options_dict, [int, unicode])
+        serialize_row([1, 'foo'])  # u'"1";"foo"'
 
-        """
-        logger.debug('Query started with SQL statement: {0}'.format(
-            self.sql_query_str))
-        try:
-            self.cursor.execute(self.sql_query_str)
-        except Exception as e:
-            logger.exception('Something unexpected happened')
+    :param copy_options_dict:
+        A ``dict`` containing the copy options (see
+        :py:attr:`.VerticaBatch.copy_options_dict`).
 
-            # the exception will be re-raised in the main thread
-            self.exc_queue.put(e)
+    :param column_type_list:
+        A ``list`` containing the expected Python type (or ``None`` when
+        unknown) for every column. Columns of a type in
+        :py:data:`.NUMERIC_TYPES` skip the escaping step, thus make sure all
+        non-``None`` values in these columns are of such type. Values beyond
+        the length of this list are formatted according their own type.
+        *Optional*.
 
-            # we need to consume the fifo, to make sure it isn't blocking the
-            # write (and thus hanging forever).
-            for line in codecs.open(self.fifo_path, 'r', 'utf-8'):
-                pass
+    :return:
+        A function taking an ``iterable`` and returning a ``unicode`` object.
 
-        logger.debug('Query done')
+    """
+    delimiter = copy_options_dict['DELIMITER']
+    format_any = _get_value_formatter(copy_options_dict)
 
+    if not column_type_list:
+        def serialize_row(value_list):
+            return delimiter.join(map(format_any, value_list))
+        return serialize_row
 
-class VerticaBatch(object):
-    """
-    Object for writing multiple records to Vertica in a batch.
+    formatter_list = [
+        _get_value_formatter(copy_options_dict, value_type)
+        for value_type in column_type_list]
+    remaining_formatters = repeat(format_any)
 
-    Usage example::
+    def serialize_row(value_list):
+        return delimiter.join([
+            format_value(value) for format_value, value in izip(
+                chain(formatter_list, remaining_formatters), value_list)])
 
-        from pyvertica.batch import VerticaBatch
+    return serialize_row
 
-        batch = VerticaBatch(
-            odbc_kwargs={'dsn': 'VerticaDWH'},
-            table_name='schema.my_table',
-            truncate=True,
-            column_list=['column_1', 'column_2'],
-            copy_options={
-                'DELIMITER': ',',
-            },
-            multi_batch=False
-        )
 
-        row_list = [
-            ['row_1_val_1', 'row_1_val_2'],
-            ['row_2_val_1', 'row_2_val_2'],
-            ...
-        ]
+def _format_column(copy_options_dict, column, value_type=None):
+    """
+    Format all the values of one column.
 
-        for column_data_list in row_list:
-            batch.insert_list(column_data_list)
+    Columns of :py:class:`!array.array` or NumPy arrays holding numbers are
+    formatted as numbers, regardless of ``value_type``. These objects are
+    converted to a ``list`` first with their ``tolist`` method (for NumPy
+    masked arrays, this results in ``None`` for masked values). When a
+    numeric column does not contain any ``None`` values, all values are
+    formatted without calling a Python function per value.
 
-        error_bool, error_file_obj = batch.get_errors()
+    :param copy_options_dict:
+        A ``dict`` containing the copy options (see
+        :py:attr:`.VerticaBatch.copy_options_dict`).
 
-        if error_bool:
-            print error_file_obj.read()
+    :param column:
+        A sequence of values.
 
-        batch.commit()
+    :param value_type:
+        The expected Python type of the column values. See
+        :py:func:`.get_row_serializer`. *Optional*.
 
-    .. note:: It is also possible to call :py:meth:`~.VerticaBatch.commit`
-        multiple times (for example after every 50000 records). Please note
-        that after the first insert and after calling
-        :py:meth:`~.VerticaBatch.commit`, the output of
-        :py:meth:`~.VerticaBatch.get_errors` will reflect the new series of
-        inserts and thus not contain the "old" inserts.
+    :return:
+        A ``list`` of ``unicode`` objects.
 
-    .. note:: Creating a new batch object will not create a lock on the target
-        table. This will happen only after first insert.
+    """
+    if hasattr(column, 'tolist'):
+        if (getattr(column, 'typecode', None) in NUMERIC_ARRAY_TYPECODES or
+                getattr(getattr(column, 'dtype', None), 'kind', None) in (
+                    'i', 'u', 'f')):
+            value_type = float
+        column = column.tolist()
+    elif not isinstance(column, (list, tuple)):
+        column = list(column)
 
-    .. note:: If a batch is created with ``multi_batch = True``,
-        :py:meth:`~.VerticaBatch.close_batch` must be explicity called when
-        the batch resources should be closed. If ``multi_batch`` is set to
-        ``False``, :py:meth:`~.VerticaBatch.close_batch` need not be called.
-        In this case, while the batch is reusable, the system resources will
-        be realoccated uppon each :py:meth:`~.VerticaBatch.commit`, which
-        may not be desirable.
+    numeric_template = _get_numeric_template(copy_options_dict['ENCLOSED BY'])
+    if (value_type in NUMERIC_TYPES and numeric_template is not None and
+            None not in column):
+        return map(numeric_template.__mod__, column)
 
-    :param table_name:
-        A ``str`` representing the table name (including the schema) to write
-        to. Example: ``'staging.my_table'``.
+    return map(_get_value_formatter(copy_options_dict, value_type), column)
 
-    :param odbc_kwargs:
-        A ``dict`` containing the ODBC connection keyword arguments. E.g.::
 
-            {
-                'dsn': 'TestDSN',
-            }
+def _serialize_chunk(arguments):
+    """
+    Serialize a chunk of rows to an UTF-8 encoded ``str``.
 
-        .. seealso:: https://code.google.com/p/pyodbc/wiki/Module
+    This is intended to be executed in a :py:mod:`!multiprocessing` worker
+    process, see :py:meth:`.VerticaBatch.insert_lists`.
 
-    :param truncate_table:
-        A ``bool`` indicating if the table needs truncating before first
-        insert. Default: ``False``. *Optional*.
+    :param arguments:
+        A ``tuple`` containing the copy options ``dict``, the column type
+        ``list``, the native type ``list`` (or ``None`` when not using the
+        native format) and a ``list`` of rows.
 
-    :param reconnect:
-        A ``bool`` passed to the connection object to decide if pyvertica
-        should directly reconnect to a random node to bypass a load balancer.
+    :return:
+        A ``tuple`` containing the encoded ``str`` and the number of rows.
 
-    :param analyze_constraints:
-        A ``bool`` indicating if a ``ANALYZE_CONSTRAINTS`` startement should
-        be executed when getting errors. Default: ``True``. *Optional*.
+    """
+    copy_options_dict, column_type_list, native_type_list, value_lists = (
+        arguments)
 
-    :param column_list:
-        A ``list`` containing the columns that will be written. *Optional*.
+    if native_type_list:
+        encode_row = get_native_row_encoder(native_type_list)[1]
+        data = ''.join([encode_row(value_list) for value_list in value_lists])
+        return (data, len(value_lists))
 
-    :param copy_options:
-        A ``dict`` containing the keys to override. For a list of existing keys
-        and their defaults, see :py:attr:`~.VerticaBatch.copy_options_dict`.
-        *Optional*.
+    serialize_row = get_row_serializer(copy_options_dict, column_type_list)
+    suffix = copy_options_dict['RECORD TERMINATOR']
 
-    :param connection:
-        A ``pyodbc.Connection`` to use instead of opening a new connection. If
-        this parameter is supplied, ``odbc_kwargs`` may not be supplied.
-        Default: ``None``. *Optional*.
+    data = u''.join([serialize_row(value_list) + suffix
+                     for value_list in value_lists])
+    return (data.encode('utf-8'), len(value_lists))
 
-    :param multi_batch:
-        A ``boolean`` to indicate if the batch should keep it's resources open
-        after a call to commit. If you plan to only call
-        :py:meth:`~.VerticaBatch.commit` one time, set this to false.
-        Otherwise, setting ``multi_batch=True`` will prevent the batch from
-        closing all of its resources.
-        Default: ``False``. *Optional*.
 
+def _get_libc_sendfile():
     """
-    copy_options_dict = {
-        'DELIMITER': ';',
-        'ENCLOSED BY': '"',
-        'SKIP': 0,
-        'NULL': '',
-        'RECORD TERMINATOR': '\x01',
-        'NO COMMIT': True,
-        'REJECTEDFILE': __debug__,
-        'REJECTMAX': 0,
-    }
-    """
-    Default copy options for SQL query.
+    Return the ``sendfile`` function of the C library (Linux only).
 
-    .. note:: By default ``REJECTEDFILE`` is set to ``__debug__``, which is
-       ``True``, unless you've set the ``PYTHONOPTIMIZE`` environment variable.
+    :return:
+        A :py:mod:`!ctypes` function, or ``None`` when not available.
 
     """
+    if not sys.platform.startswith('linux'):
+        return None
 
-    def __init__(
-            self,
-            table_name,
-            odbc_kwargs={},
-            truncate_table=False,
-            reconnect=True,
-            analyze_constraints=True,
-            column_list=[],
-            copy_options={},
-            connection=None,
-            multi_batch=False):
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        sendfile = libc.sendfile
+    except (OSError, AttributeError):
+        return None
 
-        if connection and odbc_kwargs:
-            raise ValueError("May only specify one of "
-                             "[connection, odbc_kwargs]")
+    sendfile.argtypes = [
+        ctypes.c_int, ctypes.c_int, ctypes.c_void_p, ctypes.c_size_t]
+    sendfile.restype = ctypes.c_ssize_t
+    return sendfile
 
-        self._odbc_kwargs = odbc_kwargs
-        self._table_name = table_name
-        self._column_list = column_list
-        self._analyze_constraints = analyze_constraints
-        self.copy_options_dict.update(copy_options)
-        self._batch_initialized = False
-        self._multi_batch = multi_batch
 
-        self._total_count = 0
-        self._batch_count = 0
+_libc_sendfile = _get_libc_sendfile()
 
-        self._in_batch = False
 
-        if not connection:
-            # make sure we are not logging any passwords :)
-            odbc_kwargs_copy = copy.deepcopy(odbc_kwargs)
-            if 'password' in odbc_kwargs_copy:
-                odbc_kwargs_copy['password'] = '*****'
-            logger.debug(
-                'Initializing VerticaBatch with odbc_kwargs={0}, '
-                'table_name={1}, '
-                'column_list={2}'.format(
-                    odbc_kwargs_copy, table_name, column_list))
-            self._connection = get_connection(
-                reconnect=reconnect, **self._odbc_kwargs)
-        else:
-            self._connection = connection
+def copy_file_to_fd(in_fd, out_fd, chunk_size=DEFAULT_FIFO_BUFFER_SIZE):
+    """
+    Copy the data from ``in_fd`` (from its current offset) to ``out_fd``.
 
-        self._cursor = self._connection.cursor()
+    On Linux, the data is copied by the kernel with ``sendfile(2)``, so it
+    never passes through Python objects. When ``sendfile`` is not available
+    (or does not support the file descriptors), the data is copied with
+    :py:func:`!os.read` and :py:func:`!os.write`.
 
-        # truncate table, if needed
-        if truncate_table:
-            self._truncate_table()
+    :param in_fd:
+        An ``int`` representing the file descriptor to read from.
 
-    def _truncate_table(self):
-        """
-        Truncate table.
-        """
-        logger.info('Truncating table {0}'.format(self._table_name))
-        self._cursor.execute('TRUNCATE TABLE {0}'.format(self._table_name))
+    :param out_fd:
+        An ``int`` representing the file descriptor to write to (e.g. a
+        FIFO).
 
-    def _initialize_batch(self):
+    :param chunk_size:
+        An ``int`` representing the maximum number of bytes to copy at
+        once. Default: :py:data:`.DEFAULT_FIFO_BUFFER_SIZE`. *Optional*.
 
-        self._query_exc_queue = Queue()
+    :return:
+        An ``int`` representing the number of bytes copied.
 
-        # create FIFO
-        self._fifo_path = os.path.join(tempfile.mkdtemp(), 'fifo')
-        os.mkfifo(self._fifo_path)
+    """
+    copied = 0
+
+    if _libc_sendfile is not None:
+        while True:
+            sent = _libc_sendfile(out_fd, in_fd, None, chunk_size)
+            if sent > 0:
+                copied += sent
+                continue
+            if sent == 0:
+                return copied
+
+            error = ctypes.get_errno()
+            if error == errno.EINTR:
+                continue
+            if error in (errno.EINVAL, errno.ENOSYS) and not copied:
+                # not supported for these file descriptors
+                break
+            raise OSError(error, os.strerror(error))
+
+    while True:
+        data = os.read(in_fd, chunk_size)
+        if not data:
+            return copied
+
+        offset = 0
+        while offset < len(data):
+            offset += os.write(out_fd, buffer(data, offset))
+        copied += len(data)
+
+
+def iter_record_chunks(data, terminator, chunk_size=DEFAULT_FIFO_BUFFER_SIZE,
+                       start=0):
+    """
+    Return the boundaries of chunks of (about) ``chunk_size`` bytes, which
+    contain complete records only.
 
-        # create rejected file obj
-        if self.copy_options_dict['REJECTEDFILE']:
-            self._rejected_file_obj = tempfile.NamedTemporaryFile(bufsize=0)
-        self._query = Query(
-            self._cursor,
-            self._get_sql_lcopy_str(),
-            self._fifo_path,
-            self._query_exc_queue,
-        )
+    Every chunk is extended up to (and including) the first ``terminator``
+    after ``chunk_size`` bytes, thus only the last chunk can end with an
+    incomplete record. Example::
 
-        self._query_thread = taskthread.TaskThread(self._query.run_query)
+        file_obj = open('/data/export.csv', 'rb')
+        data = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
 
-        # Start the thread so run_task can be called
-        self._query_thread.start()
-        self._batch_initialized = True
+        for start, end in iter_record_chunks(data, '\\n'):
+            batch.insert_raw(data[start:end])
 
-    def _start_batch(self):
-        """
-        Start the batch.
+    :param data:
+        A ``str`` or :py:class:`!mmap.mmap` object (any object with a
+        ``find`` method and a length).
 
-        This will create the FIFO file, a temporary file for the rejected
-        inserts and this will setup and start the :py:class:`.QueryThread`.
+    :param terminator:
+        A ``str`` representing the record terminator.
 
-        """
-        self._in_batch = True
-        self._batch_count = 0
-        if not self._batch_initialized:
-            self._initialize_batch()
+    :param chunk_size:
+        An ``int`` representing the minimum size of a chunk in bytes.
+        Default: :py:data:`.DEFAULT_FIFO_BUFFER_SIZE`. *Optional*.
 
-        self._query_thread.run_task()
+    :param start:
+        An ``int`` representing the offset to start at, which must be the
+        start of a record. Default: ``0``. *Optional*.
 
-        logger.debug('Opening FIFO')
-        self._fifo_obj = codecs.open(self._fifo_path, 'w', 'utf-8')
+    :return:
+        An iterator of ``tuple`` objects containing the start and end offset
+        of every chunk.
 
-        logger.debug('Batch started')
+    """
+    length = len(data)
 
-    @require_started_batch
-    def _end_batch(self):
-        """
-        End the batch.
+    while start < length:
+        end = data.find(terminator, start + chunk_size - len(terminator))
+        if end == -1:
+            end = length
+        else:
+            end += len(terminator)
 
-        This waits for the current query to finish, and executes
-        close_batch if multi_batch is false.
+        yield (start, end)
+        start = end
 
-        """
-        ended_clean = True
 
-        logger.debug('Closing FIFO')
-        # The Query task will stop when there is nothing writing to
-        # the fifo. This should force the current task to end.
-        self._fifo_obj.close()
+class RejectedRow(namedtuple(
+        'RejectedRow', ['row_number', 'raw', 'reason', 'offset'])):
+    """
+    A row rejected by the ``COPY`` query, as returned by
+    :py:meth:`.VerticaBatch.iter_rejected`.
 
-        logger.debug('Waiting for COPY Query to finish')
-        if not self._query_thread.join_task(2):
-            logger.warn('Error shutting down task thread!')
-        else:
-            logger.debug('Query task finished')
+    :param row_number:
+        An ``int`` representing the number of the input record within the
+        batch (starting at 1), or ``None`` when unknown.
 
-        if not self._multi_batch:
-            ended_clean = self.close_batch() and ended_clean
+    :param raw:
+        A ``str`` containing the rejected record (without the
+        ``RECORD TERMINATOR``), or ``None`` when unknown.
 
-        self._in_batch = False
-        return ended_clean
+    :param reason:
+        A ``str`` representing the reason of the rejection, or ``None`` when
+        unknown.
 
-    def close_batch(self):
-        """
-        Close out the batch.
+    :param offset:
+        An ``int`` representing the byte offset of the record within the
+        data inserted in the batch, or ``None`` when the batch has no
+        ``record_index``.
 
-        This will remove the FIFO file and stop the ``taskthread.TaskThread``.
+    """
+    __slots__ = ()
 
-        """
+
+def _iter_records(file_obj, terminator, chunk_size=DEFAULT_FIFO_BUFFER_SIZE):
+    """
+    Iterate over the records of ``file_obj``, reading ``chunk_size`` bytes
+    at a time.
+
+    :param file_obj:
+        A file-like object.
+
+    :param terminator:
+        A ``str`` representing the record terminator.
+
+    :return:
+        An iterator of ``str`` objects (without the ``terminator``).
+
+    """
+    tail = ''
+
+    for chunk in iter(lambda: file_obj.read(chunk_size), ''):
+        record_list = (tail + chunk).split(terminator)
+        tail = record_list.pop()
+        for record in record_list:
+            yield record
+
+    if tail:
+        yield tail
+
+
+def _decode_rejected(data):
+    """
+    Decode the rejected ``data``, which is not necessarily valid UTF-8.
+
+    :param data:
+        A ``str`` or ``None``.
+
+    :return:
+        A ``unicode`` object or ``None``.
+
+    """
+    if data is None:
+        return None
+    return data.decode('utf-8', 'replace')
+
+
+def _parse_exception(line):
+    """
+    Parse a line of the ``EXCEPTIONS`` file of a ``COPY`` query.
+
+    :param line:
+        A ``str`` like ``'COPY: Input record 3 has been rejected (Too few
+        columns found).  Please see ...'``.
+
+    :return:
+        A ``tuple`` containing the record number (or ``None``) and the
+        reason.
+
+    """
+    match = _EXCEPTION_RE.search(line)
+    if match is None:
+        return (None, line.rstrip('\n'))
+    return (int(match.group(1)), match.group(2))
+
+
+def _iter_rejected_rows(rejected_path, exceptions_path, terminator=None,
+                        record_lengths=None):
+    """
+    Iterate over the rejected rows, combining the ``REJECTED DATA`` file and
+    the ``EXCEPTIONS`` file of a ``COPY`` query.
+
+    The n-th record of the rejected data belongs to the n-th line of the
+    exceptions. Both files are read lazily.
+
+    :param rejected_path:
+        A ``str`` representing the path of the ``REJECTED DATA`` file.
+
+    :param exceptions_path:
+        A ``str`` representing the path of the ``EXCEPTIONS`` file.
+
+    :param terminator:
+        A ``str`` representing the record terminator, or ``None`` when the
+        rejected data can not be split into records (native format).
+        *Optional*.
+
+    :param record_lengths:
+        An :py:class:`!array.array` containing the length in bytes of every
+        record inserted, used to resolve the offset of the rejected rows.
+        *Optional*.
+
+    :return:
+        An iterator of :py:class:`.RejectedRow` objects.
+
+    """
+    # the index and offset of the last resolved record, since the rows are
+    # rejected in order the lengths are summed only once
+    index = 0
+    offset = 0
+
+    with open(rejected_path, 'rb') as rejected_file_obj:
+        with open(exceptions_path, 'rb') as exceptions_file_obj:
+            if terminator:
+                record_iter = _iter_records(rejected_file_obj, terminator)
+            else:
+                record_iter = iter([])
+
+            for raw, line in izip_longest(record_iter, exceptions_file_obj):
+                if line is None:
+                    row_number, reason = (None, None)
+                else:
+                    row_number, reason = _parse_exception(line)
+
+                row_offset = None
+                if record_lengths is not None and row_number is not None \
+                        and row_number <= len(record_lengths):
+                    if row_number - 1 < index:
+                        index, offset = (0, 0)
+                    offset += sum(record_lengths[index:row_number - 1])
+                    index = row_number - 1
+                    row_offset = offset
+
+                yield RejectedRow(row_number, raw, reason, row_offset)
+
+
+class FifoWriter(object):
+    """
+    A buffered writer writing UTF-8 encoded data to the FIFO.
+
+    Data is gathered in memory until ``buffer_size`` bytes are available, and
+    then written to the FIFO with a single :py:func:`!os.write` call. On Linux
+    the capacity of the pipe is increased to (at most) ``buffer_size`` bytes,
+    so that the reading side can consume the data in large blocks as well.
+
+    :param fifo_path:
+        A ``str`` representing the path of the fifo file.
+
+    :param buffer_size:
+        An ``int`` representing the number of bytes to buffer before writing.
+
+    """
+    def __init__(self, fifo_path, buffer_size):
+        self.fifo_path = fifo_path
+        self.buffer_size = buffer_size
+        self._buffer_list = []
+        self._buffer_length = 0
+        self._fd = os.open(fifo_path, os.O_WRONLY)
+        self._set_pipe_size()
+
+    def _set_pipe_size(self):
+        """
+        Try to resize the pipe to ``buffer_size`` bytes.
+
+        The size is capped to the system-wide maximum for unprivileged users.
+        Failing to resize the pipe is not considered an error.
+
+        """
+        if not sys.platform.startswith('linux'):
+            return
+
+        pipe_size = self.buffer_size
+        try:
+            with open('/proc/sys/fs/pipe-max-size') as file_obj:
+                pipe_size = min(pipe_size, int(file_obj.read()))
+            fcntl.fcntl(self._fd, F_SETPIPE_SZ, pipe_size)
+        except (IOError, ValueError) as e:
+            logger.debug('Unable to resize pipe to {0} bytes: {1}'.format(
+                pipe_size, e))
+
+    def _write_all(self, data):
+        """
+        Write all of ``data`` to the FIFO.
+
+        :param data:
+            A ``str`` to write.
+
+        """
+        offset = 0
+        length = len(data)
+        while offset < length:
+            offset += os.write(self._fd, buffer(data, offset))
+
+    def write(self, data):
+        """
+        Write ``data`` to the buffer, flushing it when it is full.
+
+        :param data:
+            A ``unicode`` object (which will be encoded as UTF-8) or an
+            already encoded ``str``.
+
+        """
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
+
+        self._buffer_list.append(data)
+        self._buffer_length += len(data)
+
+        if self._buffer_length >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered data to the FIFO.
+        """
+        if not self._buffer_list:
+            return
+
+        if len(self._buffer_list) == 1:
+            data = self._buffer_list[0]
+        else:
+            data = ''.join(self._buffer_list)
+
+        self._buffer_list = []
+        self._buffer_length = 0
+        self._write_all(data)
+
+    def fileno(self):
+        """
+        Return the file descriptor of the FIFO.
+
+        :return:
+            An ``int``.
+
+        """
+        return self._fd
+
+    def close(self):
+        """
+        Flush the buffer and close the FIFO.
+        """
+        try:
+            self.flush()
+        finally:
+            os.close(self._fd)
+
+
+class CompressingWriter(object):
+    """
+    A writer compressing the data before writing it to another writer.
+
+    :param writer:
+        The writer (e.g. a :py:class:`.FifoWriter`) to write the compressed
+        data to.
+
+    :param compression:
+        A ``str`` representing the compression, one of
+        :py:data:`.COMPRESSION_TYPES`.
+
+    :param compression_level:
+        An ``int`` between ``1`` (fastest) and ``9`` (smallest output).
+        Default: ``None`` (the default level of the compression library).
+        *Optional*.
+
+    """
+    def __init__(self, writer, compression, compression_level=None):
+        self.writer = writer
+
+        if compression == 'GZIP':
+            if compression_level is None:
+                compression_level = zlib.Z_DEFAULT_COMPRESSION
+            # adding 16 to the window size produces a gzip header and trailer
+            self._compressor = zlib.compressobj(
+                compression_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif compression == 'BZIP':
+            if compression_level is None:
+                compression_level = 9
+            self._compressor = bz2.BZ2Compressor(compression_level)
+        else:
+            raise ValueError(
+                'Unsupported compression: {0}'.format(compression))
+
+    def write(self, data):
+        """
+        Compress ``data`` and write it (when available) to the writer.
+
+        :param data:
+            A ``unicode`` object (which will be encoded as UTF-8) or an
+            already encoded ``str``.
+
+        """
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
+
+        compressed_data = self._compressor.compress(data)
+        if compressed_data:
+            self.writer.write(compressed_data)
+
+    def close(self):
+        """
+        Write the remaining compressed data and close the writer.
+        """
+        try:
+            self.writer.write(self._compressor.flush())
+        finally:
+            self.writer.close()
+
+
+class ThreadedWriter(object):
+    """
+    A writer which executes the writes of another writer in a separate
+    thread.
+
+    This decouples the producer of the data from the writes to the FIFO:
+    when the ``COPY`` query is (temporarily) not reading, the caller can
+    continue to produce data until the queue is full.
+
+    Data is gathered in chunks of ``chunk_size`` bytes, which are passed to
+    the thread through a queue holding at most ``max_queue_bytes`` bytes
+    (a single chunk is always accepted, even when it is larger).
+
+    An exception raised in the thread is re-raised on every following call
+    to :py:meth:`~.ThreadedWriter.write`, :py:meth:`~.ThreadedWriter.flush`
+    and :py:meth:`~.ThreadedWriter.close`.
+
+    :param writer:
+        The writer (e.g. a :py:class:`.FifoWriter`) to write to.
+
+    :param chunk_size:
+        An ``int`` representing the size of the chunks in bytes. Default:
+        :py:data:`.DEFAULT_FIFO_BUFFER_SIZE`. *Optional*.
+
+    :param max_queue_bytes:
+        An ``int`` representing the maximum number of bytes in the queue.
+        Default: four times :py:data:`.DEFAULT_FIFO_BUFFER_SIZE`.
+        *Optional*.
+
+    """
+    def __init__(
+            self,
+            writer,
+            chunk_size=DEFAULT_FIFO_BUFFER_SIZE,
+            max_queue_bytes=4 * DEFAULT_FIFO_BUFFER_SIZE):
+        self.writer = writer
+        self.chunk_size = chunk_size
+        self.max_queue_bytes = max_queue_bytes
+        self.exception = None
+
+        self._buffer_list = []
+        self._buffer_length = 0
+
+        self._chunk_queue = deque()
+        self._queue_length = 0
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _put_chunk(self, data):
+        """
+        Put a chunk in the queue, blocking while the queue is full.
+
+        :param data:
+            A ``str``, or ``None`` to stop the thread.
+
+        """
+        length = len(data) if data is not None else 0
+
+        with self._condition:
+            while (self._queue_length and
+                    self._queue_length + length > self.max_queue_bytes):
+                self._condition.wait()
+            self._chunk_queue.append(data)
+            self._queue_length += length
+            self._condition.notify_all()
+
+    def _get_chunk(self):
+        """
+        Get a chunk from the queue, blocking while the queue is empty.
+
+        :return:
+            A ``str``, or ``None`` when the thread must stop.
+
+        """
+        with self._condition:
+            while not self._chunk_queue:
+                self._condition.wait()
+            data = self._chunk_queue.popleft()
+            if data is not None:
+                self._queue_length -= len(data)
+            self._condition.notify_all()
+        return data
+
+    def _run(self):
+        """
+        Write the chunks from the queue, until ``None`` is received.
+        """
+        try:
+            for data in iter(self._get_chunk, None):
+                self.writer.write(data)
+            self.writer.close()
+        except Exception as e:
+            logger.exception('Something unexpected happened')
+
+            # the exception will be re-raised in the main thread
+            self.exception = e
+
+            # make sure the reading side of the FIFO gets an end-of-file
+            try:
+                self.writer.close()
+            except Exception:
+                pass
+
+            # we need to consume the queue, to make sure it isn't blocking
+            # the write (and thus hanging forever).
+            for data in iter(self._get_chunk, None):
+                pass
+
+    def _raise_exception(self):
+        """
+        Re-raise the exception raised within the thread (if any).
+        """
+        if self.exception is not None:
+            raise self.exception
+
+    def write(self, data):
+        """
+        Write ``data`` to the buffer, passing it to the thread when it is
+        full.
+
+        :param data:
+            A ``unicode`` object (which will be encoded as UTF-8) or an
+            already encoded ``str``.
+
+        """
+        self._raise_exception()
+
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
+
+        self._buffer_list.append(data)
+        self._buffer_length += len(data)
+
+        if self._buffer_length >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Pass the buffered data to the thread.
+        """
+        self._raise_exception()
+
+        if not self._buffer_list:
+            return
+
+        self._put_chunk(''.join(self._buffer_list))
+        self._buffer_list = []
+        self._buffer_length = 0
+
+    def close(self):
+        """
+        Flush the buffer, wait for the thread to write all data and close the
+        writer.
+        """
+        try:
+            self.flush()
+        finally:
+            self._put_chunk(None)
+            self._thread.join()
+        self._raise_exception()
+
+
+class MeteredWriter(object):
+    """
+    A writer measuring the bytes written to, and the time spent in, another
+    writer.
+
+    The time spent in :py:meth:`~.MeteredWriter.write` is the time the
+    caller was blocked on writing to the FIFO (or on the queue of a
+    :py:class:`.ThreadedWriter`).
+
+    :param writer:
+        The writer to write to.
+
+    :param encode:
+        A ``bool`` indicating if ``unicode`` data must be encoded as UTF-8
+        before writing it to ``writer``. Set this to ``False`` when the
+        writer only accepts ``unicode`` objects. Default: ``True``.
+        *Optional*.
+
+    :param timed:
+        A ``bool`` indicating if the time spent in ``writer`` should be
+        measured. This costs two :py:func:`!time.time` calls per write.
+        Default: ``True``. *Optional*.
+
+    """
+    def __init__(self, writer, encode=True, timed=True):
+        self.writer = writer
+        self.encode = encode
+        self.timed = timed
+        self.bytes_written = 0
+        self.write_time = 0.0
+
+    def write(self, data):
+        """
+        Write ``data`` to the writer.
+
+        :param data:
+            A ``unicode`` object or an UTF-8 encoded ``str``.
+
+        """
+        if isinstance(data, unicode):
+            if self.encode:
+                data = data.encode('utf-8')
+                self.bytes_written += len(data)
+            else:
+                self.bytes_written += len(data.encode('utf-8'))
+        else:
+            self.bytes_written += len(data)
+
+        if not self.timed:
+            self.writer.write(data)
+            return
+
+        start_time = time.time()
+        self.writer.write(data)
+        self.write_time += time.time() - start_time
+
+    def close(self):
+        """
+        Close the writer.
+        """
+        start_time = time.time()
+        try:
+            self.writer.close()
+        finally:
+            self.write_time += time.time() - start_time
+
+
+class Query(object):
+    """
+    An object that executes the ``COPY`` query for batch loading.
+
+    :param cursor:
+        A :py:mod:`!pyodbc` cursor object.
+
+    :param sql_query_str:
+        A ``str`` representing the ``COPY`` query.
+
+    :param semaphore_obj:
+        An instance of :py:class:`!threading.Semaphore`.
+
+    :param fifo_path:
+        A ``str`` representing the path of the fifo file.
+
+    :param exc_queue:
+        An instance of class:`Queue.Queue` instance to put exceptions in.
+
+    """
+
+    daemon = True
+    """
+    If the script is interrupted (^C) it will kill all threads marked as daemon
+    if only those are left.
+    """
+
+    def __init__(
+            self, cursor, sql_query_str, fifo_path, exc_queue):
+        super(Query, self).__init__()
+        self.cursor = cursor
+        self.sql_query_str = sql_query_str
+        self.exc_queue = exc_queue
+        self.fifo_path = fifo_path
+        self.execution_time = None
+
+    def run_query(self):
+        """
+        Handle executing the SQL query.
+
+        This method is intended to be called on a task_thread.
+
+        """
+        logger.debug('Query started with SQL statement: {0}'.format(
+            self.sql_query_str))
+        self.execution_time = None
+        start_time = time.time()
+        try:
+            self.cursor.execute(self.sql_query_str)
+            self.execution_time = time.time() - start_time
+        except Exception as e:
+            logger.exception('Something unexpected happened')
+
+            # the exception will be re-raised in the main thread
+            self.exc_queue.put(e)
+
+            # we need to consume the fifo, to make sure it isn't blocking the
+            # write (and thus hanging forever). The data is read as bytes,
+            # since it is not necessarily text.
+            with open(self.fifo_path, 'rb') as fifo_obj:
+                while fifo_obj.read(1024 * 1024):
+                    pass
+
+        logger.debug('Query done')
+
+
+class VerticaBatch(object):
+    """
+    Object for writing multiple records to Vertica in a batch.
+
+    Usage example::
+
+        from pyvertica.batch import VerticaBatch
+
+        batch = VerticaBatch(
+            odbc_kwargs={'dsn': 'VerticaDWH'},
+            table_name='schema.my_table',
+            truncate=True,
+            column_list=['column_1', 'column_2'],
+            copy_options={
+                'DELIMITER': ',',
+            },
+            multi_batch=False
+        )
+
+        row_list = [
+            ['row_1_val_1', 'row_1_val_2'],
+            ['row_2_val_1', 'row_2_val_2'],
+            ...
+        ]
+
+        for column_data_list in row_list:
+            batch.insert_list(column_data_list)
+
+        error_bool, error_file_obj = batch.get_errors()
+
+        if error_bool:
+            print error_file_obj.read()
+
+        batch.commit()
+
+    .. note:: It is also possible to call :py:meth:`~.VerticaBatch.commit`
+        multiple times (for example after every 50000 records). Please note
+        that after the first insert and after calling
+        :py:meth:`~.VerticaBatch.commit`, the output of
+        :py:meth:`~.VerticaBatch.get_errors` will reflect the new series of
+        inserts and thus not contain the "old" inserts.
+
+    .. note:: Creating a new batch object will not create a lock on the target
+        table. This will happen only after first insert.
+
+    .. note:: If a batch is created with ``multi_batch = True``,
+        :py:meth:`~.VerticaBatch.close_batch` must be explicity called when
+        the batch resources should be closed. If ``multi_batch`` is set to
+        ``False``, :py:meth:`~.VerticaBatch.close_batch` need not be called.
+        In this case, while the batch is reusable, the system resources will
+        be realoccated uppon each :py:meth:`~.VerticaBatch.commit`, which
+        may not be desirable.
+
+    :param table_name:
+        A ``str`` representing the table name (including the schema) to write
+        to. Example: ``'staging.my_table'``.
+
+    :param odbc_kwargs:
+        A ``dict`` containing the ODBC connection keyword arguments. E.g.::
+
+            {
+                'dsn': 'TestDSN',
+            }
+
+        .. seealso:: https://code.google.com/p/pyodbc/wiki/Module
+
+    :param truncate_table:
+        A ``bool`` indicating if the table needs truncating before first
+        insert. Default: ``False``. *Optional*.
+
+    :param reconnect:
+        A ``bool`` passed to the connection object to decide if pyvertica
+        should directly reconnect to a random node to bypass a load balancer.
+
+    :param node_selector:
+        A callable deciding which node to connect to when ``reconnect`` is
+        ``True``, e.g.
+        :py:func:`~pyvertica.connection.select_least_loaded_nodes` to spread
+        bulk loads over the cluster. See
+        :py:func:`~pyvertica.connection.get_connection`. *Optional*.
+
+    :param analyze_constraints:
+        A ``bool`` indicating if a ``ANALYZE_CONSTRAINTS`` startement should
+        be executed when getting errors. Default: ``True``. *Optional*.
+
+        .. note:: The statement is skipped for tables without constraints
+            (according to ``v_catalog.table_constraints``).
+
+    :param constraint_cache_ttl:
+        An ``int`` representing the number of seconds the constraint metadata
+        of the table is cached (shared by all batches writing to the table).
+        Default: :py:data:`.CONSTRAINT_CACHE_TTL`. *Optional*.
+
+    :param column_list:
+        A ``list`` containing the columns that will be written. *Optional*.
+
+    :param copy_options:
+        A ``dict`` containing the keys to override. For a list of existing keys
+        and their defaults, see :py:attr:`~.VerticaBatch.copy_options_dict`.
+        *Optional*.
+
+    :param connection:
+        A ``pyodbc.Connection`` to use instead of opening a new connection. If
+        this parameter is supplied, ``odbc_kwargs`` may not be supplied.
+        Default: ``None``. *Optional*.
+
+    :param multi_batch:
+        A ``boolean`` to indicate if the batch should keep it's resources open
+        after a call to commit. If you plan to only call
+        :py:meth:`~.VerticaBatch.commit` one time, set this to false.
+        Otherwise, setting ``multi_batch=True`` will prevent the batch from
+        closing all of its resources.
+        Default: ``False``. *Optional*.
+
+    :param column_type_list:
+        A ``list`` containing the expected Python type for every column in
+        ``column_list`` (``None`` for unknown). Values of numeric columns are
+        not escaped, so they are formatted faster by
+        :py:meth:`~.VerticaBatch.insert_list` and
+        :py:meth:`~.VerticaBatch.insert_lists`. See
+        :py:func:`.get_row_serializer`. *Optional*.
+
+    :param fifo_buffer_size:
+        An ``int`` representing the number of bytes to buffer before writing
+        to the FIFO (e.g. ``8 * 1024 * 1024``). When set, the FIFO is written
+        by a :py:class:`.FifoWriter`, which encodes the data once and writes
+        it in large blocks, reducing the number of system-calls and context
+        switches between this process and the ``COPY`` query. Default:
+        ``None`` (unbuffered). *Optional*.
+
+    :param native_type_list:
+        A ``list`` containing the Vertica data type (e.g. ``'INTEGER'``) of
+        every column in ``column_list``. When set, rows are written in the
+        Vertica native binary format (see
+        :py:func:`~pyvertica.native.get_native_row_encoder`) and the ``COPY``
+        query is executed with the ``NATIVE`` option. This skips formatting
+        and escaping values on the client, and parsing them on the server.
+        Since the rows are not text, :py:meth:`~.VerticaBatch.insert_line` can
+        not be used and the rejected data returned by
+        :py:meth:`~.VerticaBatch.get_errors` is binary. The ``DELIMITER``,
+        ``ENCLOSED BY``, ``NULL`` and ``RECORD TERMINATOR`` copy options are
+        ignored. *Optional*.
+
+    :param compression:
+        A ``str`` representing the compression of the data sent to the
+        server, one of :py:data:`.COMPRESSION_TYPES`. The data is compressed
+        in a dedicated thread (see :py:class:`.ThreadedWriter`) before it is
+        written to the FIFO, and the ``COPY`` query is executed with the
+        matching option. This trades CPU time on the client for less data
+        transferred to the server. Default: ``None``. *Optional*.
+
+    :param compression_level:
+        An ``int`` between ``1`` (fastest) and ``9`` (smallest output). See
+        :py:class:`.CompressingWriter`. *Optional*.
+
+    :param writer_queue_size:
+        An ``int`` representing the maximum number of bytes waiting to be
+        written to the FIFO. When set, the FIFO is written by a background
+        thread (see :py:class:`.ThreadedWriter`), so inserting does not block
+        while the ``COPY`` query is not reading, until this many bytes are
+        queued. Exceptions raised by the writer thread are re-raised on the
+        next insert, or when ending the batch (e.g. on
+        :py:meth:`~.VerticaBatch.commit`). Default: ``None`` (no background
+        thread, unless ``compression`` is set). *Optional*.
+
+    :param metrics_callback:
+        A callable which is called with the metrics of the batch (see
+        :py:meth:`~.VerticaBatch.get_metrics`) after every
+        :py:meth:`~.VerticaBatch.commit` and
+        :py:meth:`~.VerticaBatch.rollback` ending a batch. *Optional*.
+
+    :param time_metrics:
+        A ``bool`` indicating if the ``format_time`` and ``write_time``
+        metrics should be measured. This adds a few :py:func:`!time.time`
+        calls for every row inserted one by one. Default: ``True`` when a
+        ``metrics_callback`` is given, else ``False``. *Optional*.
+
+    :param commit_max_rows:
+        An ``int``. When set, the transaction is committed automatically
+        after inserting this many rows. *Optional*.
+
+    :param commit_max_bytes:
+        An ``int``. When set, the transaction is committed automatically
+        after writing this many bytes (before compression) to the FIFO.
+        *Optional*.
+
+    :param commit_max_seconds:
+        An ``int`` or ``float``. When set, the transaction is committed
+        automatically when this many seconds have passed since the first
+        insert of the batch. *Optional*.
+
+    :param commit_callback:
+        A callable which is called with the return value of
+        :py:meth:`~.VerticaBatch.get_errors` before every automatic commit.
+        When it returns ``False``, the transaction is rolled back instead.
+        An exception raised by the callback is propagated to the caller of
+        the insert method, leaving the transaction open. *Optional*.
+
+    :param record_index:
+        A ``bool`` indicating if the length of every record inserted in the
+        transaction should be kept (in 4 bytes per record), to resolve the
+        rejected rows to their byte offset within the inserted data (see
+        :py:meth:`~.VerticaBatch.iter_rejected`). For raw data, this is the
+        offset within the source. Default: ``False``. *Optional*.
+
+    :param quarantine_table:
+        A ``str`` representing the table name (including the schema) to load
+        the rejected rows into, on every commit. The rows are loaded through
+        their own ``COPY`` query, within the committed transaction. See
+        :py:meth:`~.VerticaBatch.quarantine_rejected`. Requires the
+        ``REJECTEDFILE`` copy option. *Optional*.
+
+    :param quarantine_metadata:
+        A ``dict`` mapping extra columns of the ``quarantine_table`` to the
+        value stored with every rejected row (e.g. the name of the source).
+        *Optional*.
+
+    :param load_method:
+        A ``str`` representing the load method of the ``COPY`` query, one of
+        :py:data:`.LOAD_METHODS`. ``'DIRECT'`` loads straight into the ROS
+        (for large batches), ``'TRICKLE'`` into the WOS (for small, frequent
+        batches, failing when the WOS is full) and ``'AUTO'`` into the WOS,
+        spilling to the ROS. ``'ADAPTIVE'`` picks one of these for every
+        batch, based on the batch size: ``'DIRECT'`` from
+        :py:data:`.ADAPTIVE_DIRECT_MIN_BYTES`, ``'TRICKLE'`` up to
+        :py:data:`.ADAPTIVE_TRICKLE_MAX_BYTES`, otherwise ``'AUTO'``.
+        Default: ``None`` (the server default). *Optional*.
+
+    :param expected_batch_bytes:
+        An ``int`` representing the expected size of a batch in bytes, for
+        the ``'ADAPTIVE'`` load method. Without it, the size of the previous
+        batch is used (or ``commit_max_bytes`` for the first batch).
+        *Optional*.
+
+    .. note:: The commit policy (``commit_max_rows``, ``commit_max_bytes``
+        and ``commit_max_seconds``) is checked after every insert method
+        call, thus a single call to :py:meth:`~.VerticaBatch.insert_lists`
+        is never split over multiple transactions. Consider setting
+        ``multi_batch=True``, to keep the FIFO and the query thread open
+        between the transactions.
+
+    """
+    copy_options_dict = {
+        'DELIMITER': ';',
+        'ENCLOSED BY': '"',
+        'SKIP': 0,
+        'NULL': '',
+        'RECORD TERMINATOR': '\x01',
+        'NO COMMIT': True,
+        'REJECTEDFILE': __debug__,
+        'REJECTMAX': 0,
+    }
+    """
+    Default copy options for SQL query.
+
+    .. note:: By default ``REJECTEDFILE`` is set to ``__debug__``, which is
+       ``True``, unless you've set the ``PYTHONOPTIMIZE`` environment variable.
+
+    """
+
+    def __init__(
+            self,
+            table_name,
+            odbc_kwargs={},
+            truncate_table=False,
+            reconnect=True,
+            analyze_constraints=True,
+            column_list=[],
+            copy_options={},
+            connection=None,
+            multi_batch=False,
+            column_type_list=None,
+            fifo_buffer_size=None,
+            native_type_list=None,
+            compression=None,
+            compression_level=None,
+            writer_queue_size=None,
+            metrics_callback=None,
+            commit_max_rows=None,
+            commit_max_bytes=None,
+            commit_max_seconds=None,
+            commit_callback=None,
+            record_index=False,
+            quarantine_table=None,
+            quarantine_metadata=None,
+            constraint_cache_ttl=CONSTRAINT_CACHE_TTL,
+            load_method=None,
+            expected_batch_bytes=None,
+            node_selector=None,
+            time_metrics=None):
+
+        if connection and odbc_kwargs:
+            raise ValueError("May only specify one of "
+                             "[connection, odbc_kwargs]")
+
+        if compression and compression not in COMPRESSION_TYPES:
+            raise ValueError("compression must be one of {0}".format(
+                ', '.join(COMPRESSION_TYPES)))
+
+        if load_method and load_method not in LOAD_METHODS:
+            raise ValueError("load_method must be one of {0}".format(
+                ', '.join(LOAD_METHODS)))
+
+        self._odbc_kwargs = odbc_kwargs
+        self._table_name = table_name
+        self._column_list = column_list
+        self._analyze_constraints = analyze_constraints
+        self._constraint_cache_ttl = constraint_cache_ttl
+        # copy, to not update the class defaults
+        self.copy_options_dict = dict(self.copy_options_dict)
+        self.copy_options_dict.update(copy_options)
+        if quarantine_table and not self.copy_options_dict['REJECTEDFILE']:
+            raise ValueError(
+                "quarantine_table requires the REJECTEDFILE copy option")
+        self._batch_initialized = False
+        self._rejected_file_obj = None
+        self._exceptions_file_obj = None
+        self._multi_batch = multi_batch
+        self._column_type_list = column_type_list
+        self._serialize_row = get_row_serializer(
+            self.copy_options_dict, column_type_list)
+        self._fifo_buffer_size = fifo_buffer_size
+
+        self._native_header = None
+        self._encode_native_row = None
+        self._native_type_list = native_type_list
+        if native_type_list:
+            self._native_header, self._encode_native_row = (
+                get_native_row_encoder(native_type_list))
+            self._fifo_buffer_size = (
+                fifo_buffer_size or DEFAULT_FIFO_BUFFER_SIZE)
+
+        self._compression = compression
+        self._compression_level = compression_level
+        self._writer_queue_size = writer_queue_size
+        if compression and not writer_queue_size:
+            self._writer_queue_size = 4 * DEFAULT_FIFO_BUFFER_SIZE
+        if self._writer_queue_size:
+            self._fifo_buffer_size = (
+                self._fifo_buffer_size or DEFAULT_FIFO_BUFFER_SIZE)
+
+        self._total_count = 0
+        self._batch_count = 0
+
+        self._metrics_callback = metrics_callback
+        if time_metrics is None:
+            time_metrics = metrics_callback is not None
+        self._time_metrics = time_metrics
+        self._metrics_pending = False
+        self._metered_writer = None
+        self._batch_start_time = None
+        self._first_insert_time = None
+        self._batch_end_time = None
+        self._format_time = 0.0
+        self._copy_time = None
+        self._commit_time = None
+
+        self._raw_tail = ''
+        self._raw_record_open = False
+
+        self._record_index = record_index
+        self._record_lengths = None
+
+        self._quarantine_table = quarantine_table
+        self._quarantine_metadata = quarantine_metadata or {}
+
+        self._load_method = load_method
+        self._expected_batch_bytes = expected_batch_bytes
+        self._last_batch_bytes = None
+        self._open_record_length = 0
+        self._index_tail = ''
+
+        self._commit_max_rows = commit_max_rows
+        self._commit_max_bytes = commit_max_bytes
+        self._commit_max_seconds = commit_max_seconds
+        self._commit_callback = commit_callback
+        self._has_commit_policy = bool(
+            commit_max_rows or commit_max_bytes or commit_max_seconds)
+
+        self._in_batch = False
+
+        if not connection:
+            # make sure we are not logging any passwords :)
+            odbc_kwargs_copy = copy.deepcopy(odbc_kwargs)
+            if 'password' in odbc_kwargs_copy:
+                odbc_kwargs_copy['password'] = '*****'
+            logger.debug(
+                'Initializing VerticaBatch with odbc_kwargs={0}, '
+                'table_name={1}, '
+                'column_list={2}'.format(
+                    odbc_kwargs_copy, table_name, column_list))
+            self._connection = get_connection(
+                reconnect=reconnect,
+                node_selector=node_selector,
+                **self._odbc_kwargs
+            )
+        else:
+            self._connection = connection
+
+        self._cursor = self._connection.cursor()
+
+        # truncate table, if needed
+        if truncate_table:
+            self._truncate_table()
+
+    def _truncate_table(self):
+        """
+        Truncate table.
+        """
+        logger.info('Truncating table {0}'.format(self._table_name))
+        self._cursor.execute('TRUNCATE TABLE {0}'.format(self._table_name))
+
+    def _initialize_batch(self):
+
+        self._query_exc_queue = Queue()
+
+        # create FIFO
+        self._fifo_path = os.path.join(tempfile.mkdtemp(), 'fifo')
+        os.mkfifo(self._fifo_path)
+
+        # create rejected and exceptions file obj
+        if self.copy_options_dict['REJECTEDFILE']:
+            self._rejected_file_obj = tempfile.NamedTemporaryFile(bufsize=0)
+            self._exceptions_file_obj = tempfile.NamedTemporaryFile(bufsize=0)
+        self._query = Query(
+            self._cursor,
+            self._get_sql_lcopy_str(),
+            self._fifo_path,
+            self._query_exc_queue,
+        )
+
+        self._query_thread = taskthread.TaskThread(self._query.run_query)
+
+        # Start the thread so run_task can be called
+        self._query_thread.start()
+        self._batch_initialized = True
+
+    def _start_batch(self):
+        """
+        Start the batch.
+
+        This will create the FIFO file, temporary files for the rejected
+        inserts and this will setup and start the :py:class:`.QueryThread`.
+
+        """
+        self._in_batch = True
+        self._batch_count = 0
+        self._raw_tail = ''
+        self._raw_record_open = False
+        if self._record_index:
+            self._record_lengths = array.array('I')
+        self._open_record_length = 0
+        self._index_tail = ''
+        self._metrics_pending = True
+        self._batch_start_time = time.time()
+        self._first_insert_time = None
+        self._batch_end_time = None
+        self._format_time = 0.0
+        self._copy_time = None
+        self._commit_time = None
+        if not self._batch_initialized:
+            self._initialize_batch()
+        elif self._load_method == 'ADAPTIVE':
+            # the load method depends on the size of the previous batch
+            self._query.sql_query_str = self._get_sql_lcopy_str()
+
+        self._query_thread.run_task()
+
+        logger.debug('Opening FIFO')
+        self._fifo_obj = self._open_fifo()
+
+        if self._compression:
+            self._fifo_obj = CompressingWriter(
+                self._fifo_obj, self._compression, self._compression_level)
+
+        if self._writer_queue_size:
+            self._fifo_obj = ThreadedWriter(
+                self._fifo_obj,
+                chunk_size=self._fifo_buffer_size,
+                max_queue_bytes=self._writer_queue_size,
+            )
+
+        self._metered_writer = MeteredWriter(
+            self._fifo_obj, timed=self._time_metrics)
+        self._fifo_obj = self._metered_writer
+
+        if not self._fifo_buffer_size:
+            # encode unicode objects once, the metered writer below only
+            # counts the encoded bytes
+            self._fifo_obj = codecs.getwriter('utf-8')(self._fifo_obj)
+
+        if self._native_header:
+            self._fifo_obj.write(self._native_header)
+
+        logger.debug('Batch started')
+
+    def _open_fifo(self):
+        """
+        Open the FIFO for writing.
+
+        This blocks until the ``COPY`` query has opened the FIFO for reading.
+
+        :return:
+            A :py:class:`.FifoWriter` when ``fifo_buffer_size`` is set,
+            otherwise a line-buffered file object.
+
+        """
+        if self._fifo_buffer_size:
+            return FifoWriter(self._fifo_path, self._fifo_buffer_size)
+        return open(self._fifo_path, 'wb', 1)
+
+    @require_started_batch
+    def _end_batch(self):
+        """
+        End the batch.
+
+        This waits for the current query to finish, and executes
+        close_batch if multi_batch is false.
+
+        """
+        ended_clean = True
+        writer_exception = None
+
+        if self._raw_record_open:
+            # the last raw record was not terminated
+            self._raw_record_open = False
+            self._total_count += 1
+            self._batch_count += 1
+
+        if self._open_record_length:
+            self._record_lengths.append(self._open_record_length)
+            self._open_record_length = 0
+
+        logger.debug('Closing FIFO')
+        # The Query task will stop when there is nothing writing to
+        # the fifo. This should force the current task to end.
+        try:
+            self._fifo_obj.close()
+        except Exception as e:
+            # the exception will be re-raised after the batch has ended
+            writer_exception = e
+
+        logger.debug('Waiting for COPY Query to finish')
+        if not self._query_thread.join_task(2):
+            logger.warn('Error shutting down task thread!')
+        else:
+            logger.debug('Query task finished')
+            self._copy_time = self._query.execution_time
+
+        self._batch_end_time = time.time()
+        if self._metered_writer is not None:
+            self._last_batch_bytes = self._metered_writer.bytes_written
+
+        if not self._multi_batch:
+            ended_clean = self.close_batch() and ended_clean
+
+        self._in_batch = False
+
+        if writer_exception is not None:
+            raise writer_exception
+
+        return ended_clean
+
+    def close_batch(self):
+        """
+        Close out the batch.
+
+        This will remove the FIFO file and stop the ``taskthread.TaskThread``.
+
+        """
 
         ended_clean = True
         logger.debug('Terminating thread')
@@ -357,338 +1642,1700 @@ class VerticaBatch(object):
             ended_clean = False
             logging.error('Terminating thread timed out!')
 
-        os.remove(self._fifo_path)
-        os.rmdir(os.path.dirname(self._fifo_path))
+        os.remove(self._fifo_path)
+        os.rmdir(os.path.dirname(self._fifo_path))
+
+        logger.debug('Batch ended')
+
+        if not self._query_exc_queue.empty():
+            raise self._query_exc_queue.get()
+
+        self._batch_initialized = False
+        return ended_clean
+
+    def _get_num_rejected_rows(self):
+        """
+        Return the number of rejected rows.
+
+        :return:
+            An ``int``.
+
+        """
+        if self._in_batch:
+            self._end_batch()
+
+        if not self.get_batch_count():
+            return 0
+
+        rejected_rows = self._cursor.execute('SELECT GET_NUM_REJECTED_ROWS()')
+        rejected_rows = rejected_rows.fetchone()
+        return rejected_rows[0]
+
+    def _has_constraints(self):
+        """
+        Return if the table has constraints to analyze.
+
+        The result of the ``v_catalog.table_constraints`` query is cached for
+        ``constraint_cache_ttl`` seconds. When the catalog can not be
+        queried, the table is assumed to have constraints.
+
+        :return:
+            A ``bool``.
+
+        """
+        cache_key = self._get_constraint_cache_key()
+        with _constraint_cache_lock:
+            cache_entry = _constraint_cache.get(cache_key)
+
+        if cache_entry and cache_entry[0] > time.time():
+            return cache_entry[1]
+
+        # compare with =, since LIKE would match _ and % in the names
+        try:
+            constraint_count = self._cursor.execute(
+                'SELECT COUNT(*) FROM v_catalog.table_constraints c '
+                'JOIN v_catalog.tables t ON c.table_id = t.table_id '
+                'WHERE LOWER(t.table_schema) = ? '
+                'AND LOWER(t.table_name) = ? '
+                "AND c.constraint_type <> 'n'",
+                *cache_key
+            ).fetchone()[0]
+        except Exception as e:
+            logger.debug('Could not get the constraints of {0}: {1}'.format(
+                self._table_name, e))
+            return True
+
+        self._cache_constraints(bool(constraint_count))
+        return bool(constraint_count)
+
+    def _cache_constraints(self, has_constraints):
+        """
+        Cache if the table has constraints.
+
+        :param has_constraints:
+            A ``bool``.
+
+        """
+        if not self._constraint_cache_ttl:
+            return
+
+        with _constraint_cache_lock:
+            _constraint_cache[self._get_constraint_cache_key()] = (
+                time.time() + self._constraint_cache_ttl, has_constraints)
+
+    def _get_constraint_cache_key(self):
+        """
+        Return the (lower case) schema and table name of the table.
+
+        :return:
+            A ``tuple`` containing the schema name (``'public'`` when the
+            table name has no schema) and the table name.
+
+        """
+        schema_name, _, table_name = self._table_name.lower().rpartition('.')
+        return (schema_name or 'public', table_name)
+
+    def get_rejected_count(self):
+        """
+        Return the number of rows rejected since the last commit.
+
+        Unlike the error count of :py:meth:`~.VerticaBatch.get_errors`, this
+        does not include the constraint errors.
+
+        .. note:: This must be called before committing, since quarantining
+            the rejected rows starts a new ``COPY`` query.
+
+        :return:
+            An ``int``.
+
+        """
+        return self._get_num_rejected_rows()
+
+    def _commit_policy_reached(self):
+        """
+        Return if the batch must be committed according to the commit policy.
+
+        :return:
+            A ``bool``.
+
+        """
+        if not self._in_batch:
+            return False
+
+        # never split a raw record over two transactions
+        if self._raw_record_open:
+            return False
+
+        if (self._commit_max_rows and
+                self._batch_count >= self._commit_max_rows):
+            return True
+
+        if (self._commit_max_bytes and
+                self._metered_writer.bytes_written >= self._commit_max_bytes):
+            return True
+
+        if self._commit_max_seconds:
+            # the policy is checked after every insert. The time is counted
+            # from the first insert, not from the start of the batch, since
+            # a batch can be started long before (e.g. the standby batch of
+            # a PipelinedVerticaBatch)
+            if self._first_insert_time is None:
+                self._first_insert_time = time.time()
+            elif (time.time() - self._first_insert_time >=
+                    self._commit_max_seconds):
+                return True
+
+        return False
+
+    def _apply_commit_policy(self):
+        """
+        Commit the transaction when the commit policy has been reached.
+
+        The ``commit_callback`` decides if the transaction is committed or
+        rolled back, based on the errors of the batch.
+
+        """
+        if not self._has_commit_policy or not self._commit_policy_reached():
+            return
+
+        logger.info('Commit policy reached after {0} rows'.format(
+            self._batch_count))
+
+        commit = True
+        if self._commit_callback:
+            commit = self._commit_callback(*self.get_errors())
+
+        if commit is False:
+            self.rollback()
+        else:
+            self.commit()
+
+    def get_metrics(self):
+        """
+        Return the metrics of the current (or last ended) batch.
+
+        Example::
+
+            {
+                'rows': 100000,
+                'bytes': 4812345,
+                'format_time': 1.2,
+                'write_time': 0.4,
+                'copy_time': 2.1,
+                'commit_time': 0.05,
+                'batch_time': 2.1,
+                'rows_per_second': 47619.0,
+                'mb_per_second': 2.18,
+            }
+
+        ``format_time`` is the time spent formatting (or encoding) rows and
+        ``write_time`` the time spent blocked on writing to the FIFO. When
+        most of the time is spent in neither of them, the load is bound by
+        the ``COPY`` query. ``copy_time`` (the duration of the ``COPY``
+        query) is ``None`` until the batch has ended, and ``commit_time``
+        until the batch has been committed. The rates are computed over the
+        ``batch_time``, the time between starting and ending the batch (or
+        now, when the batch has not ended yet).
+
+        ``format_time`` and ``write_time`` are ``None`` unless
+        ``time_metrics`` is enabled.
+
+        :return:
+            A ``dict``. The times are in seconds.
+
+        """
+        bytes_written = 0
+        write_time = 0.0
+        if self._metered_writer:
+            bytes_written = self._metered_writer.bytes_written
+            write_time = self._metered_writer.write_time
+
+        format_time = self._format_time
+        if not self._time_metrics:
+            format_time = write_time = None
+
+        batch_time = 0.0
+        if self._batch_start_time is not None:
+            batch_time = (
+                (self._batch_end_time or time.time()) - self._batch_start_time)
+
+        rows_per_second = 0.0
+        mb_per_second = 0.0
+        if batch_time:
+            rows_per_second = self._batch_count / batch_time
+            mb_per_second = bytes_written / (1024.0 * 1024.0) / batch_time
+
+        return {
+            'rows': self._batch_count,
+            'bytes': bytes_written,
+            'format_time': format_time,
+            'write_time': write_time,
+            'copy_time': self._copy_time,
+            'commit_time': self._commit_time,
+            'batch_time': batch_time,
+            'rows_per_second': rows_per_second,
+            'mb_per_second': mb_per_second,
+        }
+
+    def _report_metrics(self):
+        """
+        Pass the metrics of the ended batch to the ``metrics_callback``.
+        """
+        if not self._metrics_pending:
+            return
+
+        self._metrics_pending = False
+        if self._metrics_callback:
+            self._metrics_callback(self.get_metrics())
+
+    def get_batch_count(self):
+        """
+        Return number (``int``) of inserted items since last commit.
+
+        .. note:: When using :py:meth:`~.VerticaBatch.insert_raw`, a last
+            row without ``RECORD TERMINATOR`` is only counted when the batch
+            ends.
+
+        :return:
+            An ``int``.
+
+        """
+        return self._batch_count
+
+    def get_total_count(self):
+        """
+        Return total number (``int``) of inserted items.
+
+        .. note:: When using :py:meth:`~.VerticaBatch.insert_raw`, a last
+            row without ``RECORD TERMINATOR`` is only counted when the batch
+            ends.
+
+        :return:
+            An ``int``.
+
+        """
+        return self._total_count
+
+    @require_started_batch
+    def _get_sql_lcopy_str(self):
+        """
+        Get ``str`` representing the COPY query.
+
+        :return:
+            A ``str`` representing the query.
+
+        """
+        # table name
+        output_str = 'COPY {0}'.format(self._table_name)
+
+        # columns, if available
+        if self._column_list:
+            output_str += ' ({0})'.format(', '.join(self._column_list))
+
+        # fifo path
+        output_str += " FROM LOCAL '{0}'".format(self._fifo_path)
+
+        # compression
+        if self._compression:
+            output_str += ' {0}'.format(self._compression)
+
+        # native binary format
+        if self._native_type_list:
+            output_str += ' NATIVE'
+
+        # exceptions and rejected file
+        if self.copy_options_dict['REJECTEDFILE']:
+            output_str += " EXCEPTIONS '{0}' REJECTED DATA '{1}'".format(
+                self._exceptions_file_obj.name, self._rejected_file_obj.name)
+
+        # other arguments which map one-to-one
+        key_list = [
+            'REJECTMAX',
+            'DELIMITER',
+            'ENCLOSED BY',
+            'SKIP',
+            'NULL',
+            'RECORD TERMINATOR',
+        ]
+        if self._native_type_list:
+            key_list = ['REJECTMAX', 'SKIP']
+
+        for key in key_list:
+            value = self.copy_options_dict[key]
+
+            if isinstance(value, int):
+                output_str += ' {0} {1}'.format(key, value)
+            elif isinstance(value, str):
+                output_str += " {0} '{1}'".format(key, value)
+
+        # load method
+        load_method = self._get_load_method()
+        if load_method:
+            output_str += ' {0}'.format(load_method)
+
+        # NO COMMIT statement, which needs to be at the end
+        if self.copy_options_dict['NO COMMIT']:
+            output_str += ' NO COMMIT'
+
+        return output_str
+
+    def _get_load_method(self):
+        """
+        Return the load method for the current batch.
+
+        :return:
+            A ``str`` (one of :py:data:`.LOAD_METHODS`, except
+            ``'ADAPTIVE'``) or ``None``.
+
+        """
+        if self._load_method != 'ADAPTIVE':
+            return self._load_method
+
+        batch_bytes = self._expected_batch_bytes
+        if batch_bytes is None:
+            batch_bytes = self._last_batch_bytes
+        if batch_bytes is None:
+            batch_bytes = self._commit_max_bytes
+        if batch_bytes is None:
+            return 'AUTO'
+
+        if batch_bytes >= ADAPTIVE_DIRECT_MIN_BYTES:
+            return 'DIRECT'
+        if batch_bytes <= ADAPTIVE_TRICKLE_MAX_BYTES:
+            return 'TRICKLE'
+        return 'AUTO'
+
+    def _single_list_to_string(self,
+                               value_list,
+                               suffix=None):
+        """
+        Convert a single ``iterable`` to a string that represents one item
+        in the batch.
+
+        :param value_list:
+            An ``iterable``. Each item represents one column value
+
+        :param suffix:
+            A ``string``. If specified, this character will be appended
+            to the resulting string.
+        """
+        if suffix:
+            return self._serialize_row(value_list) + suffix
+        return self._serialize_row(value_list)
+
+    def insert_list(self, value_list):
+        """
+        Insert a ``list`` of values (instead of a ``str`` representing a line).
+
+        Example::
+
+            batch.insert_list(['value_1', 'value_2'])
+
+        :param value_list:
+            A ``list``. Each item should represent a column value.
+
+        """
+        if self._encode_native_row:
+            return self._insert_native_row(value_list)
+
+        if not self._time_metrics:
+            return self.insert_line(self._single_list_to_string(value_list))
+
+        start_time = time.time()
+        line_str = self._single_list_to_string(value_list)
+        self._format_time += time.time() - start_time
+        return self.insert_line(line_str)
+
+    @require_started_batch
+    def _insert_native_row(self, value_list):
+        """
+        Insert a ``list`` of values in the native binary format.
+
+        :param value_list:
+            A ``list``. Each item should represent a column value.
+
+        """
+        if self._time_metrics:
+            start_time = time.time()
+            data = self._encode_native_row(value_list)
+            self._format_time += time.time() - start_time
+        else:
+            data = self._encode_native_row(value_list)
+        self._fifo_obj.write(data)
+        self._index_records([data])
+
+        self._total_count += 1
+        self._batch_count += 1
+        self._apply_commit_policy()
+
+    def _write_encoded(self, data):
+        """
+        Write an UTF-8 encoded ``str`` to the FIFO.
+
+        :param data:
+            An UTF-8 encoded ``str``.
+
+        """
+        # bypass the codecs writer (if any), the data is already encoded
+        self._metered_writer.write(data)
+
+    def _insert_lists_pool(self, value_lists, pool, chunk_row_count):
+        """
+        Serialize ``value_lists`` in the ``pool`` and write it to the FIFO.
+
+        The number of chunks being serialized at the same time is limited to
+        twice the number of CPUs, to make sure the rows are not consumed
+        (much) faster than they can be written.
+
+        :return:
+            An ``int`` representing the number of rows inserted.
+
+        """
+        copy_options_dict = dict(
+            (key, self.copy_options_dict[key])
+            for key in ['DELIMITER', 'ENCLOSED BY', 'RECORD TERMINATOR'])
+        max_pending = 2 * multiprocessing.cpu_count()
+        pending_results = deque()
+        row_count = 0
+
+        value_lists = iter(value_lists)
+        for chunk_list in iter(
+                lambda: list(islice(value_lists, chunk_row_count)), []):
+            pending_results.append(pool.apply_async(
+                _serialize_chunk,
+                ((copy_options_dict, self._column_type_list,
+                  self._native_type_list, chunk_list),)
+            ))
+
+            if len(pending_results) >= max_pending:
+                row_count += self._write_pool_result(pending_results.popleft())
+
+        while pending_results:
+            row_count += self._write_pool_result(pending_results.popleft())
+
+        return row_count
+
+    def _write_pool_result(self, async_result):
+        """
+        Wait for a chunk serialized in the pool and write it to the FIFO.
+
+        The time spent waiting for the chunk is counted as formatting time.
+
+        :param async_result:
+            A :py:class:`!multiprocessing.pool.AsyncResult`.
+
+        :return:
+            An ``int`` representing the number of rows written.
+
+        """
+        start_time = time.time()
+        data, row_count = async_result.get()
+        self._format_time += time.time() - start_time
+        self._write_encoded(data)
+        if self._record_lengths is not None:
+            self._index_raw(data)
+        return row_count
+
+    @require_started_batch
+    def insert_lists(
+            self, value_lists, row_count=None, pool=None,
+            chunk_row_count=10000, chunk_bytes=DEFAULT_FIFO_BUFFER_SIZE):
+        """
+        Insert an ``iterable`` of ``iterable`` values (instead of a single
+        string). The iterables can be lists, generators, etc.
+
+        Example::
+
+            batch.insert_lists([['key1', 'value1'], ['key2', 'value2']))
+
+        The rows are formatted and written in chunks of about
+        ``chunk_bytes``, thus a generator of any number of rows is inserted
+        in bounded memory, and the ``COPY`` query starts reading while the
+        next chunk is formatted.
+
+        To spread the formatting of the rows over multiple CPU cores, pass
+        a :py:class:`!multiprocessing.Pool` instance. The rows will then be
+        sent in chunks to the worker processes, and the formatted chunks are
+        written (in order) to the FIFO::
+
+            pool = multiprocessing.Pool(8)
+            batch.insert_lists(row_generator, pool=pool)
+
+        :param value_lists:
+            An ``iterable``. Each iterable is another ``iterable`` containing
+            the values to insert.
+
+        :param row_count:
+            Ignored, the rows are counted while they are written. Kept for
+            backwards compatibility. *Optional*.
+
+        :param pool:
+            A :py:class:`!multiprocessing.Pool` used to format the rows.
+            The values must be picklable. *Optional*.
+
+        :param chunk_row_count:
+            An ``int`` representing the number of rows per chunk sent to
+            the ``pool``. Default: ``10000``. *Optional*.
+
+        :param chunk_bytes:
+            An ``int`` representing the (approximate) size of the chunks
+            written to the FIFO, when not using a ``pool``. Default:
+            :py:data:`.DEFAULT_FIFO_BUFFER_SIZE`. *Optional*.
+
+        :raises:
+            :py:exc:`!ValueError` when passing a ``pool`` to a batch with
+            ``native_type_list`` and ``record_index``, since the rows are
+            not indexed by the workers.
+
+        """
+        if pool is not None:
+            if self._encode_native_row and self._record_index:
+                raise ValueError(
+                    'Native rows formatted in a pool can not be indexed')
+            row_count = self._insert_lists_pool(
+                value_lists, pool, chunk_row_count)
+            self._total_count += row_count
+            self._batch_count += row_count
+        else:
+            self._insert_lists_chunked(value_lists, chunk_bytes)
+        self._apply_commit_policy()
+
+    def _insert_lists_chunked(self, value_lists, chunk_bytes):
+        """
+        Format ``value_lists`` and write it to the FIFO in chunks of about
+        ``chunk_bytes``.
+
+        The number of rows per chunk is estimated from the size of the
+        previous chunk, so the rows can be formatted in a list comprehension.
+        It grows at most twice per chunk, as a chunk of small rows would
+        otherwise over-estimate it for the (possibly larger) rows that follow.
+
+        """
+        if self._encode_native_row:
+            format_row = self._encode_native_row
+        else:
+            suffix = self.copy_options_dict['RECORD TERMINATOR']
+            serialize_row = self._serialize_row
+
+            def format_row(value_list):
+                return serialize_row(value_list) + suffix
+
+        value_lists = iter(value_lists)
+        chunk_row_count = 100
+
+        while True:
+            start_time = time.time()
+            record_list = [
+                format_row(value_list)
+                for value_list in islice(value_lists, chunk_row_count)]
+            if not record_list:
+                break
+            data = ''.join(record_list)
+            self._format_time += time.time() - start_time
+
+            self._fifo_obj.write(data)
+            self._index_records(record_list)
+            self._total_count += len(record_list)
+            self._batch_count += len(record_list)
+
+            chunk_row_count = max(1, min(
+                2 * chunk_row_count,
+                chunk_row_count * chunk_bytes // max(1, len(data))))
+
+    @require_started_batch
+    def insert_columns(self, columns):
+        """
+        Insert column-wise data (instead of a ``list`` per row).
+
+        The values are formatted per column (see
+        :py:func:`._format_column`), and then interleaved into records.
+
+        Example::
+
+            batch = VerticaBatch(
+                odbc_kwargs={'dsn': 'VerticaDWH'},
+                table_name='schema.my_table',
+                column_list=['id', 'name'],
+            )
+            batch.insert_columns({
+                'id': array.array('l', [1, 2, 3]),
+                'name': ['foo', 'bar', None],
+            })
+
+        :param columns:
+            Either a ``dict`` mapping the names in ``column_list`` to their
+            column, or a sequence of columns (in the order of the table or
+            ``column_list``). A column can be any sequence, e.g. a ``list``,
+            an :py:class:`!array.array` or a NumPy array.
+
+        :raises:
+            :py:exc:`!ValueError` when the columns differ in length, or when
+            passing a ``dict`` without ``column_list``.
+
+        """
+        if hasattr(columns, 'keys'):
+            if not self._column_list:
+                raise ValueError(
+                    'Inserting a dict of columns requires a column_list')
+            columns = [columns[name] for name in self._column_list]
+
+        if self._encode_native_row:
+            columns = [
+                column.tolist() if hasattr(column, 'tolist') else list(column)
+                for column in columns]
+            if len(set(map(len, columns))) > 1:
+                raise ValueError('All columns must have the same length')
+            return self.insert_lists(izip(*columns))
+
+        start_time = time.time()
+        column_type_list = self._column_type_list or []
+        formatted_columns = []
+        for index, column in enumerate(columns):
+            value_type = None
+            if index < len(column_type_list):
+                value_type = column_type_list[index]
+            formatted_columns.append(_format_column(
+                self.copy_options_dict, column, value_type))
+
+        if len(set(map(len, formatted_columns))) > 1:
+            raise ValueError('All columns must have the same length')
+
+        row_count = len(formatted_columns[0]) if formatted_columns else 0
+        if not row_count:
+            return
+
+        suffix = self.copy_options_dict['RECORD TERMINATOR']
+        delimiter = self.copy_options_dict['DELIMITER']
+        record_list = map(delimiter.join, izip(*formatted_columns))
+        data = suffix.join(record_list) + suffix
+        self._format_time += time.time() - start_time
+        self._fifo_obj.write(data)
+        self._index_records(record_list, suffix)
+        self._total_count += row_count
+        self._batch_count += row_count
+        self._apply_commit_policy()
+
+    @require_started_batch
+    def insert_line(self, line_str):
+        """
+        Insert a ``str`` containing all the values.
+
+        This is useful when inserting lines directly from a CSV file for
+        example.
+
+        .. note:: When you have a loghandler with ``DEBUG`` level, every query
+            will be logged. For performance reason, this log statement is only
+            executed when ``__debug__`` equals ``True`` (which is the default
+            case). For a better performance, you should invoke the Python
+            interpreter with the ``-O`` argument or set the environment
+            variable ``PYTHONOPTIMIZE`` to something.
+
+        Example::
+
+            batch.insert_line('"value_1";"value_2"')
+
+        :param line_str:
+            A ``str`` representing the line to insert. Make sure the ``str``
+            is formatted according :py:attr:`~.VerticaBatch.copy_options_dict`.
+            Example: ``'"value1";"value2";"value3"'``.
+
+        :raises:
+            :py:exc:`!ValueError` when the batch writes the native binary
+            format (see ``native_type_list``).
+
+        """
+        if self._encode_native_row:
+            raise ValueError('Lines can not be inserted in the native format')
+
+        if __debug__:
+            logger.debug(u'Inserting line: {0}'.format(line_str))
+
+        line_str += self.copy_options_dict['RECORD TERMINATOR']
+        self._fifo_obj.write(line_str)
+        self._index_records([line_str])
+
+        self._total_count += 1
+        self._batch_count += 1
+        self._apply_commit_policy()
+
+    @require_started_batch
+    def insert_raw(self, raw_str):
+        """
+        Insert a raw ``str``.
+
+        A raw ``str`` does not have to be a complete row, but can be a part of
+        a row or even multiple rows. This is useful when you have a file that
+        is already in a format readable by Vertica.
+
+        The rows are counted by counting the ``RECORD TERMINATOR`` (also when
+        it is split over two raw ``str`` objects). A last row without a
+        terminator is counted when the batch ends. In the native binary
+        format, every raw ``str`` is counted as one row.
+        """
+        if __debug__:
+            # raw chunks can be large and contain any bytes
+            logger.debug('Inserting raw: {0!r}'.format(raw_str[:200]))
+
+        self._fifo_obj.write(raw_str)
+        if self._record_lengths is not None:
+            self._index_raw(raw_str)
+
+        row_count = self._count_raw_records(raw_str)
+        self._total_count += row_count
+        self._batch_count += row_count
+        self._apply_commit_policy()
+
+    def _count_raw_records(self, raw_str):
+        """
+        Return the number of records terminated within ``raw_str``.
+
+        The end of the previous raw ``str`` is kept, to detect a terminator
+        which is split over two raw ``str`` objects.
+
+        :param raw_str:
+            A ``str`` or ``unicode`` object.
+
+        :return:
+            An ``int``.
+
+        """
+        terminator = self.copy_options_dict['RECORD TERMINATOR']
+        if self._encode_native_row or not terminator:
+            return 1
+
+        if not raw_str:
+            return 0
+
+        row_count = raw_str.count(terminator)
+        # the terminator can also end in this raw str after a split
+        self._raw_record_open = not (
+            self._raw_tail + raw_str[-len(terminator):]).endswith(terminator)
+
+        tail_length = len(terminator) - 1
+        if tail_length:
+            if self._raw_tail:
+                row_count += (
+                    self._raw_tail + raw_str[:tail_length]).count(terminator)
+            if len(raw_str) >= tail_length:
+                self._raw_tail = raw_str[-tail_length:]
+            else:
+                self._raw_tail = (self._raw_tail + raw_str)[-tail_length:]
+
+        return row_count
+
+    def _index_records(self, record_list, suffix=''):
+        """
+        Add the length of the records in ``record_list`` to the record index,
+        when enabled.
+
+        :param record_list:
+            A ``list`` of ``str`` or ``unicode`` objects, each representing
+            one record.
+
+        :param suffix:
+            A ``str`` which is appended to every record when writing it.
+            Default: ``''``. *Optional*.
+
+        """
+        if self._record_lengths is None or not record_list:
+            return
+
+        length_list = [
+            len(record.encode('utf-8')) if isinstance(record, unicode)
+            else len(record)
+            for record in record_list
+        ]
+        if suffix:
+            length_list = [length + len(suffix) for length in length_list]
+
+        if self._open_record_length:
+            # the records complete the last raw record
+            length_list[0] += self._open_record_length
+            self._open_record_length = 0
+            self._index_tail = ''
+
+        self._record_lengths.extend(length_list)
+
+    def _index_raw(self, raw_str):
+        """
+        Add the length of the records terminated within ``raw_str`` to the
+        record index.
+
+        The length of the last (open) record is kept until it is terminated
+        by the next raw ``str``, or until the batch ends.
+
+        :param raw_str:
+            A ``str`` or ``unicode`` object.
+
+        """
+        terminator = self.copy_options_dict['RECORD TERMINATOR']
+        if self._encode_native_row or not terminator:
+            return self._index_records([raw_str])
+
+        if isinstance(raw_str, unicode):
+            raw_str = raw_str.encode('utf-8')
+
+        # the tail of the open record, to find a split terminator
+        tail = self._index_tail
+        data = tail + raw_str
+        part_list = data.split(terminator)
+
+        if len(part_list) == 1:
+            self._open_record_length += len(raw_str)
+        else:
+            self._record_lengths.append(
+                self._open_record_length - len(tail) + len(part_list[0]) +
+                len(terminator))
+            self._record_lengths.extend(
+                [len(part) + len(terminator) for part in part_list[1:-1]])
+            self._open_record_length = len(part_list[-1])
+            data = part_list[-1]
+
+        tail_length = len(terminator) - 1
+        if tail_length:
+            self._index_tail = data[-tail_length:]
+
+    @require_started_batch
+    def insert_file(self, file_path, row_count=None):
+        """
+        Insert the content of a file which is already formatted according to
+        :py:attr:`~.VerticaBatch.copy_options_dict` (or in the native binary
+        format, without the header, when ``native_type_list`` is set).
+
+        The data is copied into the FIFO with :py:func:`.copy_file_to_fd`,
+        thus (on Linux) without passing through Python objects. When the
+        batch uses ``compression`` or ``writer_queue_size``, the data passes
+        through the writers (in chunks, without decoding it).
+
+        Example::
+
+            batch.insert_file('/data/export.csv', row_count=1000000)
+
+        :param file_path:
+            A ``str`` representing the path of the file.
+
+        :param row_count:
+            An ``int`` representing the number of rows in the file. Without
+            it, the record terminators in the file are counted (like
+            :py:meth:`~.VerticaBatch.insert_raw` does), which reads the file
+            once more when it is copied without passing through Python.
+            Required for the native binary format. *Optional*.
+
+        .. note:: With ``record_index``, the file is read once more to index
+            its records. This is not supported in the native binary format.
+
+        :raises:
+            :py:exc:`!ValueError` when inserting a file in the native binary
+            format with ``record_index`` or without ``row_count``.
+
+        """
+        if self._encode_native_row and self._record_index:
+            raise ValueError('Native files can not be indexed')
+
+        if self._encode_native_row and row_count is None:
+            raise ValueError('Native files require a row_count')
+
+        count_rows = row_count is None
+        counted_rows = 0
+
+        def scan_chunk(chunk):
+            # index and / or count the records, return the record count
+            if self._record_lengths is not None:
+                self._index_raw(chunk)
+            if count_rows:
+                return self._count_raw_records(chunk)
+            return 0
+
+        with open(file_path, 'rb') as file_obj:
+            if self._compression or self._writer_queue_size:
+                for chunk in iter(
+                        lambda: file_obj.read(DEFAULT_FIFO_BUFFER_SIZE), ''):
+                    self._fifo_obj.write(chunk)
+                    counted_rows += scan_chunk(chunk)
+            else:
+                # flush the buffered data before writing to the FIFO
+                fifo_obj = self._metered_writer.writer
+                fifo_obj.flush()
+
+                start_time = time.time()
+                copied = copy_file_to_fd(
+                    file_obj.fileno(), fifo_obj.fileno(),
+                    self._fifo_buffer_size or DEFAULT_FIFO_BUFFER_SIZE)
+                self._metered_writer.write_time += time.time() - start_time
+                self._metered_writer.bytes_written += copied
+
+                if self._record_lengths is not None or count_rows:
+                    file_obj.seek(0)
+                    for chunk in iter(
+                            lambda: file_obj.read(DEFAULT_FIFO_BUFFER_SIZE),
+                            ''):
+                        counted_rows += scan_chunk(chunk)
+
+        if count_rows:
+            row_count = counted_rows
+
+        self._total_count += row_count
+        self._batch_count += row_count
+        self._apply_commit_policy()
+
+    def get_errors(self):
+        """
+        Get errors that were raised since the last commit.
+
+        This will check constraint errors and rejected data by the database.
+        Please note that this will remove the rejected data file after calling
+        this method. Therfore it is not possible to call this method more than
+        once per batch!
+
+        .. note:: Since this is checking the contraints as well, it is assumed
+            that all contrains were met before starting the batch. Otherwise,
+            these errors will show up within this method.
+
+        :return:
+            A ``tuple`` with as first item a ``int`` representing the number
+            of errors. The second item is a file-like object containing the
+            error-data in plain text. Since this is an instance
+            of :py:class:`!tempfile.TemporaryFile`, it will be removed
+            automatically.
+
+            .. note:: The file-like object can be empty, when ``REJECTEDFILE``
+               is set to ``False``.
+
+        """
+        if self._in_batch:
+            self._end_batch()
+
+        error_file_obj = tempfile.TemporaryFile(bufsize=0)
+
+        if not self.get_batch_count():
+            return(False, error_file_obj)
+
+        error_count = self._get_num_rejected_rows()
+
+        if self._analyze_constraints and self._has_constraints():
+            try:
+                analyze_constraints = self._cursor.execute(
+                    "SELECT ANALYZE_CONSTRAINTS('{0}')".format(
+                        self._table_name))
+            except Exception as e:
+                if not 'no constraints defined' in str(e).lower():
+                    raise e
+                self._cache_constraints(False)
+                analyze_constraints = None
+
+            if analyze_constraints and analyze_constraints.rowcount > 0:
+                error_count += analyze_constraints.rowcount
+                error_file_obj.write(
+                    'At least one constraint not met: {0}\n'.format(
+                        ', '.join(analyze_constraints.fetchone())))
+
+        if self.copy_options_dict['REJECTEDFILE']:
+            line_iter = (
+                self._format_rejected_row(rejected_row)
+                for rejected_row in self.iter_rejected()
+            )
+            for chunk in iter(lambda: ''.join(islice(line_iter, 1000)), ''):
+                error_file_obj.write(chunk)
+
+            error_file_obj.seek(0)
+
+        return (error_count, error_file_obj)
+
+    def iter_rejected(self):
+        """
+        Iterate over the rows rejected since the last commit.
+
+        The ``REJECTED DATA`` and ``EXCEPTIONS`` files written by the ``COPY``
+        query are read lazily, thus this works in constant memory, even for
+        millions of rejected rows. Example::
+
+            for rejected_row in batch.iter_rejected():
+                logger.warning('Row {0} rejected: {1}'.format(
+                    rejected_row.row_number, rejected_row.reason))
+
+        When the batch was created with ``record_index``, the ``offset`` of
+        the rows is resolved as well. This makes it possible to reprocess
+        only the rejected records of a source file::
+
+            source_file_obj.seek(start_offset + rejected_row.offset)
+
+        .. note:: The rejected data of a batch with ``native_type_list``
+            can not be split into records, thus the ``raw`` attribute of
+            the rows is ``None``.
+
+        :return:
+            An iterator of :py:class:`.RejectedRow` objects. The iterator is
+            empty when ``REJECTEDFILE`` is set to ``False``.
+
+        """
+        if self._in_batch:
+            self._end_batch()
+
+        if self._rejected_file_obj is None:
+            return iter([])
+
+        terminator = None
+        if not self._native_type_list:
+            terminator = self.copy_options_dict['RECORD TERMINATOR']
+
+        return _iter_rejected_rows(
+            self._rejected_file_obj.name,
+            self._exceptions_file_obj.name,
+            terminator,
+            self._record_lengths,
+        )
+
+    def quarantine_rejected(self):
+        """
+        Load the rows rejected since the last commit into the
+        ``quarantine_table``.
+
+        The rows are loaded through their own ``COPY`` query on the same
+        connection, thus they are committed (or rolled back) together with
+        the current transaction. This is called by
+        :py:meth:`~.VerticaBatch.commit`. The ``quarantine_table`` must have
+        the columns of ``quarantine_metadata``, followed by
+        :py:data:`.QUARANTINE_COLUMNS`. Example::
+
+            CREATE TABLE staging.my_table_rejects (
+                table_name VARCHAR(255),
+                row_number INTEGER,
+                record_offset INTEGER,
+                reason VARCHAR(65000),
+                raw_data VARCHAR(65000)
+            )
+
+        :return:
+            An ``int`` representing the number of quarantined rows.
+
+        """
+        rejected_iter = self.iter_rejected()
+        first_rejected_row = next(rejected_iter, None)
+        if first_rejected_row is None:
+            return 0
+
+        metadata_column_list = list(self._quarantine_metadata.keys())
+        metadata_value_list = [
+            self._quarantine_metadata[column]
+            for column in metadata_column_list
+        ]
+
+        def get_value_list(rejected_row):
+            return metadata_value_list + [
+                self._table_name,
+                rejected_row.row_number,
+                rejected_row.offset,
+                _decode_rejected(rejected_row.reason),
+                _decode_rejected(rejected_row.raw),
+            ]
+
+        quarantine_batch = VerticaBatch(
+            table_name=self._quarantine_table,
+            connection=self._connection,
+            analyze_constraints=False,
+            column_list=metadata_column_list + list(QUARANTINE_COLUMNS),
+        )
+
+        quarantine_batch.insert_lists(imap(
+            get_value_list, chain([first_rejected_row], rejected_iter)))
+
+        error_count = quarantine_batch.get_errors()[0]
+        if error_count:
+            logger.warning('{0} rows could not be quarantined in {1}'.format(
+                error_count, self._quarantine_table))
+
+        quarantine_count = quarantine_batch.get_batch_count()
+        logger.info('{0} rejected rows quarantined in {1}'.format(
+            quarantine_count, self._quarantine_table))
+        return quarantine_count
+
+    def _format_rejected_row(self, rejected_row):
+        """
+        Format a rejected row for the error-data of
+        :py:meth:`~.VerticaBatch.get_errors`.
+
+        :param rejected_row:
+            A :py:class:`.RejectedRow`.
+
+        :return:
+            A ``str`` representing a line.
+
+        """
+        if rejected_row.offset is None:
+            return 'Rejected data at line: {0}\n'.format(rejected_row.raw)
+        return 'Rejected data at line: {0} (record {1}, offset {2})\n'.format(
+            rejected_row.raw, rejected_row.row_number, rejected_row.offset)
+
+    def commit(self):
+        """
+        Commit the current transaction.
+        """
+        batch_count = self.get_batch_count()
+
+        if self._in_batch:
+            self._end_batch()
+
+        if self._quarantine_table and batch_count:
+            self.quarantine_rejected()
+
+        start_time = time.time()
+        self._connection.commit()
+        self._commit_time = time.time() - start_time
+        logger.info('Transaction committed, {0} lines inserted'.format(
+            batch_count))
+        self._report_metrics()
+
+    def rollback(self):
+        """
+        Rollback the current transaction.
+        """
+        if self._in_batch:
+            self._end_batch()
+
+        self._connection.rollback()
+        logger.info('Transaction rolled back')
+        self._report_metrics()
+
+    def get_cursor(self):
+        """
+        Return a cursor to the database.
+
+        This is useful when you want to add extra data within the same
+        transaction of the batch import.
+
+        :return:
+            Instance of :py:class:`!pyodbc.Cursor`.
+
+        """
+        return self._connection.cursor()
+
+
+class ParallelVerticaBatch(object):
+    """
+    Object for writing records to Vertica through multiple ``COPY`` streams.
+
+    A single :py:class:`.VerticaBatch` is limited by one client stream and one
+    initiator node. This object opens one :py:class:`.VerticaBatch` (thus one
+    FIFO, ``COPY`` query thread and connection) per stream, each connected to
+    a different node (see :py:func:`~pyvertica.connection.get_connection_list`)
+    and spreads the inserted rows over these streams.
+
+    Usage example::
+
+        from pyvertica.batch import ParallelVerticaBatch
+
+        batch = ParallelVerticaBatch(
+            table_name='schema.my_table',
+            streams=4,
+            odbc_kwargs={'dsn': 'VerticaDWH'},
+            column_list=['column_1', 'column_2'],
+        )
+
+        batch.insert_lists(row_list)
+
+        error_count, error_file_obj = batch.get_errors()
+
+        if error_count:
+            batch.rollback()
+        else:
+            batch.commit()
+
+    .. warning:: Every stream runs in its own transaction. Calling
+        :py:meth:`~.ParallelVerticaBatch.commit` commits these transactions
+        one after the other, which means that it is not atomic. Make sure to
+        call :py:meth:`~.ParallelVerticaBatch.get_errors` before committing.
+        As well, ``ANALYZE_CONSTRAINTS`` can only detect the violations
+        within one stream (and the already committed data).
+
+    :param table_name:
+        A ``str`` representing the table name (including the schema) to write
+        to. Example: ``'staging.my_table'``.
+
+    :param streams:
+        An ``int`` representing the number of parallel streams. Default: ``2``.
+        *Optional*.
+
+    :param odbc_kwargs:
+        A ``dict`` containing the ODBC connection keyword arguments.
+
+    :param truncate_table:
+        A ``bool`` indicating if the table needs truncating before first
+        insert. Default: ``False``. *Optional*.
+
+    :param reconnect:
+        A ``bool`` indicating if every stream should connect to a different
+        node, bypassing the load balancer. Default: ``True``. *Optional*.
+
+    :param node_selector:
+        A callable ordering the nodes for the streams, see
+        :py:func:`~pyvertica.connection.get_connection_list`. *Optional*.
+
+    :param chunk_row_count:
+        An ``int`` representing the number of rows sent to one stream at a
+        time by :py:meth:`~.ParallelVerticaBatch.insert_lists`. Default:
+        ``10000``. *Optional*.
+
+    :param kwargs:
+        Extra keyword arguments for every :py:class:`.VerticaBatch` (e.g.
+        ``column_list`` or ``copy_options``). The commit policy arguments
+        (``commit_max_rows``, ``commit_max_bytes``, ``commit_max_seconds``
+        and ``commit_callback``) are not supported, since every stream would
+        commit on its own.
+
+    """
+    def __init__(
+            self,
+            table_name,
+            streams=2,
+            odbc_kwargs={},
+            truncate_table=False,
+            reconnect=True,
+            chunk_row_count=10000,
+            node_selector=None,
+            **kwargs):
+
+        if streams < 1:
+            raise ValueError('At least one stream is required')
+
+        for name in _COMMIT_POLICY_ARGUMENTS:
+            if kwargs.get(name):
+                raise ValueError(
+                    '{0} is not supported by ParallelVerticaBatch'.format(
+                        name))
+
+        self._chunk_row_count = chunk_row_count
+
+        connection_list = get_connection_list(
+            streams,
+            reconnect=reconnect,
+            node_selector=node_selector,
+            **odbc_kwargs
+        )
+
+        # the table only needs to be truncated once
+        self._batch_list = [
+            VerticaBatch(
+                table_name=table_name,
+                connection=connection,
+                truncate_table=truncate_table and not i,
+                **kwargs
+            ) for i, connection in enumerate(connection_list)
+        ]
+        self._batch_cycle = cycle(self._batch_list)
+
+    def get_batch_count(self):
+        """
+        Return number (``int``) of inserted items since last commit, over all
+        the streams.
+
+        :return:
+            An ``int``.
+
+        """
+        return sum(batch.get_batch_count() for batch in self._batch_list)
+
+    def get_total_count(self):
+        """
+        Return total number (``int``) of inserted items, over all the
+        streams.
+
+        :return:
+            An ``int``.
+
+        """
+        return sum(batch.get_total_count() for batch in self._batch_list)
+
+    def insert_line(self, line_str):
+        """
+        Insert a ``str`` containing all the values into the next stream.
+
+        See :py:meth:`.VerticaBatch.insert_line`.
+
+        """
+        next(self._batch_cycle).insert_line(line_str)
+
+    def insert_list(self, value_list):
+        """
+        Insert a ``list`` of values into the next stream.
+
+        See :py:meth:`.VerticaBatch.insert_list`.
+
+        """
+        next(self._batch_cycle).insert_list(value_list)
+
+    def insert_lists(self, value_lists):
+        """
+        Insert an ``iterable`` of ``iterable`` values.
+
+        The rows are sent to the streams in chunks of ``chunk_row_count``
+        rows, one chunk per stream in turn.
 
-        logger.debug('Batch ended')
+        :param value_lists:
+            An ``iterable``. Each iterable is another ``iterable`` containing
+            the values to insert.
 
-        if not self._query_exc_queue.empty():
-            raise self._query_exc_queue.get()
+        """
+        value_lists = iter(value_lists)
 
-        self._batch_initialized = False
-        return ended_clean
+        while True:
+            chunk_list = list(islice(value_lists, self._chunk_row_count))
+            if not chunk_list:
+                break
+            next(self._batch_cycle).insert_lists(chunk_list)
 
-    def _get_num_rejected_rows(self):
+    def get_errors(self):
         """
-        Return the number of rejected rows.
+        Get errors that were raised since the last commit, for all streams.
+
+        See :py:meth:`.VerticaBatch.get_errors`.
 
         :return:
-            An ``int``.
+            A ``tuple`` with as first item a ``int`` representing the number
+            of errors. The second item is a file-like object containing the
+            error-data (of all the streams) in plain text.
 
         """
-        if self._in_batch:
-            self._end_batch()
+        error_count = 0
+        error_file_obj = tempfile.TemporaryFile(bufsize=0)
 
-        if not self.get_batch_count():
-            return 0
+        for batch in self._batch_list:
+            batch_error_count, batch_error_file_obj = batch.get_errors()
+            error_count += batch_error_count
+            for chunk in iter(
+                    lambda: batch_error_file_obj.read(1024 * 1024), ''):
+                error_file_obj.write(chunk)
 
-        rejected_rows = self._cursor.execute('SELECT GET_NUM_REJECTED_ROWS()')
-        rejected_rows = rejected_rows.fetchone()
-        return rejected_rows[0]
+        error_file_obj.seek(0)
+        return (error_count, error_file_obj)
 
-    def get_batch_count(self):
+    def iter_rejected(self):
         """
-        Return number (``int``) of inserted items since last commit.
+        Iterate over the rows rejected since the last commit, for all
+        streams.
 
-        .. warning:: When using :py:meth:`~.VerticaBatch.insert_raw` this
-            value represents the number of raw ``str`` objects inserted, not
-            the number of lines!
+        See :py:meth:`.VerticaBatch.iter_rejected`. The ``row_number`` of
+        the rows is relative to the batch of their stream.
 
         :return:
-            An ``int``.
+            An iterator of :py:class:`.RejectedRow` objects.
 
         """
-        return self._batch_count
+        return chain(*[batch.iter_rejected() for batch in self._batch_list])
 
-    def get_total_count(self):
+    def commit(self):
         """
-        Return total number (``int``) of inserted items.
-
-        .. warning:: When using :py:meth:`~.VerticaBatch.insert_raw` this
-            value represents the number of raw ``str`` objects inserted, not
-            the number of lines!
-
-        :return:
-            An ``int``.
+        Commit the transactions of all the streams.
+        """
+        for batch in self._batch_list:
+            batch.commit()
 
+    def rollback(self):
         """
-        return self._total_count
+        Rollback the transactions of all the streams.
+        """
+        for batch in self._batch_list:
+            batch.rollback()
 
-    @require_started_batch
-    def _get_sql_lcopy_str(self):
+    def close_batch(self):
         """
-        Get ``str`` representing the COPY query.
+        Close out the batch of all the streams.
+
+        See :py:meth:`.VerticaBatch.close_batch`.
 
         :return:
-            A ``str`` representing the query.
+            ``True`` when all the streams ended clean.
 
         """
-        # table name
-        output_str = 'COPY {0}'.format(self._table_name)
+        return all([
+            batch.close_batch() for batch in self._batch_list
+            if batch._batch_initialized
+        ])
 
-        # columns, if available
-        if self._column_list:
-            output_str += ' ({0})'.format(', '.join(self._column_list))
 
-        # fifo path
-        output_str += " FROM LOCAL '{0}'".format(self._fifo_path)
+class PipelinedVerticaBatch(object):
+    """
+    Object for writing records to Vertica without stalling on commits.
 
-        # rejected file
-        if self.copy_options_dict['REJECTEDFILE']:
-            output_str += " REJECTED DATA '{0}'".format(
-                self._rejected_file_obj.name)
+    A :py:class:`.VerticaBatch` stops accepting rows while a batch is being
+    committed: the FIFO is closed, the ``COPY`` query must finish and the
+    transaction is committed before the next ``COPY`` query is started. This
+    object uses two :py:class:`.VerticaBatch` objects (each with its own
+    FIFO, ``COPY`` query thread and connection). While one of them receives
+    the inserted rows, the other one finishes its ``COPY`` query, commits
+    and starts its next ``COPY`` query in a background thread.
 
-        # other arguments which map one-to-one
-        for key in [
-                'REJECTMAX',
-                'DELIMITER',
-                'ENCLOSED BY',
-                'SKIP',
-                'NULL',
-                'RECORD TERMINATOR']:
-            value = self.copy_options_dict[key]
+    Usage example::
 
-            if isinstance(value, int):
-                output_str += ' {0} {1}'.format(key, value)
-            elif isinstance(value, str):
-                output_str += " {0} '{1}'".format(key, value)
+        from pyvertica.batch import PipelinedVerticaBatch
 
-        # NO COMMIT statement, which needs to be at the end
-        if self.copy_options_dict['NO COMMIT']:
-            output_str += ' NO COMMIT'
+        def check_errors(error_count, error_file_obj):
+            # returning False rolls back the transaction instead
+            return not error_count
 
-        return output_str
+        batch = PipelinedVerticaBatch(
+            table_name='schema.my_table',
+            odbc_kwargs={'dsn': 'VerticaDWH'},
+            column_list=['column_1', 'column_2'],
+            commit_max_rows=1000000,
+            commit_callback=check_errors,
+        )
 
-    def _single_list_to_string(self,
-                               value_list,
-                               suffix=None):
-        """
-        Convert a single ``iterable`` to a string that represents one item
-        in the batch.
+        for row in row_list:
+            batch.insert_list(row)
 
-        :param value_list:
-            An ``iterable``. Each item represents one column value
+        batch.commit()
+        batch.close_batch()
 
-        :param suffix:
-            A ``string``. If specified, this character will be appended
-            to the resulting string.
-        """
-        enclosed_by = self.copy_options_dict['ENCLOSED BY']
-        escaped_enclosed_by = '\\%s' % enclosed_by
-        suffix = suffix if suffix else ''
-        delimiter = self.copy_options_dict['DELIMITER']
+    .. note:: :py:meth:`~.PipelinedVerticaBatch.commit` returns before the
+        transaction is committed. Exceptions raised while committing in the
+        background are raised by the next call to an insert method,
+        :py:meth:`~.PipelinedVerticaBatch.commit`,
+        :py:meth:`~.PipelinedVerticaBatch.wait` or
+        :py:meth:`~.PipelinedVerticaBatch.close_batch`.
 
-        str_value_list = (
-            '%s%s%s' % (
-                enclosed_by,
-                unicode(value).replace(enclosed_by, escaped_enclosed_by),
-                enclosed_by
-            )
-            if value is not None else '' for value in value_list)
+    :param table_name:
+        A ``str`` representing the table name (including the schema) to write
+        to. Example: ``'staging.my_table'``.
 
-        return delimiter.join(str_value_list) + suffix
+    :param odbc_kwargs:
+        A ``dict`` containing the ODBC connection keyword arguments.
 
-    def insert_list(self, value_list):
-        """
-        Insert a ``list`` of values (instead of a ``str`` representing a line).
+    :param truncate_table:
+        A ``bool`` indicating if the table needs truncating before first
+        insert. Default: ``False``. *Optional*.
 
-        Example::
+    :param reconnect:
+        A ``bool`` indicating if the connections should bypass the load
+        balancer. Default: ``True``. *Optional*.
 
-            batch.insert_list(['value_1', 'value_2'])
+    :param node_selector:
+        A callable ordering the nodes for the connections, see
+        :py:func:`~pyvertica.connection.get_connection_list`. *Optional*.
 
-        :param value_list:
-            A ``list``. Each item should represent a column value.
+    :param commit_callback:
+        A callable which is called (in the background thread) with the return
+        value of :py:meth:`.VerticaBatch.get_errors` before every commit. When
+        it returns ``False``, the transaction is rolled back instead.
+        *Optional*.
 
-        """
-        return self.insert_line(self._single_list_to_string(value_list))
+    :param kwargs:
+        Extra keyword arguments for both :py:class:`.VerticaBatch` objects
+        (e.g. ``column_list``, ``copy_options`` or the commit policy
+        arguments). When a commit policy is given, the batch is committed
+        in the background when the policy is reached.
 
-    @require_started_batch
-    def insert_lists(self, value_lists, row_count=1):
-        """
-        Insert an ``iterable`` of ``iterable`` values (instead of a single
-        string). The iterables can be lists, generators, etc.
+    """
+    def __init__(
+            self,
+            table_name,
+            odbc_kwargs={},
+            truncate_table=False,
+            reconnect=True,
+            commit_callback=None,
+            node_selector=None,
+            **kwargs):
+        self._commit_callback = commit_callback
+
+        connection_list = get_connection_list(
+            2,
+            reconnect=reconnect,
+            node_selector=node_selector,
+            **odbc_kwargs
+        )
 
-        Example::
+        # the table only needs to be truncated once
+        self._batch_list = [
+            VerticaBatch(
+                table_name=table_name,
+                connection=connection,
+                truncate_table=truncate_table and not i,
+                multi_batch=True,
+                **kwargs
+            ) for i, connection in enumerate(connection_list)
+        ]
 
-            batch.insert_lists([['key1', 'value1'], ['key2', 'value2']))
+        # the commit policy is applied by this object, to commit in the
+        # background
+        self._has_commit_policy = self._batch_list[0]._has_commit_policy
+        for batch in self._batch_list:
+            batch._has_commit_policy = False
 
-        :param value_lists:
-            An ``iterable``. Each iterable is another ``iterable`` containing
-            the values to insert.
+        self._active_batch, self._standby_batch = self._batch_list
+        self._exception = None
+        self._thread = None
 
-        :param row_count:
-            An ``int``. The number of rows being inserted. Since the
-            ``value_lists`` parameter may be a generator, the number of
-            rows is not easily determinable. Therefore, the number of
-            rows being inserted must be specified.
-        """
-        suffix = self.copy_options_dict['RECORD TERMINATOR']
-        strings = (self._single_list_to_string(value_list,
-                                               suffix=suffix)
-                   for value_list in value_lists)
-        self._fifo_obj.write(
-            "".join(strings)
-        )
-        self._total_count += row_count
-        self._batch_count += row_count
+        self._run_in_background(self._standby_batch._start_batch)
 
-    @require_started_batch
-    def insert_line(self, line_str):
+    def _run_in_background(self, func, *args):
         """
-        Insert a ``str`` containing all the values.
+        Execute ``func`` in the background thread.
 
-        This is useful when inserting lines directly from a CSV file for
-        example.
+        An exception raised by ``func`` is stored, to be re-raised in the
+        calling thread.
 
-        .. note:: When you have a loghandler with ``DEBUG`` level, every query
-            will be logged. For performance reason, this log statement is only
-            executed when ``__debug__`` equals ``True`` (which is the default
-            case). For a better performance, you should invoke the Python
-            interpreter with the ``-O`` argument or set the environment
-            variable ``PYTHONOPTIMIZE`` to something.
+        """
+        def run():
+            try:
+                func(*args)
+            except Exception as e:
+                logger.exception('Something unexpected happened')
+                self._exception = e
 
-        Example::
+        self._thread = threading.Thread(target=run)
+        self._thread.daemon = True
+        self._thread.start()
 
-            batch.insert_line('"value_1";"value_2"')
+    def _raise_exception(self):
+        """
+        Re-raise the exception raised in the background thread (if any).
+        """
+        if self._exception is not None:
+            exception, self._exception = self._exception, None
+            raise exception
 
-        :param line_str:
-            A ``str`` representing the line to insert. Make sure the ``str``
-            is formatted according :py:attr:`~.VerticaBatch.copy_options_dict`.
-            Example: ``'"value1";"value2";"value3"'``.
+    def _commit_and_restart(self, batch):
+        """
+        Commit (or rollback) ``batch`` and start its next ``COPY`` query.
+
+        This is executed in the background thread.
 
         """
-        if __debug__:
-            logger.debug(u'Inserting line: {0}'.format(line_str))
+        commit = True
+        if self._commit_callback:
+            commit = self._commit_callback(*batch.get_errors())
 
-        self._fifo_obj.write(
-            line_str + self.copy_options_dict['RECORD TERMINATOR'])
+        if commit is False:
+            batch.rollback()
+        else:
+            batch.commit()
 
-        self._total_count += 1
-        self._batch_count += 1
+        batch._start_batch()
 
-    @require_started_batch
-    def insert_raw(self, raw_str):
+    def _apply_commit_policy(self):
         """
-        Insert a raw ``str``.
+        Commit when the commit policy of the active batch has been reached.
+        """
+        self._raise_exception()
+        if (self._has_commit_policy and
+                self._active_batch._commit_policy_reached()):
+            self.commit()
 
-        A raw ``str`` does not have to be a complete row, but can be a part of
-        a row or even multiple rows. This is useful when you have a file that
-        is already in a format readable by Vertica.
+    def wait(self):
         """
-        if __debug__:
-            logger.debug(u'Inserting raw: {0}'.format(raw_str))
+        Wait for the background thread to finish.
 
-        self._fifo_obj.write(raw_str)
+        :raises:
+            The exception raised in the background thread (if any).
 
-        self._total_count += 1
-        self._batch_count += 1
+        """
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._raise_exception()
 
-    def get_errors(self):
+    def get_batch_count(self):
         """
-        Get errors that were raised since the last commit.
+        Return number (``int``) of inserted items since the last commit.
 
-        This will check constraint errors and rejected data by the database.
-        Please note that this will remove the rejected data file after calling
-        this method. Therfore it is not possible to call this method more than
-        once per batch!
+        :return:
+            An ``int``.
 
-        .. note:: Since this is checking the contraints as well, it is assumed
-            that all contrains were met before starting the batch. Otherwise,
-            these errors will show up within this method.
+        """
+        return self._active_batch.get_batch_count()
 
-        :return:
-            A ``tuple`` with as first item a ``int`` representing the number
-            of errors. The second item is a file-like object containing the
-            error-data in plain text. Since this is an instance
-            of :py:class:`!tempfile.TemporaryFile`, it will be removed
-            automatically.
+    def get_total_count(self):
+        """
+        Return total number (``int``) of inserted items.
 
-            .. note:: The file-like object can be empty, when ``REJECTEDFILE``
-               is set to ``False``.
+        :return:
+            An ``int``.
 
         """
-        if self._in_batch:
-            self._end_batch()
+        return sum(batch.get_total_count() for batch in self._batch_list)
 
-        error_file_obj = tempfile.TemporaryFile(bufsize=0)
+    def insert_line(self, line_str):
+        """
+        Insert a ``str`` containing all the values.
 
-        if not self.get_batch_count():
-            return(False, error_file_obj)
+        See :py:meth:`.VerticaBatch.insert_line`.
 
-        error_count = self._get_num_rejected_rows()
+        """
+        self._active_batch.insert_line(line_str)
+        self._apply_commit_policy()
 
-        if self._analyze_constraints:
-            try:
-                analyze_constraints = self._cursor.execute(
-                    "SELECT ANALYZE_CONSTRAINTS('{0}')".format(
-                        self._table_name))
-            except Exception as e:
-                if not 'no constraints defined' in str(e).lower():
-                    raise e
-                analyze_constraints = None
+    def insert_list(self, value_list):
+        """
+        Insert a ``list`` of values.
 
-            if analyze_constraints and analyze_constraints.rowcount > 0:
-                error_count += analyze_constraints.rowcount
-                error_file_obj.write(
-                    'At least one constraint not met: {0}\n'.format(
-                        ', '.join(analyze_constraints.fetchone())))
+        See :py:meth:`.VerticaBatch.insert_list`.
 
-        if self.copy_options_dict['REJECTEDFILE']:
-            self._rejected_file_obj.seek(0)
-            file_size = os.path.getsize(self._rejected_file_obj.name)
-            read_func = lambda: self._rejected_file_obj.read(1024 * 1024)
-            error_prefix = 'Rejected data at line: '
+        """
+        self._active_batch.insert_list(value_list)
+        self._apply_commit_policy()
 
-            for counter, line in enumerate(iter((read_func), '')):
-                if counter == 0:
-                    error_file_obj.write(error_prefix)
+    def insert_lists(self, value_lists, row_count=None):
+        """
+        Insert an ``iterable`` of ``iterable`` values.
 
-                line = line.replace(
-                    self.copy_options_dict['RECORD TERMINATOR'],
-                    '\n{0}'.format(error_prefix)
-                )
+        See :py:meth:`.VerticaBatch.insert_lists`.
 
-                if self._rejected_file_obj.tell() == file_size:
-                    line = line[:-len(error_prefix)]
+        """
+        self._active_batch.insert_lists(value_lists)
+        self._apply_commit_policy()
 
-                error_file_obj.write(line)
+    def insert_raw(self, raw_str):
+        """
+        Insert a raw ``str``.
 
-            error_file_obj.seek(0)
+        See :py:meth:`.VerticaBatch.insert_raw`.
 
-        return (error_count, error_file_obj)
+        """
+        self._active_batch.insert_raw(raw_str)
+        self._apply_commit_policy()
 
     def commit(self):
         """
-        Commit the current transaction.
-        """
-        batch_count = self.get_batch_count()
+        Commit the inserted rows in the background.
 
-        if self._in_batch:
-            self._end_batch()
+        This waits for the previous commit to finish, and then swaps the
+        batches: the rows inserted after this call are sent to the other
+        ``COPY`` query, while the current one is committed.
 
-        self._connection.commit()
-        logger.info('Transaction committed, {0} lines inserted'.format(
-            batch_count))
+        """
+        self.wait()
+
+        batch = self._active_batch
+        self._active_batch, self._standby_batch = (
+            self._standby_batch, self._active_batch)
+        self._run_in_background(self._commit_and_restart, batch)
 
     def rollback(self):
         """
-        Rollback the current transaction.
-        """
-        if self._in_batch:
-            self._end_batch()
+        Rollback the rows inserted since the last commit.
 
-        self._connection.rollback()
-        logger.info('Transaction rolled back')
+        This waits for the previous commit to finish.
 
-    def get_cursor(self):
         """
-        Return a cursor to the database.
+        self.wait()
+        self._active_batch.rollback()
 
-        This is useful when you want to add extra data within the same
-        transaction of the batch import.
+    def close_batch(self):
+        """
+        Wait for the last commit and close out both batches.
+
+        The rows inserted since the last call to
+        :py:meth:`~.PipelinedVerticaBatch.commit` are rolled back.
 
         :return:
-            Instance of :py:class:`!pyodbc.Cursor`.
+            ``True`` when both batches ended clean.
 
         """
-        return self._connection.cursor()
+        self.wait()
+
+        ended_clean = True
+        for batch in self._batch_list:
+            if batch._in_batch:
+                batch.rollback()
+            if batch._batch_initialized:
+                ended_clean = batch.close_batch() and ended_clean
+        return ended_clean
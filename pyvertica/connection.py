@@ -1,7 +1,49 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
 import pyodbc
 
 
-def get_connection(reconnect=True, **kwargs):
+logger = logging.getLogger(__name__)
+
+
+TOPOLOGY_CACHE_TTL = 300
+"""
+Default number of seconds the list of ``UP`` nodes of a cluster is cached,
+see the ``topology_cache_ttl`` argument of :py:func:`.get_connection`.
+"""
+
+# connection keyword arguments => (expiry time, list of node addresses)
+_topology_cache = {}
+_topology_cache_lock = threading.Lock()
+
+NODE_BLACKLIST_SECONDS = 30
+"""
+Number of seconds a node is blacklisted after a failed connection attempt.
+This doubles for every consecutive failure, up to
+:py:data:`.NODE_BLACKLIST_MAX_SECONDS`.
+"""
+
+NODE_BLACKLIST_MAX_SECONDS = 960
+"""
+Maximum number of seconds a node is blacklisted.
+"""
+
+# node address => (blacklisted until, number of consecutive failures)
+_node_blacklist = {}
+_node_blacklist_lock = threading.Lock()
+
+
+def get_connection(
+        reconnect=True,
+        topology_cache_ttl=TOPOLOGY_CACHE_TTL,
+        node_selector=None,
+        connect_timeout=None,
+        retry_budget=None,
+        **kwargs):
     """
     Get :py:mod:`!pyodbc` connection for the given ``dsn``.
 
@@ -19,12 +61,47 @@ def get_connection(reconnect=True, **kwargs):
     to that specific node and return this connection instance. This is done
     to avoid that all the data has to pass the load-balancer.
 
+    The list of ``UP`` nodes is cached for ``topology_cache_ttl`` seconds, so
+    the following connections are made to a node directly.
+
+    Which node is used is decided by the ``node_selector`` (a random node by
+    default). For bulk loads, :py:func:`.select_least_loaded_nodes` spreads
+    the load over the cluster.
+
+    When connecting to a node fails, the other ``UP`` nodes are tried. When
+    they all fail, the cache is invalidated and the nodes of the node list
+    retrieved again through the load-balancer are tried. A node which
+    failed is blacklisted for :py:data:`.NODE_BLACKLIST_SECONDS`, doubling
+    for every consecutive failure, and is only tried when no other node is
+    left.
+
     .. note:: Depending on the given keyword arguments, you need to have
         a ``odbc.ini`` file on your system.
 
     :param reconnect:
         A ``boolean`` asking to reconnect to skip load balancer.
 
+    :param topology_cache_ttl:
+        An ``int`` representing the number of seconds to cache the list of
+        ``UP`` nodes, or ``0`` to not cache it. Default:
+        :py:data:`.TOPOLOGY_CACHE_TTL`. *Optional*.
+
+    :param node_selector:
+        A callable accepting the ``list`` of node addresses and the
+        connection ``kwargs`` (including the ``connect_timeout``), returning
+        the node addresses in order of preference. E.g.
+        :py:func:`.select_random_nodes` (default),
+        :py:func:`.select_least_loaded_nodes` or an instance of
+        :py:class:`.RoundRobinNodeSelector`. *Optional*.
+
+    :param connect_timeout:
+        An ``int`` representing the number of seconds a connection attempt
+        may take (the ``timeout`` argument of :py:mod:`!pyodbc`). Default:
+        the timeout of the driver. *Optional*.
+
+    :param retry_budget:
+        An ``int`` representing the number of seconds after which no other
+        node is tried anymore, or ``None`` to try all the nodes. *Optional*.
 
     :param kwargs:
         Keyword arguments accepted by the :py:mod:`!pyodbc` module.
@@ -33,37 +110,528 @@ def get_connection(reconnect=True, **kwargs):
     :return:
         Return an instance of :class:`!pyodbc.Connection`.
 
+    :raises:
+        :py:exc:`.NodeConnectionError` when no node could be tried within the
+        ``retry_budget``, else the error of the last connection attempt when
+        all the nodes failed.
+
+    """
+    if not reconnect:
+        return pyodbc.connect(**_get_connect_kwargs(kwargs, connect_timeout))
+
+    deadline = None
+    if retry_budget is not None:
+        deadline = time.time() + retry_budget
+
+    node_address_list = _get_cached_node_address_list(
+        kwargs, topology_cache_ttl, connect_timeout)
+    node_address_list = (node_selector or select_random_nodes)(
+        node_address_list, _get_connect_kwargs(kwargs, connect_timeout))
+
+    return _connect_with_failover(
+        kwargs, node_address_list, topology_cache_ttl, connect_timeout,
+        deadline)[0]
+
+
+def get_connection_list(
+        count,
+        reconnect=True,
+        topology_cache_ttl=TOPOLOGY_CACHE_TTL,
+        node_selector=None,
+        connect_timeout=None,
+        retry_budget=None,
+        **kwargs):
+    """
+    Get a ``list`` of :py:mod:`!pyodbc` connections, spread over the nodes.
+
+    Usage example::
+
+        from pyvertica.connection import get_connection_list
+
+
+        connection_list = get_connection_list(4, dsn='TestDSN')
+
+    When ``reconnect`` is ``True``, the list of ``UP`` nodes is retrieved
+    (in random order) through one connection to the load-balancer, or taken
+    from the cache (see :py:func:`.get_connection`). Then the connections are
+    made to these nodes, each connection to a different node as long as there
+    are more nodes than requested connections. When connecting to a node
+    fails, the connection is made to another node (see
+    :py:func:`.get_connection`).
+
+    :param count:
+        An ``int`` representing the number of connections to return.
+
+    :param reconnect:
+        A ``boolean`` asking to reconnect to skip load balancer.
+
+    :param topology_cache_ttl:
+        An ``int`` representing the number of seconds to cache the list of
+        ``UP`` nodes, or ``0`` to not cache it. Default:
+        :py:data:`.TOPOLOGY_CACHE_TTL`. *Optional*.
+
+    :param node_selector:
+        A callable ordering the node addresses by preference, see
+        :py:func:`.get_connection`. Default: :py:func:`.select_random_nodes`.
+        *Optional*.
+
+    :param connect_timeout:
+        An ``int`` representing the number of seconds a connection attempt
+        may take. *Optional*.
+
+    :param retry_budget:
+        An ``int`` representing the number of seconds after which no other
+        node is tried anymore (for all the connections together), or
+        ``None`` to try all the nodes. *Optional*.
+
+    :param kwargs:
+        Keyword arguments accepted by the :py:mod:`!pyodbc` module.
+        See: http://code.google.com/p/pyodbc/wiki/Module#connect
+
+    :return:
+        A ``list`` of :class:`!pyodbc.Connection` instances.
+
+    :raises:
+        :py:exc:`.NodeConnectionError` when there is no ``UP`` node, else see
+        :py:func:`.get_connection`.
+
+    """
+    if not reconnect:
+        return [
+            pyodbc.connect(**_get_connect_kwargs(kwargs, connect_timeout))
+            for i in range(count)
+        ]
+
+    deadline = None
+    if retry_budget is not None:
+        deadline = time.time() + retry_budget
+
+    node_address_list = _get_cached_node_address_list(
+        kwargs, topology_cache_ttl, connect_timeout)
+    node_address_list = (node_selector or select_random_nodes)(
+        node_address_list, _get_connect_kwargs(kwargs, connect_timeout))
+    if not node_address_list:
+        raise NodeConnectionError('No UP node to connect to')
+
+    connection_list = []
+    try:
+        for i in range(count):
+            # start every connection at the next node
+            index = i % len(node_address_list)
+            connection_list.append(_connect_with_failover(
+                kwargs,
+                node_address_list[index:] + node_address_list[:index],
+                topology_cache_ttl,
+                connect_timeout,
+                deadline,
+            )[0])
+    except Exception:
+        for connection in connection_list:
+            _close_quietly(connection)
+        raise
+
+    return connection_list
+
+
+def _connect_with_failover(
+        kwargs,
+        node_address_list,
+        topology_cache_ttl,
+        connect_timeout,
+        deadline):
+    """
+    Connect to the first node of ``node_address_list`` which accepts the
+    connection.
+
+    Blacklisted nodes are tried last. When all the nodes fail, the node list
+    is retrieved again and the nodes which were not tried yet are tried.
+
+    :param kwargs:
+        A ``dict`` containing the connection keyword arguments.
+
+    :param node_address_list:
+        A ``list`` of ``str`` objects representing the node addresses, in
+        order of preference.
+
+    :param topology_cache_ttl:
+        An ``int`` representing the number of seconds to cache the list of
+        ``UP`` nodes.
+
+    :param connect_timeout:
+        An ``int`` representing the number of seconds a connection attempt
+        may take, or ``None``.
+
+    :param deadline:
+        A ``float`` representing the time after which no other node is
+        tried, or ``None``.
+
+    :return:
+        A ``tuple`` containing the connection and its node address.
+
+    :raises:
+        :py:exc:`.NodeConnectionError` when no node could be tried, else the
+        error of the last connection attempt.
+
+    """
+    connect_kwargs = _get_connect_kwargs(kwargs, connect_timeout)
+    tried_set = set()
+    last_error = None
+
+    for refresh in (False, True):
+        if deadline is not None and time.time() >= deadline:
+            break
+
+        if refresh:
+            _invalidate_node_address_list(kwargs)
+            node_address_list = _get_cached_node_address_list(
+                kwargs, topology_cache_ttl, connect_timeout)
+
+        for node_address in _sort_blacklisted_last(node_address_list):
+            if node_address in tried_set:
+                continue
+            if deadline is not None and time.time() >= deadline:
+                break
+            tried_set.add(node_address)
+
+            try:
+                connection = pyodbc.connect(
+                    servername=node_address, **connect_kwargs)
+            except Exception as e:
+                logger.warning('Could not connect to node {0}: {1}'.format(
+                    node_address, e))
+                _blacklist_node(node_address)
+                last_error = e
+                continue
+
+            _unblacklist_node(node_address)
+            return (connection, node_address)
+
+    if last_error is not None:
+        raise last_error
+
+    raise NodeConnectionError(
+        'No node could be tried within the retry budget')
+
+
+def _get_connect_kwargs(kwargs, connect_timeout):
     """
-    connection = pyodbc.connect(**kwargs)
+    Return the keyword arguments for :py:func:`!pyodbc.connect`.
 
-    if reconnect:
-        return get_connection(
-            reconnect=False,
-            servername=_get_random_node_address(connection),
-            **kwargs
+    :param kwargs:
+        A ``dict`` containing the connection keyword arguments.
+
+    :param connect_timeout:
+        An ``int`` representing the number of seconds a connection attempt
+        may take, or ``None``.
+
+    :return:
+        A ``dict``.
+
+    """
+    if connect_timeout is None:
+        return kwargs
+    return dict(kwargs, timeout=connect_timeout)
+
+
+def _sort_blacklisted_last(node_address_list):
+    """
+    Return the node addresses, with the blacklisted nodes last (the one
+    released first, first).
+
+    :param node_address_list:
+        A ``list`` of ``str`` objects representing the node addresses.
+
+    :return:
+        A ``list`` of ``str`` objects representing the node addresses.
+
+    """
+    now = time.time()
+
+    with _node_blacklist_lock:
+        blacklist = dict(_node_blacklist)
+
+    def get_blacklisted_until(node_address):
+        blacklisted_until = blacklist.get(node_address, (0, 0))[0]
+        return blacklisted_until if blacklisted_until > now else 0
+
+    # sorted is stable, the other nodes stay in order of preference
+    return sorted(node_address_list, key=get_blacklisted_until)
+
+
+def _blacklist_node(node_address):
+    """
+    Blacklist a node after a failed connection attempt.
+
+    :param node_address:
+        A ``str`` representing the address of the node.
+
+    """
+    with _node_blacklist_lock:
+        failure_count = _node_blacklist.get(node_address, (0, 0))[1] + 1
+        blacklist_seconds = min(
+            NODE_BLACKLIST_SECONDS * 2 ** (failure_count - 1),
+            NODE_BLACKLIST_MAX_SECONDS
         )
+        _node_blacklist[node_address] = (
+            time.time() + blacklist_seconds, failure_count)
+
+
+def _unblacklist_node(node_address):
+    """
+    Remove a node from the blacklist after a successful connection.
+
+    :param node_address:
+        A ``str`` representing the address of the node.
+
+    """
+    with _node_blacklist_lock:
+        _node_blacklist.pop(node_address, None)
 
-    return connection
 
+def select_random_nodes(node_address_list, kwargs):
+    """
+    Node selector returning the nodes in random order.
+
+    :param node_address_list:
+        A ``list`` of ``str`` objects representing the node addresses.
+
+    :param kwargs:
+        A ``dict`` containing the connection keyword arguments.
+
+    :return:
+        A ``list`` of ``str`` objects representing the node addresses.
 
-def _get_random_node_address(connection):
     """
-    Return the address of a random node in the cluster.
+    return random.sample(node_address_list, len(node_address_list))
+
+
+def select_least_loaded_nodes(node_address_list, kwargs):
+    """
+    Node selector returning the least loaded nodes first.
+
+    The load of the nodes is taken from ``v_monitor``. Nodes are ordered by
+    the number of running ``COPY`` statements, then by the number of
+    sessions and then by the memory in use by the resource pools. Ties are
+    broken randomly, to not pick the same node for simultaneous loads.
+
+    The load is queried through a connection to the first node which is not
+    blacklisted. When this fails, the nodes are returned in random order.
+
+    :param node_address_list:
+        A ``list`` of ``str`` objects representing the node addresses.
+
+    :param kwargs:
+        A ``dict`` containing the connection keyword arguments.
+
+    :return:
+        A ``list`` of ``str`` objects representing the node addresses.
+
+    """
+    try:
+        connection = pyodbc.connect(
+            servername=_sort_blacklisted_last(node_address_list)[0],
+            **kwargs)
+        try:
+            load_dict = _get_node_load_dict(connection)
+        finally:
+            connection.close()
+    except Exception as e:
+        logger.info('Could not get the load of the nodes: {0}'.format(e))
+        return select_random_nodes(node_address_list, kwargs)
+
+    return sorted(
+        select_random_nodes(node_address_list, kwargs),
+        key=lambda node_address: load_dict.get(node_address, (0, 0, 0)),
+    )
+
+
+class RoundRobinNodeSelector(object):
+    """
+    Node selector starting every call at the next node.
+
+    Usage example::
+
+        from pyvertica.connection import (
+            RoundRobinNodeSelector, get_connection)
+
+
+        node_selector = RoundRobinNodeSelector()
+
+        connection_list = [
+            get_connection(node_selector=node_selector, dsn='TestDSN')
+            for i in range(4)
+        ]
+
+    The same instance should be used for all the connections that need to be
+    spread over the nodes. This is the default node selector of
+    :py:class:`.ConnectionPool`.
+
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = 0
+
+    def __call__(self, node_address_list, kwargs):
+        """
+        Return the node addresses, starting at the next node.
+
+        :param node_address_list:
+            A ``list`` of ``str`` objects representing the node addresses.
+
+        :param kwargs:
+            A ``dict`` containing the connection keyword arguments.
+
+        :return:
+            A ``list`` of ``str`` objects representing the node addresses.
+
+        :raises:
+            :py:exc:`.NodeConnectionError` when ``node_address_list`` is
+            empty.
+
+        """
+        if not node_address_list:
+            raise NodeConnectionError('No node to select')
+
+        with self._lock:
+            index = self._index
+            self._index += 1
+
+        index %= len(node_address_list)
+        return node_address_list[index:] + node_address_list[:index]
+
+
+def _get_node_load_dict(connection):
+    """
+    Return the load of all the ``UP`` nodes.
 
     :param connection:
         An instance of :class:`!pyodbc.Connection`.
 
     :return:
-        A ``str`` representing the address of the node.
+        A ``dict`` with the node address as key and a ``tuple`` containing
+        the number of running ``COPY`` statements, the number of sessions and
+        the memory (in KB) in use by the resource pools as value.
+
+    """
+    cursor = connection.cursor()
+    cursor.execute(
+        'SELECT n.node_address, '
+        'COALESCE(s.copy_count, 0) AS copy_count, '
+        'COALESCE(s.session_count, 0) AS session_count, '
+        'COALESCE(r.memory_inuse_kb, 0) AS memory_inuse_kb '
+        'FROM v_catalog.nodes n '
+        'LEFT JOIN ('
+        'SELECT node_name, COUNT(*) AS session_count, '
+        'SUM(CASE WHEN current_statement ILIKE ? THEN 1 ELSE 0 END) '
+        'AS copy_count '
+        'FROM v_monitor.sessions GROUP BY node_name'
+        ') s ON s.node_name = n.node_name '
+        'LEFT JOIN ('
+        'SELECT node_name, SUM(memory_inuse_kb) AS memory_inuse_kb '
+        'FROM v_monitor.resource_pool_status GROUP BY node_name'
+        ') r ON r.node_name = n.node_name '
+        'WHERE n.node_state = ?',
+        'COPY%',
+        'UP'
+    )
+    return dict(
+        (row.node_address, (
+            row.copy_count, row.session_count, row.memory_inuse_kb))
+        for row in cursor.fetchall()
+    )
+
+
+def _get_cached_node_address_list(
+        kwargs, topology_cache_ttl, connect_timeout=None):
+    """
+    Return the addresses of all the ``UP`` nodes, from the cache when it has
+    not expired yet, else through the load-balancer.
+
+    :param kwargs:
+        A ``dict`` containing the keyword arguments to connect to the
+        load-balancer.
+
+    :param topology_cache_ttl:
+        An ``int`` representing the number of seconds to cache the list, or
+        ``0`` to not cache it.
+
+    :param connect_timeout:
+        An ``int`` representing the number of seconds the connection to the
+        load-balancer may take, or ``None``. *Optional*.
+
+    :return:
+        A ``list`` of ``str`` objects representing the node addresses.
+
+    """
+    cache_key = _get_topology_cache_key(kwargs)
+
+    if topology_cache_ttl:
+        with _topology_cache_lock:
+            cache_entry = _topology_cache.get(cache_key)
+
+        if cache_entry and cache_entry[0] > time.time():
+            return cache_entry[1]
+
+    connection = pyodbc.connect(**_get_connect_kwargs(kwargs, connect_timeout))
+    try:
+        node_address_list = _get_node_address_list(connection)
+    finally:
+        connection.close()
+
+    if topology_cache_ttl and node_address_list:
+        with _topology_cache_lock:
+            _topology_cache[cache_key] = (
+                time.time() + topology_cache_ttl, node_address_list)
+
+    return node_address_list
+
+
+def _invalidate_node_address_list(kwargs):
+    """
+    Remove the cached node addresses of the cluster.
+
+    :param kwargs:
+        A ``dict`` containing the keyword arguments to connect to the
+        load-balancer.
+
+    """
+    with _topology_cache_lock:
+        _topology_cache.pop(_get_topology_cache_key(kwargs), None)
+
+
+def _get_topology_cache_key(kwargs):
+    """
+    Return the key of the topology cache for the connection ``kwargs``.
+
+    :param kwargs:
+        A ``dict`` containing the keyword arguments to connect to the
+        load-balancer.
+
+    :return:
+        A ``tuple``.
+
+    """
+    return tuple(sorted(kwargs.items()))
+
+
+def _get_node_address_list(connection):
+    """
+    Return the addresses of all the ``UP`` nodes, in random order.
+
+    :param connection:
+        An instance of :class:`!pyodbc.Connection`.
+
+    :return:
+        A ``list`` of ``str`` objects representing the node addresses.
 
     """
     cursor = connection.cursor()
     cursor.execute(
         'SELECT node_address FROM nodes WHERE node_state = ? '
-        'ORDER BY RANDOM() LIMIT 1',
+        'ORDER BY RANDOM()',
         'UP'
     )
-    return cursor.fetchone().node_address
+    return [row.node_address for row in cursor.fetchall()]
 
 
 def connection_details(con):
@@ -99,3 +667,391 @@ def connection_details(con):
         'user': details.user,
         'db': details.db
     }
+
+
+class NodeConnectionError(Exception):
+    """
+    Exception is raised when no node could be connected to within the retry
+    budget.
+    """
+    pass
+
+
+class ConnectionPoolError(Exception):
+    """
+    Exception is raised when no connection could be checked out of a
+    :py:class:`.ConnectionPool` in time.
+    """
+    pass
+
+
+class ConnectionPool(object):
+    """
+    A thread-safe pool of :py:mod:`!pyodbc` connections.
+
+    Usage example::
+
+        from pyvertica.connection import ConnectionPool
+
+
+        pool = ConnectionPool(max_size=4, dsn='TestDSN')
+
+        with pool.connection() as connection:
+            cursor = connection.cursor()
+            ...
+
+        batch = VerticaBatch(
+            table_name='schema.my_table',
+            connection=pool.get_connection(),
+        )
+
+    The connections are kept in a sub-pool per node. When ``reconnect`` is
+    ``True``, the list of ``UP`` nodes is retrieved (once) through the
+    load-balancer, and new connections are spread over the nodes. A
+    connection for a specific node can be requested with ``node_address``.
+
+    Idle connections are closed after ``max_idle_time`` seconds, and are
+    validated (with ``SELECT 1``) when they are checked out. A connection
+    which is returned to the pool is rolled back first.
+
+    :param max_size:
+        An ``int`` representing the maximum number of connections (idle and
+        checked out). Default: ``10``. *Optional*.
+
+    :param max_idle_time:
+        An ``int`` representing the number of seconds after which an idle
+        connection is closed. Default: ``300``. *Optional*.
+
+    :param validate:
+        A ``bool`` indicating if an idle connection should be validated
+        before it is checked out. Default: ``True``. *Optional*.
+
+    :param timeout:
+        An ``int`` representing the number of seconds to wait for a
+        connection when the pool is exhausted, or ``None`` to wait forever.
+        Default: ``None``. *Optional*.
+
+    :param reconnect:
+        A ``boolean`` asking to connect directly to the nodes, to skip the
+        load balancer. Default: ``True``. *Optional*.
+
+    :param topology_cache_ttl:
+        An ``int`` representing the number of seconds to cache the list of
+        ``UP`` nodes, or ``0`` to not cache it. Default:
+        :py:data:`.TOPOLOGY_CACHE_TTL`. *Optional*.
+
+    :param node_selector:
+        A callable ordering the node addresses by preference for new
+        connections, see :py:func:`.get_connection`. Default: a new
+        :py:class:`.RoundRobinNodeSelector`. *Optional*.
+
+    :param connect_timeout:
+        An ``int`` representing the number of seconds a connection attempt
+        may take. *Optional*.
+
+    :param retry_budget:
+        An ``int`` representing the number of seconds after which no other
+        node is tried anymore when opening a new connection, see
+        :py:func:`.get_connection`. *Optional*.
+
+    :param kwargs:
+        Keyword arguments accepted by the :py:mod:`!pyodbc` module.
+        See: http://code.google.com/p/pyodbc/wiki/Module#connect
+
+    """
+    def __init__(
+            self,
+            max_size=10,
+            max_idle_time=300,
+            validate=True,
+            timeout=None,
+            reconnect=True,
+            topology_cache_ttl=TOPOLOGY_CACHE_TTL,
+            node_selector=None,
+            connect_timeout=None,
+            retry_budget=None,
+            **kwargs):
+        self._max_size = max_size
+        self._max_idle_time = max_idle_time
+        self._validate = validate
+        self._timeout = timeout
+        self._reconnect = reconnect
+        self._topology_cache_ttl = topology_cache_ttl
+        self._node_selector = node_selector or RoundRobinNodeSelector()
+        self._connect_timeout = connect_timeout
+        self._retry_budget = retry_budget
+        self._kwargs = kwargs
+
+        self._condition = threading.Condition()
+        # node address => list of (connection, time it was returned) tuples
+        self._idle_dict = {}
+        # checked out connection => node address
+        self._in_use_dict = {}
+        # number of connections being opened
+        self._pending_count = 0
+
+    def _get_size(self):
+        """
+        Return the number of connections (idle, checked out and being
+        opened). Must be called with the lock held.
+
+        :return:
+            An ``int``.
+
+        """
+        return (
+            len(self._in_use_dict) + self._pending_count +
+            sum(len(idle_list) for idle_list in self._idle_dict.values())
+        )
+
+    def _evict_idle(self):
+        """
+        Close the connections which have been idle for too long. Must be
+        called with the lock held.
+        """
+        min_time = time.time() - self._max_idle_time
+
+        for node_address, idle_list in self._idle_dict.items():
+            for connection, returned_time in idle_list:
+                if returned_time < min_time:
+                    _close_quietly(connection)
+            self._idle_dict[node_address] = [
+                idle for idle in idle_list if idle[1] >= min_time]
+
+    def _pop_idle(self, node_address):
+        """
+        Return an idle connection, preferably to ``node_address``. Must be
+        called with the lock held.
+
+        :return:
+            A ``tuple`` containing the connection and its node address, or
+            ``(None, None)``.
+
+        """
+        node_address_list = self._idle_dict.keys()
+        if node_address is not None:
+            if self._idle_dict.get(node_address):
+                node_address_list = [node_address]
+            elif self._get_size() < self._max_size:
+                # a new connection to the requested node can be opened
+                node_address_list = []
+
+        for idle_node_address in node_address_list:
+            idle_list = self._idle_dict[idle_node_address]
+            if idle_list:
+                # the most recently used connection
+                return (idle_list.pop()[0], idle_node_address)
+
+        return (None, None)
+
+    def _checkout(self, node_address, deadline):
+        """
+        Check out an idle connection, or reserve a slot for a new one.
+
+        :return:
+            A ``tuple`` containing the connection and its node address, or
+            ``(None, None)`` when a new connection should be opened.
+
+        :raises:
+            :py:exc:`.ConnectionPoolError` when the ``timeout`` expired.
+
+        """
+        with self._condition:
+            while True:
+                self._evict_idle()
+
+                connection, idle_node_address = self._pop_idle(node_address)
+                if connection is not None:
+                    self._in_use_dict[connection] = idle_node_address
+                    return (connection, idle_node_address)
+
+                if self._get_size() < self._max_size:
+                    self._pending_count += 1
+                    return (None, None)
+
+                if deadline is None:
+                    self._condition.wait()
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise ConnectionPoolError(
+                            'No connection available within {0} '
+                            'seconds'.format(self._timeout))
+                    self._condition.wait(remaining)
+
+    def _connect(self, node_address):
+        """
+        Open a new connection.
+
+        When connecting to the node fails, another node is tried (see
+        :py:func:`.get_connection`).
+
+        :param node_address:
+            A ``str`` representing the preferred node, or ``None``.
+
+        :return:
+            A ``tuple`` containing the connection and its node address.
+
+        """
+        if not self._reconnect:
+            return (
+                pyodbc.connect(**_get_connect_kwargs(
+                    self._kwargs, self._connect_timeout)),
+                None
+            )
+
+        deadline = None
+        if self._retry_budget is not None:
+            deadline = time.time() + self._retry_budget
+
+        node_address_list = self._node_selector(
+            _get_cached_node_address_list(
+                self._kwargs, self._topology_cache_ttl, self._connect_timeout),
+            _get_connect_kwargs(self._kwargs, self._connect_timeout)
+        )
+        if node_address is not None:
+            node_address_list = [node_address] + [
+                other_node_address for other_node_address in node_address_list
+                if other_node_address != node_address
+            ]
+
+        return _connect_with_failover(
+            self._kwargs,
+            node_address_list,
+            self._topology_cache_ttl,
+            self._connect_timeout,
+            deadline,
+        )
+
+    def _is_healthy(self, connection):
+        """
+        Return if the ``connection`` is still usable.
+
+        :return:
+            A ``bool``.
+
+        """
+        try:
+            connection.cursor().execute('SELECT 1').fetchone()
+        except Exception:
+            return False
+        return True
+
+    def _discard(self, connection):
+        """
+        Close a checked out ``connection`` and remove it from the pool.
+        """
+        with self._condition:
+            self._in_use_dict.pop(connection, None)
+            self._condition.notify()
+        _close_quietly(connection)
+
+    def get_connection(self, node_address=None):
+        """
+        Check out a connection.
+
+        The connection must be returned with
+        :py:meth:`~.ConnectionPool.put_connection`.
+
+        :param node_address:
+            A ``str`` representing the address of the preferred node.
+            *Optional*.
+
+        :return:
+            An instance of :class:`!pyodbc.Connection`.
+
+        :raises:
+            :py:exc:`.ConnectionPoolError` when no connection is available
+            within ``timeout`` seconds.
+
+        """
+        deadline = None
+        if self._timeout is not None:
+            deadline = time.time() + self._timeout
+
+        while True:
+            connection, connection_node_address = self._checkout(
+                node_address, deadline)
+
+            if connection is None:
+                try:
+                    connection, connection_node_address = self._connect(
+                        node_address)
+                finally:
+                    with self._condition:
+                        self._pending_count -= 1
+                        if connection is not None:
+                            self._in_use_dict[connection] = (
+                                connection_node_address)
+                        self._condition.notify()
+                return connection
+
+            if not self._validate or self._is_healthy(connection):
+                return connection
+
+            logger.info('Discarding broken connection to {0}'.format(
+                connection_node_address))
+            self._discard(connection)
+
+    def put_connection(self, connection):
+        """
+        Return a checked out connection to the pool.
+
+        The current transaction of the connection is rolled back.
+
+        :param connection:
+            An instance of :class:`!pyodbc.Connection`.
+
+        """
+        try:
+            connection.rollback()
+        except Exception:
+            self._discard(connection)
+            return
+
+        with self._condition:
+            node_address = self._in_use_dict.pop(connection)
+            self._idle_dict.setdefault(node_address, []).append(
+                (connection, time.time()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, node_address=None):
+        """
+        Context manager checking out a connection, and returning it to the
+        pool afterwards.
+
+        :param node_address:
+            A ``str`` representing the address of the preferred node.
+            *Optional*.
+
+        """
+        connection = self.get_connection(node_address)
+        try:
+            yield connection
+        finally:
+            self.put_connection(connection)
+
+    def close(self):
+        """
+        Close all the idle connections.
+        """
+        with self._condition:
+            for idle_list in self._idle_dict.values():
+                for connection, returned_time in idle_list:
+                    _close_quietly(connection)
+            self._idle_dict = {}
+
+
+def _close_quietly(connection):
+    """
+    Close ``connection``, ignoring errors.
+
+    :param connection:
+        An instance of :class:`!pyodbc.Connection`.
+
+    """
+    try:
+        connection.close()
+    except Exception:
+        pass
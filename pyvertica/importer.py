@@ -1,4 +1,5 @@
 import logging
+from contextlib import contextmanager
 from datetime import datetime
 
 from pyvertica.connection import get_connection
@@ -22,6 +23,28 @@ class BatchImportError(Exception):
     pass
 
 
+@contextmanager
+def _checkout_connection(odbc_kwargs, connection_pool):
+    """
+    Context manager returning a connection from ``connection_pool`` (and
+    returning it to the pool afterwards), or a new connection when
+    ``connection_pool`` is ``None``.
+
+    :param odbc_kwargs:
+        A ``dict`` containing the ODBC connection keyword arguments.
+
+    :param connection_pool:
+        An instance of :py:class:`~pyvertica.connection.ConnectionPool`, or
+        ``None``.
+
+    """
+    if connection_pool is None:
+        yield get_connection(**odbc_kwargs)
+    else:
+        with connection_pool.connection() as connection:
+            yield connection
+
+
 class BaseImporter(object):
     """
     Base class for importing data into Vertica.
@@ -108,6 +131,11 @@ class BaseImporter(object):
         when importing from a file, or an identifier when the source is an
         API. This should be unique for every import!
 
+    :param connection_pool:
+        An instance of :py:class:`~pyvertica.connection.ConnectionPool` to
+        take the connections from, instead of opening new connections with
+        ``odbc_kwargs``. *Optional*.
+
     :param kwargs:
         Optional extra keyword arguments, will be stored as ``self._kwargs``.
 
@@ -207,6 +235,57 @@ class BaseImporter(object):
 
     """
 
+    commit_max_rows = None
+    """
+    An ``int``. When set, the data is committed in transactions of (at most)
+    this many rows, instead of in a single transaction. See the commit policy
+    of :py:class:`~pyvertica.batch.VerticaBatch`.
+
+    .. note:: When errors are detected after a partial commit, the rows of
+        the previous transactions remain in the table. The batch history is
+        only updated by the last commit.
+
+    """
+
+    commit_max_bytes = None
+    """
+    An ``int``. When set, the data is committed in transactions of (at most)
+    this many bytes. See :py:attr:`~.BaseImporter.commit_max_rows`.
+    """
+
+    commit_max_seconds = None
+    """
+    An ``int``. When set, the data is committed at least every this many
+    seconds. See :py:attr:`~.BaseImporter.commit_max_rows`.
+    """
+
+    max_reject_ratio = None
+    """
+    A ``float``. When set, the import is committed as long as the ratio of
+    rejected rows (per transaction) does not exceed this value, e.g. ``0.01``
+    for 1%. The rejected rows are quarantined in the
+    :py:attr:`~.BaseImporter.rejects_table_name` table, within the same
+    transaction. Constraint errors still fail the import.
+    """
+
+    rejects_table_name = None
+    """
+    Name of the database table (excluding the schema) to quarantine the
+    rejected rows in (``str``). Default:
+    :py:attr:`~.BaseImporter.table_name` followed by ``'_rejects'``. The
+    structure of this table is::
+
+            batch_source_name VARCHAR(255)
+            batch_source_path VARCHAR(255)
+            batch_import_timestamp TIMESTAMP
+            table_name VARCHAR(255)
+            row_number INTEGER
+            record_offset INTEGER
+            reason VARCHAR(65000)
+            raw_data VARCHAR(65000)
+
+    """
+
     _batch_import_timestamp = None
 
     def __init__(
@@ -215,14 +294,18 @@ class BaseImporter(object):
             schema_name,
             batch_source_path,
             odbc_kwargs={},
+            connection_pool=None,
             **kwargs):
         self._reader_obj = reader_obj
         self._odbc_kwargs = odbc_kwargs
+        self._connection_pool = connection_pool
+        self._connection = None
         self._schema_name = schema_name
         self._kwargs = kwargs
         self._kwargs.update({
             'batch_source_path': batch_source_path,
         })
+        self._batch_obj = None
         logger.debug('{0} initialized'.format(self.__class__.__name__))
 
     def _get_vertica_batch(self):
@@ -235,10 +318,43 @@ class BaseImporter(object):
         """
         logger.info('Setup VerticaBatch for {0}'.format(
             self.__class__.__name__))
+
+        quarantine_table = None
+        quarantine_metadata = None
+        copy_options = {}
+        if self.max_reject_ratio is not None:
+            # the rejected rows are read back from the rejected data file
+            copy_options['REJECTEDFILE'] = True
+            quarantine_table = '{0}.{1}'.format(
+                self._schema_name,
+                self.rejects_table_name or
+                '{0}_rejects'.format(self.table_name)
+            )
+            quarantine_metadata = {
+                'batch_source_name': self.get_extra_batch_source_name_data(
+                    None),
+                'batch_source_path': self.get_extra_batch_source_path_data(
+                    None),
+                'batch_import_timestamp': (
+                    self.get_extra_batch_import_timestamp_data(None)),
+            }
+
+        if self._connection is not None:
+            connection_kwargs = {'connection': self._connection}
+        else:
+            connection_kwargs = {'odbc_kwargs': self._odbc_kwargs}
+
         return VerticaBatch(
-            odbc_kwargs=self._odbc_kwargs,
             table_name='{0}.{1}'.format(self._schema_name, self.table_name),
             column_list=self._get_db_column_list(),
+            commit_max_rows=self.commit_max_rows,
+            commit_max_bytes=self.commit_max_bytes,
+            commit_max_seconds=self.commit_max_seconds,
+            commit_callback=self._check_partial_errors,
+            quarantine_table=quarantine_table,
+            quarantine_metadata=quarantine_metadata,
+            copy_options=copy_options,
+            **connection_kwargs
         )
 
     def _get_db_column_list(self):
@@ -309,6 +425,86 @@ class BaseImporter(object):
             self.get_extra_batch_import_timestamp_data(None),
         )
 
+    def _raise_batch_import_error(self, errors_file_obj):
+        """
+        Log the errors of the batch and raise :py:exc:`.BatchImportError`.
+
+        :param errors_file_obj:
+            A file-like object, containing the errors in plain-text.
+
+        :raises:
+            :py:exc:`.BatchImportError`.
+
+        """
+        for error_line in errors_file_obj:
+            logger.error('Batch error ({0}): {1}'.format(
+                self._kwargs['batch_source_path'],
+                error_line.rstrip('\r\n')))
+
+        raise BatchImportError(
+            'Errors detected during the import of '
+            'batch_source_path={0}'.format(
+                self._kwargs['batch_source_path']
+            )
+        )
+
+    def _get_errors_accepted(self, batch_obj, error_count):
+        """
+        Return if the errors of the transaction are accepted.
+
+        The errors are accepted when they are all rejected rows (which will
+        be quarantined), and their ratio does not exceed
+        :py:attr:`~.BaseImporter.max_reject_ratio`.
+
+        :param batch_obj:
+            Instance of :py:class:`.VerticaBatch`.
+
+        :param error_count:
+            An ``int`` representing the number of errors.
+
+        :return:
+            A ``bool``.
+
+        """
+        if not error_count:
+            return True
+
+        if self.max_reject_ratio is None:
+            return False
+
+        rejected_count = batch_obj.get_rejected_count()
+        if rejected_count < error_count:
+            # constraint errors can not be quarantined
+            return False
+
+        batch_count = batch_obj.get_batch_count()
+        if rejected_count > self.max_reject_ratio * batch_count:
+            return False
+
+        logger.warning(
+            'Quarantining {0} of {1} rows ({2})'.format(
+                rejected_count, batch_count,
+                self._kwargs['batch_source_path']))
+        return True
+
+    def _check_partial_errors(self, error_count, errors_file_obj):
+        """
+        Check the errors before a partial commit.
+
+        :param error_count:
+            An ``int`` representing the number of errors.
+
+        :param errors_file_obj:
+            A file-like object, containing the errors in plain-text.
+
+        :raises:
+            :py:exc:`.BatchImportError` when the errors are not accepted
+            (see :py:attr:`~.BaseImporter.max_reject_ratio`).
+
+        """
+        if not self._get_errors_accepted(self._batch_obj, error_count):
+            self._raise_batch_import_error(errors_file_obj)
+
     def get_sql_create_table_statement(self):
         """
         Return SQL statement for creating the DB table.
@@ -345,7 +541,9 @@ class BaseImporter(object):
 
         This will import all the data from the ``reader_obj`` argument
         (given when constructing :py:class:`.BaseImporter`). In case there
-        are no errors, it will commit the import at the end.
+        are no errors (or only rejected rows, within the
+        :py:attr:`~.BaseImporter.max_reject_ratio`), it will commit the import
+        at the end.
 
         :raises:
             :py:exc:`.BatchImportError` when there are errors during the
@@ -359,7 +557,10 @@ class BaseImporter(object):
 
         """
         batch_source_path_exists = self.get_batch_source_path_exists(
-            self._kwargs['batch_source_path'], odbc_kwargs=self._odbc_kwargs)
+            self._kwargs['batch_source_path'],
+            odbc_kwargs=self._odbc_kwargs,
+            connection_pool=self._connection_pool,
+        )
 
         if batch_source_path_exists:
             raise AlreadyImportedError(
@@ -369,35 +570,49 @@ class BaseImporter(object):
                 )
             )
 
-        batch_obj = self._get_vertica_batch()
+        if self._connection_pool is not None:
+            self._connection = self._connection_pool.get_connection()
 
-        for data_dict in self._reader_obj:
-            batch_obj.insert_list(self._get_row_value_list(data_dict))
+        try:
+            self._import_batch()
+        finally:
+            if self._connection is not None:
+                self._connection_pool.put_connection(self._connection)
+                self._connection = None
+
+    def _import_batch(self):
+        """
+        Import all the data from the ``reader_obj`` in a new batch.
+
+        :raises:
+            :py:exc:`.BatchImportError` when there are errors during the
+            import.
+
+        """
+        batch_obj = self._batch_obj = self._get_vertica_batch()
+
+        try:
+            for data_dict in self._reader_obj:
+                batch_obj.insert_list(self._get_row_value_list(data_dict))
+        except BatchImportError:
+            # raised on a partial commit
+            batch_obj.rollback()
+            raise
 
         logger.info('Last line inserted')
 
         error_count, errors_file_obj = batch_obj.get_errors()
-        if not error_count:
+        if self._get_errors_accepted(batch_obj, error_count):
             batch_db_cursor = batch_obj.get_cursor()
             self._insert_into_history(batch_db_cursor)
             batch_obj.commit()
         else:
             batch_obj.rollback()
-
-            for error_line in errors_file_obj:
-                logger.error('Batch error ({0}): {1}'.format(
-                    self._kwargs['batch_source_path'],
-                    error_line.rstrip('\r\n')))
-
-            raise BatchImportError(
-                'Errors detected during the import of '
-                'batch_source_path={0}'.format(
-                    self._kwargs['batch_source_path']
-                )
-            )
+            self._raise_batch_import_error(errors_file_obj)
 
     @classmethod
-    def get_batch_source_path_exists(cls, batch_source_path, odbc_kwargs={}):
+    def get_batch_source_path_exists(
+            cls, batch_source_path, odbc_kwargs={}, connection_pool=None):
         """
         Check if the batch source-path exists in the database.
 
@@ -413,30 +628,36 @@ class BaseImporter(object):
 
             .. seealso:: https://code.google.com/p/pyodbc/wiki/Module
 
+        :param connection_pool:
+            An instance of :py:class:`~pyvertica.connection.ConnectionPool`
+            to take the connection from, instead of opening a new connection
+            with ``odbc_kwargs``. *Optional*.
+
         :return:
             ``True`` if it already exists, else ``False``.
 
         """
-        connection = get_connection(**odbc_kwargs)
-        cursor = connection.cursor()
-        cursor.execute(
-            'SELECT batch_source_path FROM {batch_history_table} '
-            'WHERE batch_source_name = ? AND batch_source_type_name = ? AND '
-            'batch_source_path = ? LIMIT 1'.format(
-                batch_history_table=cls.batch_history_table
-            ),
-            cls.batch_source_name,
-            cls.batch_source_type_name,
-            batch_source_path
-        )
-        row = cursor.fetchone()
+        with _checkout_connection(odbc_kwargs, connection_pool) as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                'SELECT batch_source_path FROM {batch_history_table} '
+                'WHERE batch_source_name = ? AND batch_source_type_name = ? '
+                'AND batch_source_path = ? LIMIT 1'.format(
+                    batch_history_table=cls.batch_history_table
+                ),
+                cls.batch_source_name,
+                cls.batch_source_type_name,
+                batch_source_path
+            )
+            row = cursor.fetchone()
 
         if row:
             return True
         return False
 
     @classmethod
-    def get_last_imported_batch_source_path(cls, odbc_kwargs):
+    def get_last_imported_batch_source_path(
+            cls, odbc_kwargs={}, connection_pool=None):
         """
         Return the last imported batch source-path.
 
@@ -449,22 +670,27 @@ class BaseImporter(object):
 
             .. seealso:: https://code.google.com/p/pyodbc/wiki/Module
 
+        :param connection_pool:
+            An instance of :py:class:`~pyvertica.connection.ConnectionPool`
+            to take the connection from, instead of opening a new connection
+            with ``odbc_kwargs``. *Optional*.
+
         :return:
             A ``str`` representing the last imported batch source-path.
 
         """
-        connection = get_connection(**odbc_kwargs)
-        cursor = connection.cursor()
-        cursor.execute(
-            'SELECT batch_source_path FROM {batch_history_table} '
-            'WHERE batch_source_name = ? AND batch_source_type_name = ? '
-            'ORDER BY batch_import_timestamp DESC LIMIT 1'.format(
-                batch_history_table=cls.batch_history_table
-            ),
-            cls.batch_source_name,
-            cls.batch_source_type_name
-        )
-        row = cursor.fetchone()
+        with _checkout_connection(odbc_kwargs, connection_pool) as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                'SELECT batch_source_path FROM {batch_history_table} '
+                'WHERE batch_source_name = ? AND batch_source_type_name = ? '
+                'ORDER BY batch_import_timestamp DESC LIMIT 1'.format(
+                    batch_history_table=cls.batch_history_table
+                ),
+                cls.batch_source_name,
+                cls.batch_source_type_name
+            )
+            row = cursor.fetchone()
 
         if row:
             return row[0]
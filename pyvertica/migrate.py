@@ -41,6 +41,11 @@ class VerticaMigrator(object):
 
         .. seealso:: :ref:`vertica_migrate`.
 
+        The connections can be taken from a
+        :py:class:`~pyvertica.connection.ConnectionPool` by passing it as
+        ``source_pool`` and / or ``target_pool``. Call
+        :py:meth:`~.VerticaMigrator.close` when done, to return them.
+
     """
 
     # regexp to get name of the CREATE SEQUENCE statements
@@ -70,9 +75,33 @@ class VerticaMigrator(object):
         self._target_dsn = target
         self._commit = commit
         self._kwargs = kwargs
-        self._set_connections()
 
-        self._sanity_checks()
+        try:
+            self._set_connections()
+            self._sanity_checks()
+        except:
+            self.close()
+            raise
+
+    def close(self):
+        """
+        Release the database connections.
+
+        Connections taken from ``source_pool`` or ``target_pool`` are
+        returned to the pool, the other connections are closed.
+        """
+        for con_attr, pool_key in (
+                ('_source_con', 'source_pool'),
+                ('_target_con', 'target_pool')):
+            con = getattr(self, con_attr, None)
+            if con is None:
+                continue
+            setattr(self, con_attr, None)
+
+            if self._kwargs.get(pool_key):
+                self._kwargs[pool_key].put_connection(con)
+            else:
+                con.close()
 
     def _set_connections(self):
         """
@@ -84,21 +113,27 @@ class VerticaMigrator(object):
             'ORDER BY node_name LIMIT 1'
         )
 
-        self._source_con = get_connection(
-            dsn=self._source_dsn,
-            user=self._kwargs.get('source_user'),
-            password=self._kwargs.get('source_pwd'),
-            reconnect=self._kwargs.get('source_reconnect', True),
-        )
+        if self._kwargs.get('source_pool'):
+            self._source_con = self._kwargs['source_pool'].get_connection()
+        else:
+            self._source_con = get_connection(
+                dsn=self._source_dsn,
+                user=self._kwargs.get('source_user'),
+                password=self._kwargs.get('source_pwd'),
+                reconnect=self._kwargs.get('source_reconnect', True),
+            )
         self._source = self._source_con.cursor()
         self._source_ip = self._source.execute(ip_sql).fetchone()[0]
 
-        self._target_con = get_connection(
-            dsn=self._target_dsn,
-            user=self._kwargs.get('target_user'),
-            password=self._kwargs.get('target_pwd'),
-            reconnect=self._kwargs.get('target_reconnect', True)
-        )
+        if self._kwargs.get('target_pool'):
+            self._target_con = self._kwargs['target_pool'].get_connection()
+        else:
+            self._target_con = get_connection(
+                dsn=self._target_dsn,
+                user=self._kwargs.get('target_user'),
+                password=self._kwargs.get('target_pwd'),
+                reconnect=self._kwargs.get('target_reconnect', True)
+            )
         self._target = self._target_con.cursor()
         self._target_ip = self._target.execute(ip_sql).fetchone()[0]
 
@@ -574,15 +609,25 @@ class VerticaMigrator(object):
             # cannot start batch if target DDL does not exists,
             # which could be the case in dryrun
             if self._commit:
+                if self._kwargs.get('target_pool'):
+                    # reuse the connection taken from the pool, the pool
+                    # could be too small for a second one
+                    connection_kwargs = {'connection': self._target_con}
+                else:
+                    connection_kwargs = {
+                        'odbc_kwargs': {
+                            'dsn': self._target_dsn,
+                            'user': self._kwargs.get('target_user'),
+                            'password': self._kwargs.get('target_pwd'),
+                        },
+                        'reconnect': self._kwargs.get(
+                            'target_reconnect', True),
+                    }
+
                 batch = VerticaBatch(
-                    odbc_kwargs={
-                        'dsn': self._target_dsn,
-                        'user': self._kwargs.get('target_user'),
-                        'password': self._kwargs.get('target_pwd'),
-                    },
                     table_name=tname,
                     truncate_table=self._kwargs.get('truncate', False),
-                    reconnect=self._kwargs.get('target_reconnect', True),
+                    **connection_kwargs
                 )
                 while True:
                     row = self._source.fetchone()
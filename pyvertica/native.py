@@ -0,0 +1,231 @@
+import re
+import struct
+from datetime import date, datetime
+from itertools import izip
+
+
+NATIVE_SIGNATURE = 'NATIVE\n\xff\r\n\x00'
+"""
+File signature of the Vertica native binary format.
+"""
+
+NATIVE_VERSION = 1
+"""
+Version of the Vertica native binary format.
+"""
+
+VARIABLE_WIDTH = 0xffffffff
+"""
+Column width (in the header) of variable width columns.
+"""
+
+_EPOCH_ORDINAL = date(2000, 1, 1).toordinal()
+_EPOCH_DATETIME = datetime(2000, 1, 1)
+
+_int64 = struct.Struct('<q')
+_uint32 = struct.Struct('<I')
+_float64 = struct.Struct('<d')
+
+
+def _encode_integer(value):
+    return _int64.pack(value)
+
+
+def _encode_float(value):
+    return _float64.pack(value)
+
+
+def _encode_boolean(value):
+    if value:
+        return '\x01'
+    return '\x00'
+
+
+def _encode_varchar(value):
+    if isinstance(value, unicode):
+        value = value.encode('utf-8')
+    return _uint32.pack(len(value)) + value
+
+
+def _encode_date(value):
+    return _int64.pack(value.toordinal() - _EPOCH_ORDINAL)
+
+
+def _encode_timestamp(value):
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    delta = value - _EPOCH_DATETIME
+    return _int64.pack(
+        (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+
+def _encode_time(value):
+    return _int64.pack(
+        ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 +
+        value.microsecond)
+
+
+def _get_char_encoder(width):
+    def encode_char(value):
+        if isinstance(value, unicode):
+            value = value.encode('utf-8')
+        if len(value) > width:
+            raise ValueError('Value {0!r} exceeds CHAR({1})'.format(
+                value, width))
+        return value.ljust(width)
+    return encode_char
+
+
+NATIVE_TYPES = {
+    'INTEGER': (8, _encode_integer),
+    'INT': (8, _encode_integer),
+    'BIGINT': (8, _encode_integer),
+    'FLOAT': (8, _encode_float),
+    'DOUBLE PRECISION': (8, _encode_float),
+    'BOOLEAN': (1, _encode_boolean),
+    'DATE': (8, _encode_date),
+    'TIMESTAMP': (8, _encode_timestamp),
+    'TIMESTAMPTZ': (8, _encode_timestamp),
+    'TIME': (8, _encode_time),
+    'VARCHAR': (VARIABLE_WIDTH, _encode_varchar),
+    'VARBINARY': (VARIABLE_WIDTH, _encode_varchar),
+}
+"""
+Mapping of the supported Vertica data types to their column width and
+encoding function. Besides these, ``CHAR(n)`` is supported as well.
+"""
+
+_FIXED_NUMERIC_FORMATS = {
+    _encode_integer: 'q',
+    _encode_float: 'd',
+}
+
+_char_re = re.compile(r'^CHAR\s*\(\s*(?P<width>\d+)\s*\)$')
+_length_re = re.compile(r'\s*\(.*\)$')
+
+
+def _get_column_encoder(type_name):
+    """
+    Return the column width and encoding function for a Vertica type.
+
+    :param type_name:
+        A ``str`` representing the Vertica data type, e.g. ``'INTEGER'``,
+        ``'VARCHAR(255)'`` or ``'CHAR(2)'``.
+
+    :return:
+        A ``tuple`` containing the width (``int``) and the function.
+
+    :raises:
+        :py:exc:`!ValueError` when the data type is not supported.
+
+    """
+    type_name = type_name.strip().upper()
+
+    char_match = _char_re.match(type_name)
+    if char_match:
+        width = int(char_match.group('width'))
+        return (width, _get_char_encoder(width))
+
+    # the length of variable width types is not relevant
+    type_name = _length_re.sub('', type_name)
+    if type_name not in NATIVE_TYPES:
+        raise ValueError(
+            'Data type {0} is not supported by the native format'.format(
+                type_name))
+    return NATIVE_TYPES[type_name]
+
+
+def get_native_row_encoder(type_list):
+    """
+    Return the file header and a row encoder for the Vertica native binary
+    format.
+
+    Usage example::
+
+        header, encode_row = get_native_row_encoder(
+            ['INTEGER', 'VARCHAR(20)', 'TIMESTAMP'])
+        data = header + encode_row([1, u'foo', datetime.now()])
+
+    Every encoded row consists of the row length, a bit-field indicating the
+    ``NULL`` (``None``) values and the (little-endian) values of all non-null
+    columns. When all the columns are ``INTEGER`` or ``FLOAT`` columns and a
+    row contains no ``None`` values, the row is encoded with a single
+    :py:func:`!struct.pack` call.
+
+    The following Python types are expected per Vertica type:
+
+    ``INTEGER``
+        ``int`` or ``long``.
+
+    ``FLOAT``
+        ``float``.
+
+    ``BOOLEAN``
+        Any object, it is tested for truth.
+
+    ``DATE``
+        :py:class:`!datetime.date` (or :py:class:`!datetime.datetime`).
+
+    ``TIMESTAMP``
+        :py:class:`!datetime.datetime`. Timezone-aware objects are converted
+        to UTC.
+
+    ``TIME``
+        :py:class:`!datetime.time`.
+
+    ``CHAR``, ``VARCHAR`` and ``VARBINARY``
+        ``unicode`` (will be encoded as UTF-8) or ``str``.
+
+    :param type_list:
+        A ``list`` of ``str`` objects, representing the Vertica data types of
+        the columns (in the order in which they are loaded).
+
+    :return:
+        A ``tuple`` containing the header (``str``) and a function taking an
+        ``iterable`` of values and returning the encoded row (``str``).
+
+    :raises:
+        :py:exc:`!ValueError` when a data type is not supported.
+
+    """
+    column_count = len(type_list)
+    width_list, encoder_list = zip(*[
+        _get_column_encoder(type_name) for type_name in type_list])
+
+    header_area = struct.pack(
+        '<HBH{0}I'.format(column_count),
+        NATIVE_VERSION, 0, column_count, *width_list
+    )
+    header = NATIVE_SIGNATURE + _uint32.pack(len(header_area)) + header_area
+
+    bitfield_length = (column_count + 7) // 8
+    pack_row_length = _uint32.pack
+
+    fixed_struct = None
+    if all(encoder in _FIXED_NUMERIC_FORMATS for encoder in encoder_list):
+        fixed_struct = struct.Struct('<' + ''.join([
+            _FIXED_NUMERIC_FORMATS[encoder] for encoder in encoder_list]))
+        fixed_prefix = (
+            pack_row_length(fixed_struct.size) + '\x00' * bitfield_length)
+
+    def encode_row(value_list):
+        if not isinstance(value_list, (list, tuple)):
+            value_list = tuple(value_list)
+
+        if fixed_struct and None not in value_list:
+            return fixed_prefix + fixed_struct.pack(*value_list)
+
+        null_bitfield = bytearray(bitfield_length)
+        data_list = []
+
+        for index, (encode_value, value) in enumerate(
+                izip(encoder_list, value_list)):
+            if value is None:
+                null_bitfield[index >> 3] |= 0x80 >> (index & 7)
+            else:
+                data_list.append(encode_value(value))
+
+        data = ''.join(data_list)
+        return pack_row_length(len(data)) + str(null_bitfield) + data
+
+    return (header, encode_row)
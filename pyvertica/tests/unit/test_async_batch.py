@@ -0,0 +1,195 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest2 as unittest
+
+import trollius as asyncio
+from mock import Mock, call, patch
+
+from pyvertica.async_batch import AsyncFifoWriter, AsyncVerticaBatch
+
+
+class AsyncFifoWriterTestCase(unittest.TestCase):
+    """
+    Tests for :py:class:`.AsyncFifoWriter`.
+    """
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.fifo_dir = tempfile.mkdtemp()
+        self.fifo_path = os.path.join(self.fifo_dir, 'fifo')
+        os.mkfifo(self.fifo_path)
+        self.reader_fd = os.open(self.fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+
+    def tearDown(self):
+        os.close(self.reader_fd)
+        shutil.rmtree(self.fifo_dir)
+        self.loop.close()
+
+    def read_all(self):
+        data_list = []
+        while True:
+            try:
+                data = os.read(self.reader_fd, 65536)
+            except OSError:
+                break
+            if not data:
+                break
+            data_list.append(data)
+        return ''.join(data_list)
+
+    def test_write(self):
+        """
+        Test :py:meth:`.AsyncFifoWriter.write` below the buffer size.
+        """
+        writer = AsyncFifoWriter(self.fifo_path, 4096, self.loop)
+        writer.write(u'f\xf6o')
+
+        self.assertEqual('', self.read_all())
+
+        self.loop.run_until_complete(writer.drain())
+        writer.close()
+        self.assertEqual('f\xc3\xb6o', self.read_all())
+
+    @unittest.skipUnless(
+        sys.platform.startswith('linux'), 'requires resizable pipes')
+    def test_drain(self):
+        """
+        Test :py:meth:`.AsyncFifoWriter.drain` waiting for the reader.
+        """
+        writer = AsyncFifoWriter(self.fifo_path, 4096, self.loop)
+        pipe_size = 4096
+        data = 'x' * (2 * pipe_size + 100)
+
+        # only the first part fits in the pipe
+        writer.write(data)
+        self.assertEqual(pipe_size + 100, writer._buffer_length)
+
+        task = asyncio.Task(writer.drain(), loop=self.loop)
+        self.loop.run_until_complete(asyncio.sleep(0.05, loop=self.loop))
+        self.assertFalse(task.done())
+
+        received = self.read_all()
+        self.loop.run_until_complete(task)
+        self.assertEqual(100, writer._buffer_length)
+
+        received += self.read_all()
+        writer.close()
+        received += self.read_all()
+        self.assertEqual(data, received)
+
+
+class AsyncVerticaBatchTestCase(unittest.TestCase):
+    """
+    Tests for :py:class:`.AsyncVerticaBatch`.
+    """
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def get_batch(self, LoopVerticaBatchMock):
+        batch = LoopVerticaBatchMock.return_value
+        batch._in_batch = False
+        # the executor does not accept (what looks like) coroutines
+        for method_name in ['_start_batch', 'get_errors', 'commit']:
+            setattr(batch, method_name, Mock(_is_coroutine=False))
+        batch._async_writer.drain.side_effect = (
+            lambda: asyncio.sleep(0, loop=self.loop))
+
+        async_batch = AsyncVerticaBatch(
+            'schema.table', loop=self.loop, odbc_kwargs={'dsn': 'foo'})
+        return async_batch, batch
+
+    @patch('pyvertica.async_batch._LoopVerticaBatch')
+    def test_insert_list(self, LoopVerticaBatchMock):
+        """
+        Test :py:meth:`.AsyncVerticaBatch.insert_list`.
+        """
+        async_batch, batch = self.get_batch(LoopVerticaBatchMock)
+
+        self.loop.run_until_complete(async_batch.insert_list(['foo', 'bar']))
+
+        LoopVerticaBatchMock.assert_called_once_with(
+            self.loop, table_name='schema.table', odbc_kwargs={'dsn': 'foo'})
+        batch._start_batch.assert_called_once_with()
+        batch.insert_list.assert_called_once_with(['foo', 'bar'])
+        batch._async_writer.drain.assert_called_once_with()
+
+    @patch('pyvertica.async_batch._LoopVerticaBatch')
+    def test_insert_lists_started(self, LoopVerticaBatchMock):
+        """
+        Test :py:meth:`.AsyncVerticaBatch.insert_lists` on a started batch.
+        """
+        async_batch, batch = self.get_batch(LoopVerticaBatchMock)
+        batch._in_batch = True
+
+        self.loop.run_until_complete(
+            async_batch.insert_lists([['foo'], ['bar']], 2))
+
+        self.assertFalse(batch._start_batch.called)
+        batch.insert_lists.assert_called_once_with([['foo'], ['bar']])
+
+    @patch('pyvertica.async_batch.INSERT_LISTS_CHUNK_ROW_COUNT', 2)
+    @patch('pyvertica.async_batch._LoopVerticaBatch')
+    def test_insert_lists_chunks(self, LoopVerticaBatchMock):
+        """
+        Test :py:meth:`.AsyncVerticaBatch.insert_lists` inserting a generator
+        in chunks.
+        """
+        async_batch, batch = self.get_batch(LoopVerticaBatchMock)
+
+        self.loop.run_until_complete(async_batch.insert_lists(
+            ([str(i)] for i in range(5))))
+
+        self.assertEqual([
+            call([['0'], ['1']]),
+            call([['2'], ['3']]),
+            call([['4']]),
+        ], batch.insert_lists.call_args_list)
+        self.assertEqual(3, batch._async_writer.drain.call_count)
+
+    @patch('pyvertica.async_batch._LoopVerticaBatch')
+    def test_get_errors(self, LoopVerticaBatchMock):
+        """
+        Test :py:meth:`.AsyncVerticaBatch.get_errors`.
+        """
+        async_batch, batch = self.get_batch(LoopVerticaBatchMock)
+        batch.get_errors.return_value = (0, Mock())
+
+        self.assertEqual(
+            batch.get_errors.return_value,
+            self.loop.run_until_complete(async_batch.get_errors())
+        )
+
+    @patch('pyvertica.async_batch._LoopVerticaBatch')
+    def test_commit(self, LoopVerticaBatchMock):
+        """
+        Test :py:meth:`.AsyncVerticaBatch.commit` waiting for the inserts.
+        """
+        async_batch, batch = self.get_batch(LoopVerticaBatchMock)
+        call_list = []
+        batch.insert_list.side_effect = (
+            lambda value_list: call_list.append('insert'))
+        batch.commit.side_effect = lambda: call_list.append('commit')
+
+        insert_task = asyncio.Task(
+            async_batch.insert_list(['foo']), loop=self.loop)
+        self.loop.run_until_complete(async_batch.commit())
+
+        self.assertTrue(insert_task.done())
+        self.assertEqual(['insert', 'commit'], call_list)
+
+    def test___init___commit_policy(self):
+        """
+        Test initialization of :py:class:`.AsyncVerticaBatch` with a commit
+        policy.
+        """
+        self.assertRaises(
+            ValueError,
+            AsyncVerticaBatch,
+            'schema.table',
+            loop=self.loop,
+            commit_max_rows=1000
+        )
@@ -1,16 +1,40 @@
 # -*- coding: utf-8 -*-
 
+import array
+import bz2
+import mmap
 import os
 import stat
 import tempfile
+import threading
+import zlib
+from multiprocessing.dummy import Pool
 from taskthread import TaskThread
 import unittest2 as unittest
 from Queue import Queue
 
-from mock import Mock, patch
+from mock import Mock, call, patch
 
 from pyvertica.batch import (
-    Query, VerticaBatch, require_started_batch)
+    DEFAULT_FIFO_BUFFER_SIZE,
+    F_SETPIPE_SZ,
+    CompressingWriter,
+    FifoWriter,
+    MeteredWriter,
+    ParallelVerticaBatch,
+    PipelinedVerticaBatch,
+    Query,
+    RejectedRow,
+    ThreadedWriter,
+    VerticaBatch,
+    _constraint_cache,
+    _iter_records,
+    _serialize_chunk,
+    copy_file_to_fd,
+    iter_record_chunks,
+    get_row_serializer,
+    require_started_batch,
+)
 
 
 class RequireStartedBatchDecoratorTestCase(unittest.TestCase):
@@ -47,6 +71,396 @@ class RequireStartedBatchDecoratorTestCase(unittest.TestCase):
         self.assertEqual(0, test_class._start_batch.call_count)
 
 
+class GetRowSerializerTestCase(unittest.TestCase):
+    """
+    Tests for :py:func:`.get_row_serializer`.
+    """
+    def setUp(self):
+        self.copy_options_dict = {
+            'DELIMITER': ',',
+            'ENCLOSED BY': '"',
+        }
+
+    def test_without_types(self):
+        """
+        Test serializer without column types.
+        """
+        serialize_row = get_row_serializer(self.copy_options_dict)
+
+        self.assertEqual(
+            u'"valu\xe91","valu\\"e2",,"100","1.5","True"',
+            serialize_row([u'valu\xe91', 'valu"e2', None, 100, 1.5, True])
+        )
+
+    def test_with_types(self):
+        """
+        Test serializer with column types.
+        """
+        serialize_row = get_row_serializer(
+            self.copy_options_dict, [int, float, unicode])
+
+        self.assertEqual(
+            u'"1",,"a\\"b","4"',
+            serialize_row([1, None, 'a"b', 4])
+        )
+
+    def test_numeric_enclosed_by(self):
+        """
+        Test numeric values are escaped when they could contain the
+        ``ENCLOSED BY`` character.
+        """
+        self.copy_options_dict['ENCLOSED BY'] = '1'
+        serialize_row = get_row_serializer(self.copy_options_dict, [int])
+
+        self.assertEqual(u'1\\11,1\\1\\11', serialize_row([1, 11]))
+
+
+class SerializeChunkTestCase(unittest.TestCase):
+    """
+    Tests for :py:func:`._serialize_chunk`.
+    """
+    def test_serialize_chunk(self):
+        """
+        Test :py:func:`._serialize_chunk`.
+        """
+        copy_options_dict = {
+            'DELIMITER': ',',
+            'ENCLOSED BY': '"',
+            'RECORD TERMINATOR': '\x01',
+        }
+
+        self.assertEqual(
+            ('"1","f\xc3\xb6o"\x01"2",\x01', 2),
+            _serialize_chunk(
+                (copy_options_dict, [int], None, [[1, u'f\xf6o'], [2, None]]))
+        )
+
+    def test_serialize_chunk_native(self):
+        """
+        Test :py:func:`._serialize_chunk` using the native format.
+        """
+        self.assertEqual(
+            ('\x08\x00\x00\x00\x00\x01\x00\x00\x00\x00\x00\x00\x00', 1),
+            _serialize_chunk(({}, None, ['INTEGER'], [[1]]))
+        )
+
+
+class FifoWriterTestCase(unittest.TestCase):
+    """
+    Tests for :py:class:`.FifoWriter`.
+    """
+    def setUp(self):
+        self.file_obj = tempfile.NamedTemporaryFile()
+
+    def tearDown(self):
+        self.file_obj.close()
+
+    def get_content(self):
+        with open(self.file_obj.name, 'rb') as file_obj:
+            return file_obj.read()
+
+    def test_write_buffered(self):
+        """
+        Test :py:meth:`.FifoWriter.write` below the buffer size.
+        """
+        writer = FifoWriter(self.file_obj.name, 10)
+        writer.write(u'f\xf6o')
+
+        self.assertEqual('', self.get_content())
+
+        writer.close()
+        self.assertEqual('f\xc3\xb6o', self.get_content())
+
+    def test_write_flush(self):
+        """
+        Test :py:meth:`.FifoWriter.write` exceeding the buffer size.
+        """
+        writer = FifoWriter(self.file_obj.name, 6)
+        writer.write('foo')
+        writer.write(u'bar')
+        writer.write('baz')
+
+        self.assertEqual('foobar', self.get_content())
+
+        writer.close()
+        self.assertEqual('foobarbaz', self.get_content())
+
+    @patch('pyvertica.batch.fcntl')
+    @patch('pyvertica.batch.sys')
+    def test__set_pipe_size(self, sys, fcntl):
+        """
+        Test :py:meth:`.FifoWriter._set_pipe_size`.
+        """
+        sys.platform = 'linux2'
+
+        writer = FifoWriter(self.file_obj.name, 1)
+
+        fcntl.fcntl.assert_called_once_with(
+            writer.fileno(), F_SETPIPE_SZ, 1)
+        writer.close()
+
+
+class CompressingWriterTestCase(unittest.TestCase):
+    """
+    Tests for :py:class:`.CompressingWriter`.
+    """
+    def get_written_data(self, writer):
+        return ''.join([
+            args[0] for args, kwargs in writer.write.call_args_list])
+
+    def test_gzip(self):
+        """
+        Test :py:class:`.CompressingWriter` using ``GZIP``.
+        """
+        writer = Mock()
+        compressing_writer = CompressingWriter(writer, 'GZIP', 1)
+        compressing_writer.write(u'f\xf6o')
+        compressing_writer.write('bar')
+        compressing_writer.close()
+
+        self.assertEqual(
+            'f\xc3\xb6obar',
+            zlib.decompress(
+                self.get_written_data(writer), 16 + zlib.MAX_WBITS)
+        )
+        writer.close.assert_called_once_with()
+
+    def test_bzip(self):
+        """
+        Test :py:class:`.CompressingWriter` using ``BZIP``.
+        """
+        writer = Mock()
+        compressing_writer = CompressingWriter(writer, 'BZIP')
+        compressing_writer.write('foobar')
+        compressing_writer.close()
+
+        self.assertEqual(
+            'foobar', bz2.decompress(self.get_written_data(writer)))
+        writer.close.assert_called_once_with()
+
+    def test_unsupported(self):
+        """
+        Test :py:class:`.CompressingWriter` with unsupported compression.
+        """
+        self.assertRaises(ValueError, CompressingWriter, Mock(), 'LZO')
+
+
+class ThreadedWriterTestCase(unittest.TestCase):
+    """
+    Tests for :py:class:`.ThreadedWriter`.
+    """
+    def test_write(self):
+        """
+        Test :py:meth:`.ThreadedWriter.write` and
+        :py:meth:`.ThreadedWriter.close`.
+        """
+        writer = Mock()
+        threaded_writer = ThreadedWriter(writer, chunk_size=6)
+        threaded_writer.write('foo')
+        threaded_writer.write(u'bar')
+        threaded_writer.write('baz')
+        threaded_writer.close()
+
+        self.assertEqual(
+            [call('foobar'), call('baz')], writer.write.call_args_list)
+        writer.close.assert_called_once_with()
+
+    def test_write_exception(self):
+        """
+        Test :py:meth:`.ThreadedWriter.close` re-raising an exception.
+        """
+        writer = Mock()
+        writer.write.side_effect = IOError('boom!')
+        threaded_writer = ThreadedWriter(writer, chunk_size=1)
+        threaded_writer.write('foo')
+
+        self.assertRaises(IOError, threaded_writer.close)
+        writer.close.assert_called_once_with()
+
+        # the exception is raised on every following write
+        self.assertRaises(IOError, threaded_writer.write, 'bar')
+
+    def test_max_queue_bytes(self):
+        """
+        Test the queue of :py:class:`.ThreadedWriter` blocking when full.
+        """
+        release_event = threading.Event()
+        writer = Mock()
+        writer.write.side_effect = lambda data: release_event.wait()
+
+        threaded_writer = ThreadedWriter(
+            writer, chunk_size=5, max_queue_bytes=10)
+
+        producer = threading.Thread(
+            target=lambda: [threaded_writer.write('x' * 5) for i in range(5)])
+        producer.daemon = True
+        producer.start()
+        producer.join(0.5)
+
+        # one chunk is being written, two are waiting in the queue
+        self.assertTrue(producer.is_alive())
+        self.assertEqual(10, threaded_writer._queue_length)
+
+        release_event.set()
+        producer.join(5)
+        self.assertFalse(producer.is_alive())
+        threaded_writer.close()
+
+        self.assertEqual(5, writer.write.call_count)
+
+
+class CopyFileToFdTestCase(unittest.TestCase):
+    """
+    Tests for :py:func:`.copy_file_to_fd`.
+    """
+    def setUp(self):
+        self.in_file_obj = tempfile.TemporaryFile()
+        os.write(self.in_file_obj.fileno(), 'foo\nbar\n' * 1000)
+        os.lseek(self.in_file_obj.fileno(), 4, os.SEEK_SET)
+        self.out_file_obj = tempfile.TemporaryFile()
+
+    def tearDown(self):
+        self.in_file_obj.close()
+        self.out_file_obj.close()
+
+    def assert_copied(self, copied):
+        self.assertEqual(7996, copied)
+        self.out_file_obj.seek(0)
+        self.assertEqual(
+            'bar\n' + 'foo\nbar\n' * 999, self.out_file_obj.read())
+
+    def test_copy_file_to_fd(self):
+        """
+        Test :py:func:`.copy_file_to_fd`.
+        """
+        self.assert_copied(copy_file_to_fd(
+            self.in_file_obj.fileno(), self.out_file_obj.fileno(), 1000))
+
+    @patch('pyvertica.batch._libc_sendfile', None)
+    def test_copy_file_to_fd_without_sendfile(self):
+        """
+        Test :py:func:`.copy_file_to_fd` without ``sendfile``.
+        """
+        self.assert_copied(copy_file_to_fd(
+            self.in_file_obj.fileno(), self.out_file_obj.fileno(), 1000))
+
+
+class IterRecordChunksTestCase(unittest.TestCase):
+    """
+    Tests for :py:func:`.iter_record_chunks`.
+    """
+    def test_iter_record_chunks(self):
+        """
+        Test :py:func:`.iter_record_chunks`.
+        """
+        data = 'aaa\r\nbb\r\ncccccc\r\nd\r\ne'
+
+        self.assertEqual(
+            [(0, 9), (9, 17), (17, 21)],
+            list(iter_record_chunks(data, '\r\n', chunk_size=6))
+        )
+
+    def test_iter_record_chunks_start(self):
+        """
+        Test :py:func:`.iter_record_chunks` with a ``start`` offset.
+        """
+        data = 'aaa\nbb\nc\n'
+
+        self.assertEqual(
+            [(4, 9)], list(iter_record_chunks(data, '\n', start=4)))
+
+    def test_iter_record_chunks_mmap(self):
+        """
+        Test :py:func:`.iter_record_chunks` with a :py:class:`!mmap.mmap`.
+        """
+        file_obj = tempfile.TemporaryFile()
+        file_obj.write('a\nb\nc\n')
+        file_obj.flush()
+        data = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.assertEqual(
+            ['a\nb\n', 'c\n'],
+            [data[start:end] for start, end in iter_record_chunks(
+                data, '\n', chunk_size=3)]
+        )
+        data.close()
+        file_obj.close()
+
+
+class IterRecordsTestCase(unittest.TestCase):
+    """
+    Tests for :py:func:`._iter_records`.
+    """
+    def test_iter_records(self):
+        """
+        Test :py:func:`._iter_records` with records spanning multiple reads.
+        """
+        file_obj = tempfile.TemporaryFile()
+        file_obj.write('aaaa\r\nb\r\n\r\ncc')
+        file_obj.seek(0)
+
+        self.assertEqual(
+            ['aaaa', 'b', '', 'cc'],
+            list(_iter_records(file_obj, '\r\n', chunk_size=3))
+        )
+
+
+class MeteredWriterTestCase(unittest.TestCase):
+    """
+    Tests for :py:class:`.MeteredWriter`.
+    """
+    @patch('pyvertica.batch.time')
+    def test_write(self, time):
+        """
+        Test :py:meth:`.MeteredWriter.write`.
+        """
+        time.time.side_effect = [1.0, 1.5, 2.0, 2.25]
+        writer = Mock()
+        metered_writer = MeteredWriter(writer)
+
+        metered_writer.write(u'f\xf6o')
+        metered_writer.write('bar')
+
+        self.assertEqual(
+            [call('f\xc3\xb6o'), call('bar')], writer.write.call_args_list)
+        self.assertEqual(7, metered_writer.bytes_written)
+        self.assertEqual(0.75, metered_writer.write_time)
+
+    def test_write_not_timed(self):
+        """
+        Test :py:meth:`.MeteredWriter.write` without measuring the time.
+        """
+        writer = Mock()
+        metered_writer = MeteredWriter(writer, timed=False)
+
+        metered_writer.write('bar')
+
+        writer.write.assert_called_once_with('bar')
+        self.assertEqual(3, metered_writer.bytes_written)
+        self.assertEqual(0.0, metered_writer.write_time)
+
+    def test_write_unicode(self):
+        """
+        Test :py:meth:`.MeteredWriter.write` without encoding.
+        """
+        writer = Mock()
+        metered_writer = MeteredWriter(writer, encode=False)
+
+        metered_writer.write(u'f\xf6o')
+
+        writer.write.assert_called_once_with(u'f\xf6o')
+        self.assertEqual(4, metered_writer.bytes_written)
+
+    def test_close(self):
+        """
+        Test :py:meth:`.MeteredWriter.close`.
+        """
+        writer = Mock()
+        MeteredWriter(writer).close()
+
+        writer.close.assert_called_once_with()
+
+
 class QueryTestCase(unittest.TestCase):
     """
     Tests for :py:class:`.QueryThread`.
@@ -79,6 +493,7 @@ class QueryTestCase(unittest.TestCase):
         query.run_query()
 
         cursor.execute.assert_called_once_with(sql_query_str)
+        self.assertTrue(query.execution_time >= 0)
 
     def test_run_raising_exception(self):
         """
@@ -107,6 +522,9 @@ class VerticaBatchTestCase(unittest.TestCase):
     """
     Test for :py:class:`.VerticaBatch`.
     """
+    def setUp(self):
+        _constraint_cache.clear()
+
     def get_batch(self, **kwargs):
         arguments = {
             'odbc_kwargs': {'dsn': 'TestDSN'},
@@ -150,7 +568,8 @@ class VerticaBatchTestCase(unittest.TestCase):
         self.assertFalse(batch._in_batch)
 
         # db connection
-        get_connection.assert_called_once_with(dsn='TestDSN', reconnect=True)
+        get_connection.assert_called_once_with(
+            dsn='TestDSN', reconnect=True, node_selector=None)
         self.assertEqual(get_connection.return_value, batch._connection)
         batch._connection.cursor.assert_called_once_with()
         self.assertEqual(batch._connection.cursor.return_value, batch._cursor)
@@ -205,7 +624,7 @@ class VerticaBatchTestCase(unittest.TestCase):
             'TRUNCATE TABLE schema.test_table')
 
     @patch('taskthread.TaskThread')
-    @patch('pyvertica.batch.codecs')
+    @patch('pyvertica.batch.open', create=True)
     @patch('pyvertica.batch.VerticaBatch._get_sql_lcopy_str')
     @patch('pyvertica.batch.Query')
     @patch('pyvertica.batch.get_connection')
@@ -213,7 +632,7 @@ class VerticaBatchTestCase(unittest.TestCase):
                           get_connection,
                           QueryMock,
                           get_sql_lcopy_str,
-                          codecs,
+                          open_mock,
                           TaskThreadMock):
         """
         Test :py:meth:`.VerticaBatch._start_batch`.
@@ -232,8 +651,12 @@ class VerticaBatchTestCase(unittest.TestCase):
         # test files
         self.assertTrue(stat.S_ISFIFO(os.stat(batch._fifo_path).st_mode))
         self.assertTrue(os.path.exists(batch._rejected_file_obj.name))
-        codecs.open.assert_called_once_with(batch._fifo_path, 'w', 'utf-8')
-        self.assertEqual(codecs.open.return_value, batch._fifo_obj)
+        self.assertTrue(os.path.exists(batch._exceptions_file_obj.name))
+        open_mock.assert_called_once_with(batch._fifo_path, 'wb', 1)
+        # unicode is encoded once, by the codecs writer on top
+        self.assertEqual(batch._metered_writer, batch._fifo_obj.stream)
+        self.assertEqual(open_mock.return_value, batch._metered_writer.writer)
+        self.assertFalse(batch._metered_writer.timed)
         self.assertTrue(batch._batch_initialized)
 
         # test thread setup
@@ -251,6 +674,62 @@ class VerticaBatchTestCase(unittest.TestCase):
             batch._query
         )
 
+    @patch('taskthread.TaskThread')
+    @patch('pyvertica.batch.FifoWriter')
+    @patch('pyvertica.batch.VerticaBatch._get_sql_lcopy_str')
+    @patch('pyvertica.batch.Query')
+    @patch('pyvertica.batch.get_connection')
+    def test__start_batch_fifo_buffer_size(self,
+                                           get_connection,
+                                           QueryMock,
+                                           get_sql_lcopy_str,
+                                           FifoWriterMock,
+                                           TaskThreadMock):
+        """
+        Test :py:meth:`.VerticaBatch._start_batch` with ``fifo_buffer_size``.
+        """
+        batch = self.get_batch(fifo_buffer_size=1024)
+
+        batch._start_batch()
+
+        FifoWriterMock.assert_called_once_with(batch._fifo_path, 1024)
+        self.assertEqual(FifoWriterMock.return_value, batch._fifo_obj.writer)
+
+    @patch('taskthread.TaskThread')
+    @patch('pyvertica.batch.ThreadedWriter')
+    @patch('pyvertica.batch.CompressingWriter')
+    @patch('pyvertica.batch.FifoWriter')
+    @patch('pyvertica.batch.VerticaBatch._get_sql_lcopy_str')
+    @patch('pyvertica.batch.Query')
+    @patch('pyvertica.batch.get_connection')
+    def test__start_batch_writer_queue_size(self,
+                                            get_connection,
+                                            QueryMock,
+                                            get_sql_lcopy_str,
+                                            FifoWriterMock,
+                                            CompressingWriterMock,
+                                            ThreadedWriterMock,
+                                            TaskThreadMock):
+        """
+        Test :py:meth:`.VerticaBatch._start_batch` with ``compression`` and
+        ``writer_queue_size``.
+        """
+        batch = self.get_batch(compression='BZIP', writer_queue_size=2048)
+
+        batch._start_batch()
+
+        FifoWriterMock.assert_called_once_with(
+            batch._fifo_path, DEFAULT_FIFO_BUFFER_SIZE)
+        CompressingWriterMock.assert_called_once_with(
+            FifoWriterMock.return_value, 'BZIP', None)
+        ThreadedWriterMock.assert_called_once_with(
+            CompressingWriterMock.return_value,
+            chunk_size=DEFAULT_FIFO_BUFFER_SIZE,
+            max_queue_bytes=2048,
+        )
+        self.assertEqual(
+            ThreadedWriterMock.return_value, batch._fifo_obj.writer)
+
     @patch('pyvertica.batch.os.remove')
     @patch('pyvertica.batch.os.rmdir')
     @patch('pyvertica.batch.get_connection')
@@ -271,6 +750,7 @@ class VerticaBatchTestCase(unittest.TestCase):
         batch._fifo_path = '/tmp/abcd1234/fifo'
         batch._fifo_obj = Mock()
         batch._query_thread = query_thread
+        batch._query = Mock()
         batch._query_exc_queue = Mock()
         batch._query_exc_queue.empty.return_value = True
 
@@ -306,6 +786,7 @@ class VerticaBatchTestCase(unittest.TestCase):
         batch._fifo_path = '/tmp/abcd1234/fifo'
         batch._fifo_obj = Mock()
         batch._query_thread = query_thread
+        batch._query = Mock()
         batch._query_exc_queue = Mock()
         batch._query_exc_queue.empty.return_value = True
 
@@ -315,6 +796,23 @@ class VerticaBatchTestCase(unittest.TestCase):
         self.assertFalse(batch._end_batch())
         self.assertFalse(batch._in_batch)
 
+    @patch('pyvertica.batch.get_connection')
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    def test__end_batch_writer_exception(self, start_batch, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch._end_batch` with a failing writer.
+        """
+        batch = self.get_batch(multi_batch=True)
+        batch._in_batch = True
+        batch._fifo_obj = Mock()
+        batch._fifo_obj.close.side_effect = IOError('boom!')
+        batch._query_thread = Mock()
+        batch._query = Mock()
+
+        self.assertRaises(IOError, batch._end_batch)
+        batch._query_thread.join_task.assert_called_once_with(2)
+        self.assertFalse(batch._in_batch)
+
     @patch('pyvertica.batch.get_connection')
     def test_get_batch_count(self, get_connection):
         """
@@ -345,75 +843,221 @@ class VerticaBatchTestCase(unittest.TestCase):
         batch._fifo_path = '/tmp/fifo'
         batch._rejected_file_obj = Mock()
         batch._rejected_file_obj.name = '/tmp/rejected'
+        batch._exceptions_file_obj = Mock()
+        batch._exceptions_file_obj.name = '/tmp/exceptions'
 
         self.assertEqual(
             "COPY schema.test_table (column_1, column_2, column_3) "
-            "FROM LOCAL '/tmp/fifo' REJECTED DATA '/tmp/rejected' "
+            "FROM LOCAL '/tmp/fifo' EXCEPTIONS '/tmp/exceptions' "
+            "REJECTED DATA '/tmp/rejected' "
             "REJECTMAX 0 "
             "DELIMITER ',' ENCLOSED BY '\"' SKIP 1 NULL '' "
             "RECORD TERMINATOR '\x01' NO COMMIT",
             batch._get_sql_lcopy_str()
         )
 
-    @patch('pyvertica.batch.get_connection', Mock())
-    def test__get_num_rejected_rows(self):
-        """
-        Test :py:meth:`.VerticaBatch._get_num_rejected_rows`.
-        """
-        batch = self.get_batch()
-        batch._in_batch = False
-        batch.get_batch_count = Mock(return_value=1)
-        batch._cursor = Mock()
-
-        result = batch._cursor.execute.return_value
-        result.fetchone.return_value = [10]
-
-        self.assertEqual(10, batch._get_num_rejected_rows())
-
-    @patch('pyvertica.batch.get_connection', Mock())
-    def test__single_list_to_string(self):
-        """
-        Test :py:meth:`.VerticaBatch._single_list_to_string`.
-        """
-        batch = self.get_batch()
-        single_list = ['val1', 'val2']
-        expected = u'"val1","val2"'
-        self.assertEqual(expected,
-                         batch._single_list_to_string(single_list))
-
-    @patch('pyvertica.batch.get_connection', Mock())
-    def test__single_list_to_string_suffix(self):
-        """
-        Test :py:meth:`.VerticaBatch._single_list_to_string`.
-        """
-        batch = self.get_batch()
-        single_list = ['val1', 'val2']
-        expected = u'"val1","val2"SUFFIX'
-        self.assertEqual(expected,
-                         batch._single_list_to_string(single_list,
-                                                      suffix='SUFFIX'))
-
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
     @patch('pyvertica.batch.get_connection')
-    def test_insert_list(self, get_connection):
+    def test__get_sql_lcopy_str_native(self, get_connection, start_batch):
         """
-        Test :py:meth:`.VerticaBatch.insert_list`.
+        Test :py:meth:`.VerticaBatch._get_sql_lcopy_str` with the native
+        format.
         """
-        batch = self.get_batch()
-        batch.insert_line = Mock()
+        batch = self.get_batch(
+            native_type_list=['INTEGER', 'VARCHAR(10)', 'DATE'])
+        batch._fifo_path = '/tmp/fifo'
+        batch._rejected_file_obj = Mock()
+        batch._rejected_file_obj.name = '/tmp/rejected'
+        batch._exceptions_file_obj = Mock()
+        batch._exceptions_file_obj.name = '/tmp/exceptions'
 
         self.assertEqual(
-            batch.insert_line.return_value,
-            batch.insert_list(
-                [u'valué1', 'valu"e2', 'None', None, 100, 'value4'])
+            "COPY schema.test_table (column_1, column_2, column_3) "
+            "FROM LOCAL '/tmp/fifo' NATIVE EXCEPTIONS '/tmp/exceptions' "
+            "REJECTED DATA '/tmp/rejected' "
+            "REJECTMAX 0 SKIP 1 NO COMMIT",
+            batch._get_sql_lcopy_str()
         )
-        batch.insert_line.assert_called_once_with(
-            u'"valué1","valu\\"e2","None",,"100","value4"')
 
     @patch('pyvertica.batch.VerticaBatch._start_batch')
     @patch('pyvertica.batch.get_connection')
-    def test_insert_lists(self, get_connection, start_batch):
+    def test__get_sql_lcopy_str_compression(self, get_connection, start_batch):
         """
-        Test :py:meth:`.VerticaBatch.insert_lists`.
+        Test :py:meth:`.VerticaBatch._get_sql_lcopy_str` with compression.
+        """
+        batch = self.get_batch(compression='GZIP')
+        batch._fifo_path = '/tmp/fifo'
+        batch._rejected_file_obj = Mock()
+        batch._rejected_file_obj.name = '/tmp/rejected'
+        batch._exceptions_file_obj = Mock()
+        batch._exceptions_file_obj.name = '/tmp/exceptions'
+
+        self.assertEqual(
+            "COPY schema.test_table (column_1, column_2, column_3) "
+            "FROM LOCAL '/tmp/fifo' GZIP EXCEPTIONS '/tmp/exceptions' "
+            "REJECTED DATA '/tmp/rejected' "
+            "REJECTMAX 0 "
+            "DELIMITER ',' ENCLOSED BY '\"' SKIP 1 NULL '' "
+            "RECORD TERMINATOR '\x01' NO COMMIT",
+            batch._get_sql_lcopy_str()
+        )
+
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test__get_sql_lcopy_str_load_method(self, get_connection, start_batch):
+        """
+        Test :py:meth:`.VerticaBatch._get_sql_lcopy_str` with a load method.
+        """
+        batch = self.get_batch(load_method='DIRECT')
+        batch._fifo_path = '/tmp/fifo'
+        batch._rejected_file_obj = Mock()
+        batch._rejected_file_obj.name = '/tmp/rejected'
+        batch._exceptions_file_obj = Mock()
+        batch._exceptions_file_obj.name = '/tmp/exceptions'
+
+        self.assertEqual(
+            "COPY schema.test_table (column_1, column_2, column_3) "
+            "FROM LOCAL '/tmp/fifo' EXCEPTIONS '/tmp/exceptions' "
+            "REJECTED DATA '/tmp/rejected' "
+            "REJECTMAX 0 "
+            "DELIMITER ',' ENCLOSED BY '\"' SKIP 1 NULL '' "
+            "RECORD TERMINATOR '\x01' DIRECT NO COMMIT",
+            batch._get_sql_lcopy_str()
+        )
+
+    @patch('pyvertica.batch.get_connection')
+    def test__get_load_method_adaptive(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch._get_load_method` in adaptive mode.
+        """
+        batch = self.get_batch(load_method='ADAPTIVE')
+        self.assertEqual('AUTO', batch._get_load_method())
+
+        batch._commit_max_bytes = 1024
+        self.assertEqual('TRICKLE', batch._get_load_method())
+
+        batch._last_batch_bytes = 50 * 1024 * 1024
+        self.assertEqual('AUTO', batch._get_load_method())
+
+        batch._expected_batch_bytes = 2 * 1024 * 1024 * 1024
+        self.assertEqual('DIRECT', batch._get_load_method())
+
+    @patch('pyvertica.batch.get_connection')
+    def test__init__invalid_load_method(self, get_connection):
+        """
+        Test initialization of :py:class:`.VerticaBatch` with an unsupported
+        load method.
+        """
+        self.assertRaises(ValueError, self.get_batch, load_method='FAST')
+
+    @patch('pyvertica.batch.get_connection')
+    def test__init__invalid_compression(self, get_connection):
+        """
+        Test initialization of :py:class:`.VerticaBatch` with an unsupported
+        compression.
+        """
+        self.assertRaises(ValueError, self.get_batch, compression='LZO')
+
+    @patch('pyvertica.batch.get_connection')
+    def test__init__quarantine_without_rejected_file(self, get_connection):
+        """
+        Test initialization of :py:class:`.VerticaBatch` with a quarantine
+        table, but without ``REJECTEDFILE``.
+        """
+        self.assertRaises(
+            ValueError,
+            self.get_batch,
+            quarantine_table='schema.test_rejects',
+            copy_options={'REJECTEDFILE': False},
+        )
+
+        batch = self.get_batch(
+            quarantine_table='schema.test_rejects',
+            copy_options={'REJECTEDFILE': True},
+        )
+        self.assertTrue(batch.copy_options_dict['REJECTEDFILE'])
+        self.assertEqual(
+            __debug__, VerticaBatch.copy_options_dict['REJECTEDFILE'])
+
+    @patch('pyvertica.batch.get_connection', Mock())
+    def test__get_num_rejected_rows(self):
+        """
+        Test :py:meth:`.VerticaBatch._get_num_rejected_rows`.
+        """
+        batch = self.get_batch()
+        batch._in_batch = False
+        batch.get_batch_count = Mock(return_value=1)
+        batch._cursor = Mock()
+
+        result = batch._cursor.execute.return_value
+        result.fetchone.return_value = [10]
+
+        self.assertEqual(10, batch._get_num_rejected_rows())
+
+    @patch('pyvertica.batch.get_connection', Mock())
+    def test__single_list_to_string(self):
+        """
+        Test :py:meth:`.VerticaBatch._single_list_to_string`.
+        """
+        batch = self.get_batch()
+        single_list = ['val1', 'val2']
+        expected = u'"val1","val2"'
+        self.assertEqual(expected,
+                         batch._single_list_to_string(single_list))
+
+    @patch('pyvertica.batch.get_connection', Mock())
+    def test__single_list_to_string_suffix(self):
+        """
+        Test :py:meth:`.VerticaBatch._single_list_to_string`.
+        """
+        batch = self.get_batch()
+        single_list = ['val1', 'val2']
+        expected = u'"val1","val2"SUFFIX'
+        self.assertEqual(expected,
+                         batch._single_list_to_string(single_list,
+                                                      suffix='SUFFIX'))
+
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_list(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.insert_list`.
+        """
+        batch = self.get_batch()
+        batch.insert_line = Mock()
+
+        self.assertEqual(
+            batch.insert_line.return_value,
+            batch.insert_list(
+                [u'valué1', 'valu"e2', 'None', None, 100, 'value4'])
+        )
+        batch.insert_line.assert_called_once_with(
+            u'"valué1","valu\\"e2","None",,"100","value4"')
+
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_list_native(self, get_connection, start_batch):
+        """
+        Test :py:meth:`.VerticaBatch.insert_list` with the native format.
+        """
+        batch = self.get_batch(native_type_list=['INTEGER', 'VARCHAR', 'INT'])
+        batch._fifo_obj = Mock()
+
+        self.assertEqual(DEFAULT_FIFO_BUFFER_SIZE, batch._fifo_buffer_size)
+
+        batch.insert_list([1, 'a', None])
+
+        batch._fifo_obj.write.assert_called_once_with(
+            '\r\x00\x00\x00\x20\x01\x00\x00\x00\x00\x00\x00\x00'
+            '\x01\x00\x00\x00a'
+        )
+        self.assertEqual(1, batch._total_count)
+        self.assertEqual(1, batch._batch_count)
+
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_lists(self, get_connection, start_batch):
+        """
+        Test :py:meth:`.VerticaBatch.insert_lists`.
         """
         batch = self.get_batch()
         batch._fifo_obj = Mock()
@@ -429,37 +1073,419 @@ class VerticaBatchTestCase(unittest.TestCase):
         self.assertEqual(2, batch._total_count)
         self.assertEqual(2, batch._batch_count)
 
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_lists_chunk_bytes(self, get_connection, start_batch):
+        """
+        Test :py:meth:`.VerticaBatch.insert_lists` streaming a generator in
+        chunks.
+        """
+        batch = self.get_batch()
+        batch._fifo_obj = Mock()
+
+        lists = (['value{0}'.format(i)] for i in range(250))
+
+        batch.insert_lists(lists, chunk_bytes=100)
+
+        # the first chunk (of 100 rows) is used to estimate the row size
+        write_list = [
+            args[0] for args, kwargs in batch._fifo_obj.write.call_args_list]
+        self.assertEqual(100, write_list[0].count('\x01'))
+        self.assertTrue(all(len(data) < 200 for data in write_list[1:]))
+        self.assertEqual(
+            ''.join('"value{0}"\x01'.format(i) for i in range(250)),
+            ''.join(write_list)
+        )
+        self.assertEqual(250, batch._total_count)
+        self.assertEqual(250, batch._batch_count)
+
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_lists_chunk_bytes_growth(
+            self, get_connection, start_batch):
+        """
+        Test :py:meth:`.VerticaBatch.insert_lists` growing the chunks at most
+        twice per chunk.
+        """
+        batch = self.get_batch()
+        batch._fifo_obj = Mock()
+
+        # small rows first, followed by large rows
+        lists = iter([[None]] * 100 + [['x' * 1000]] * 1000)
+
+        batch.insert_lists(lists, chunk_bytes=10000)
+
+        row_count_list = [
+            args[0].count('\x01')
+            for args, kwargs in batch._fifo_obj.write.call_args_list]
+        self.assertEqual([100, 200], row_count_list[:2])
+        self.assertEqual(1100, sum(row_count_list))
+
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_lists_pool(self, get_connection, start_batch):
+        """
+        Test :py:meth:`.VerticaBatch.insert_lists` with a pool.
+        """
+        batch = self.get_batch()
+        # the encoded chunks are written below the codecs writer
+        batch._fifo_obj = batch._metered_writer = Mock()
+
+        lists = iter([
+            ['line1value1', "line1value2"],
+            ['line2value1', "line2value2"],
+            ['line3value1', "line3value2"],
+        ])
+
+        batch.insert_lists(lists, pool=Pool(2), chunk_row_count=2)
+
+        self.assertEqual([
+            call(u'"line1value1","line1value2"\x01'
+                 u'"line2value1","line2value2"\x01'),
+            call(u'"line3value1","line3value2"\x01'),
+        ], batch._fifo_obj.write.call_args_list)
+        self.assertEqual(3, batch._total_count)
+        self.assertEqual(3, batch._batch_count)
+
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_columns_dict(self, get_connection, start_batch):
+        """
+        Test :py:meth:`.VerticaBatch.insert_columns` with a ``dict``.
+        """
+        batch = self.get_batch(column_type_list=[None, None, int])
+        batch._fifo_obj = Mock()
+
+        batch.insert_columns({
+            'column_1': array.array('l', [1, 2]),
+            'column_2': ['valu"e1', None],
+            'column_3': [None, 3],
+        })
+
+        batch._fifo_obj.write.assert_called_once_with(
+            u'"1","valu\\"e1",\x01"2",,"3"\x01')
+        self.assertEqual(2, batch._total_count)
+        self.assertEqual(2, batch._batch_count)
+
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_columns_sequence(self, get_connection, start_batch):
+        """
+        Test :py:meth:`.VerticaBatch.insert_columns` with a sequence.
+        """
+        batch = self.get_batch(column_list=[])
+        batch._fifo_obj = Mock()
+
+        batch.insert_columns([array.array('d', [1.5]), ['a'], (2, )])
+
+        batch._fifo_obj.write.assert_called_once_with(u'"1.5","a","2"\x01')
+        self.assertEqual(1, batch._batch_count)
+
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_columns_invalid(self, get_connection, start_batch):
+        """
+        Test :py:meth:`.VerticaBatch.insert_columns` with invalid columns.
+        """
+        batch = self.get_batch(column_list=[])
+        batch._fifo_obj = Mock()
+
+        self.assertRaises(ValueError, batch.insert_columns, [[1], [1, 2]])
+        self.assertRaises(ValueError, batch.insert_columns, {'a': [1]})
+        self.assertEqual(0, batch._fifo_obj.write.call_count)
+
     @patch('pyvertica.batch.VerticaBatch._start_batch')
     @patch('pyvertica.batch.get_connection')
     def test_insert_line(self, get_connection, start_batch):
         """
-        Test :py:meth:`.VerticaBatch.insert_line`.
+        Test :py:meth:`.VerticaBatch.insert_line`.
+        """
+        batch = self.get_batch()
+        batch._fifo_obj = Mock()
+
+        batch.insert_line('"value1";"value2";"value3"')
+
+        batch._fifo_obj.write.assert_called_once_with(
+            '"value1";"value2";"value3"\x01')
+        self.assertEqual(1, batch._total_count)
+        self.assertEqual(1, batch._batch_count)
+
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_file(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.insert_file`.
+        """
+        in_file_obj = tempfile.NamedTemporaryFile()
+        in_file_obj.write('"a","b"\x01"c","d"\x01')
+        in_file_obj.flush()
+        out_file_obj = tempfile.NamedTemporaryFile()
+
+        batch = self.get_batch()
+        batch._in_batch = True
+        batch._metered_writer = MeteredWriter(
+            FifoWriter(out_file_obj.name, 100))
+        batch._fifo_obj = batch._metered_writer
+
+        batch.insert_line('"x","y"')
+        batch.insert_file(in_file_obj.name, row_count=2)
+        batch._fifo_obj.close()
+
+        self.assertEqual(
+            '"x","y"\x01"a","b"\x01"c","d"\x01', out_file_obj.read())
+        self.assertEqual(3, batch._batch_count)
+        self.assertEqual(24, batch._metered_writer.bytes_written)
+
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_file_compression(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.insert_file` with ``compression``.
+        """
+        in_file_obj = tempfile.NamedTemporaryFile()
+        in_file_obj.write('"a","b"\x01')
+        in_file_obj.flush()
+
+        batch = self.get_batch(compression='GZIP')
+        batch._in_batch = True
+        batch._fifo_obj = Mock()
+
+        batch.insert_file(in_file_obj.name)
+
+        batch._fifo_obj.write.assert_called_once_with('"a","b"\x01')
+        self.assertEqual(1, batch._batch_count)
+
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_file_count_rows(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.insert_file` counting the rows.
+        """
+        in_file_obj = tempfile.NamedTemporaryFile()
+        in_file_obj.write('"a","b"\x01"c","d"\x01"e","f"\x01')
+        in_file_obj.flush()
+        out_file_obj = tempfile.NamedTemporaryFile()
+
+        batch = self.get_batch()
+        batch._in_batch = True
+        batch._metered_writer = MeteredWriter(
+            FifoWriter(out_file_obj.name, 100))
+        batch._fifo_obj = batch._metered_writer
+
+        batch.insert_file(in_file_obj.name)
+        batch._fifo_obj.close()
+
+        self.assertEqual(
+            '"a","b"\x01"c","d"\x01"e","f"\x01', out_file_obj.read())
+        self.assertEqual(3, batch._batch_count)
+        self.assertEqual(3, batch._total_count)
+        self.assertFalse(batch._raw_record_open)
+
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_file_native_row_count(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.insert_file` in the native format
+        without ``row_count``.
+        """
+        batch = self.get_batch(
+            native_type_list=['INTEGER', 'VARCHAR(10)', 'DATE'])
+        batch._in_batch = True
+
+        self.assertRaises(ValueError, batch.insert_file, '/tmp/export.bin')
+
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_line_native(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.insert_line` in the native format.
+        """
+        batch = self.get_batch(
+            native_type_list=['INTEGER', 'VARCHAR(10)', 'DATE'])
+        batch._in_batch = True
+        batch._fifo_obj = Mock()
+
+        self.assertRaises(ValueError, batch.insert_line, '1;"foo";2014-01-01')
+        self.assertFalse(batch._fifo_obj.write.called)
+        self.assertEqual(0, batch._total_count)
+
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_line_commit_max_rows(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.insert_line` with ``commit_max_rows``.
+        """
+        errors = (0, Mock())
+        commit_callback = Mock(return_value=True)
+        batch = self.get_batch(
+            commit_max_rows=2, commit_callback=commit_callback)
+        batch._in_batch = True
+        batch._fifo_obj = Mock()
+        batch.get_errors = Mock(return_value=errors)
+        batch.commit = Mock()
+
+        batch.insert_line('foo')
+        self.assertEqual(0, batch.commit.call_count)
+
+        batch.insert_line('bar')
+        commit_callback.assert_called_once_with(*errors)
+        batch.commit.assert_called_once_with()
+
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_lists_commit_callback_rollback(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.insert_lists` with a commit callback
+        returning ``False``.
+        """
+        batch = self.get_batch(
+            commit_max_rows=2, commit_callback=Mock(return_value=False))
+        batch._in_batch = True
+        batch._fifo_obj = Mock()
+        batch.get_errors = Mock(return_value=(1, Mock()))
+        batch.commit = Mock()
+        batch.rollback = Mock()
+
+        batch.insert_lists([['a'], ['b'], ['c']], row_count=3)
+
+        batch.rollback.assert_called_once_with()
+        self.assertEqual(0, batch.commit.call_count)
+
+    @patch('pyvertica.batch.time')
+    @patch('pyvertica.batch.get_connection')
+    def test__commit_policy_reached(self, get_connection, time):
+        """
+        Test :py:meth:`.VerticaBatch._commit_policy_reached`.
+        """
+        batch = self.get_batch(commit_max_bytes=100, commit_max_seconds=60)
+        batch._metered_writer = Mock(bytes_written=10)
+        batch._first_insert_time = 1000.0
+        time.time.return_value = 1030.0
+
+        # not in a batch
+        self.assertFalse(batch._commit_policy_reached())
+
+        batch._in_batch = True
+        self.assertFalse(batch._commit_policy_reached())
+
+        batch._metered_writer.bytes_written = 100
+        self.assertTrue(batch._commit_policy_reached())
+
+        batch._metered_writer.bytes_written = 10
+        time.time.return_value = 1060.0
+        self.assertTrue(batch._commit_policy_reached())
+
+        # a raw record is not split over two transactions
+        batch._raw_record_open = True
+        self.assertFalse(batch._commit_policy_reached())
+
+    @patch('pyvertica.batch.time')
+    @patch('pyvertica.batch.get_connection')
+    def test__commit_policy_reached_first_insert(self, get_connection, time):
+        """
+        Test :py:meth:`.VerticaBatch._commit_policy_reached` counting the
+        time from the first insert, for a batch started long before.
+        """
+        batch = self.get_batch(commit_max_seconds=60)
+        batch._metered_writer = Mock(bytes_written=10)
+        batch._in_batch = True
+        batch._batch_start_time = 1000.0
+
+        time.time.return_value = 5000.0
+        self.assertFalse(batch._commit_policy_reached())
+        self.assertEqual(5000.0, batch._first_insert_time)
+
+        time.time.return_value = 5059.0
+        self.assertFalse(batch._commit_policy_reached())
+
+        time.time.return_value = 5060.0
+        self.assertTrue(batch._commit_policy_reached())
+
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_raw(self, get_connection, start_batch):
+        """
+        Test :py:meth:`.VerticaBatch.insert_raw`.
+        """
+        batch = self.get_batch()
+        batch._fifo_obj = Mock()
+
+        batch.insert_raw('a,b\x01c,')
+        batch._fifo_obj.write.assert_called_with('a,b\x01c,')
+        self.assertEqual(1, batch._total_count)
+        self.assertEqual(1, batch._batch_count)
+        self.assertTrue(batch._raw_record_open)
+
+        batch.insert_raw('d\x01e,f\x01')
+        self.assertEqual(3, batch._total_count)
+        self.assertEqual(3, batch._batch_count)
+        self.assertFalse(batch._raw_record_open)
+
+    @patch('pyvertica.batch.logger')
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_raw_non_ascii(self, get_connection, start_batch, logger):
+        """
+        Test :py:meth:`.VerticaBatch.insert_raw` with non-ASCII bytes.
+        """
+        batch = self.get_batch()
+        batch._fifo_obj = Mock()
+
+        batch.insert_raw('caf\xc3\xa9\x01' * 100)
+
+        batch._fifo_obj.write.assert_called_once_with('caf\xc3\xa9\x01' * 100)
+        self.assertEqual(100, batch._total_count)
+        if __debug__:
+            self.assertEqual(
+                "Inserting raw: {0!r}".format(('caf\xc3\xa9\x01' * 100)[:200]),
+                logger.debug.call_args[0][0]
+            )
+
+    @patch.dict(VerticaBatch.copy_options_dict)
+    @patch('pyvertica.batch.VerticaBatch._start_batch')
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_raw_split_terminator(self, get_connection, start_batch):
+        """
+        Test :py:meth:`.VerticaBatch.insert_raw` with a terminator split over
+        two chunks.
         """
-        batch = self.get_batch()
+        batch = self.get_batch(copy_options={'RECORD TERMINATOR': '\r\n'})
         batch._fifo_obj = Mock()
 
-        batch.insert_line('"value1";"value2";"value3"')
+        for raw_str in ['a,b\r\nc,d\r', '\n', 'e,f\r', '', '\ng,h']:
+            batch.insert_raw(raw_str)
 
-        batch._fifo_obj.write.assert_called_once_with(
-            '"value1";"value2";"value3"\x01')
-        self.assertEqual(1, batch._total_count)
-        self.assertEqual(1, batch._batch_count)
+        self.assertEqual(3, batch._batch_count)
+        self.assertTrue(batch._raw_record_open)
+
+        # the last record is counted when the batch ends
+        batch._in_batch = True
+        batch._fifo_obj = Mock()
+        batch._query_thread = Mock()
+        batch._query = Mock()
+        batch._multi_batch = True
+        batch._end_batch()
+        self.assertEqual(4, batch._batch_count)
 
+    @patch.dict(VerticaBatch.copy_options_dict)
     @patch('pyvertica.batch.VerticaBatch._start_batch')
     @patch('pyvertica.batch.get_connection')
-    def test_insert_raw(self, get_connection, start_batch):
+    def test_insert_raw_split_terminator_last_chunk(
+            self, get_connection, start_batch):
         """
-        Test :py:meth:`.VerticaBatch.insert_raw`.
+        Test :py:meth:`.VerticaBatch.insert_raw` with a terminator split over
+        the last two chunks.
         """
-        batch = self.get_batch()
+        batch = self.get_batch(copy_options={'RECORD TERMINATOR': '\r\n'})
         batch._fifo_obj = Mock()
 
-        raw_mock = Mock()
+        for raw_str in ['a,b\r\nc,d\r', '\n']:
+            batch.insert_raw(raw_str)
 
-        batch.insert_raw(raw_mock)
-        batch._fifo_obj.write.assert_called_with(raw_mock)
-        self.assertEqual(1, batch._total_count)
-        self.assertEqual(1, batch._batch_count)
+        self.assertEqual(2, batch._batch_count)
+        self.assertFalse(batch._raw_record_open)
+
+        # no record is left to count when the batch ends
+        batch._in_batch = True
+        batch._fifo_obj = Mock()
+        batch._query_thread = Mock()
+        batch._query = Mock()
+        batch._multi_batch = True
+        batch._end_batch()
+        self.assertEqual(2, batch._batch_count)
 
     @patch('pyvertica.batch.get_connection')
     def test_get_errors_exception(self, get_connection):
@@ -488,6 +1514,7 @@ class VerticaBatchTestCase(unittest.TestCase):
         batch._end_batch = Mock()
         batch._cursor = Mock()
         batch._rejected_file_obj = tempfile.NamedTemporaryFile()
+        batch._exceptions_file_obj = tempfile.NamedTemporaryFile()
         batch._get_num_rejected_rows = Mock(return_value=0)
 
         batch._cursor.execute.side_effect = Exception(
@@ -506,6 +1533,7 @@ class VerticaBatchTestCase(unittest.TestCase):
         batch._end_batch = Mock()
         batch._cursor = Mock()
         batch._rejected_file_obj = tempfile.NamedTemporaryFile()
+        batch._exceptions_file_obj = tempfile.NamedTemporaryFile()
 
         self.assertEqual(0, batch._cursor.execute.call_count)
 
@@ -519,6 +1547,7 @@ class VerticaBatchTestCase(unittest.TestCase):
         batch._end_batch = Mock()
         batch._cursor = Mock()
         batch._rejected_file_obj = tempfile.NamedTemporaryFile()
+        batch._exceptions_file_obj = tempfile.NamedTemporaryFile()
         batch._get_num_rejected_rows = Mock(return_value=0)
 
         batch._cursor.execute.return_value.rowcount = 10
@@ -530,6 +1559,89 @@ class VerticaBatchTestCase(unittest.TestCase):
         self.assertEqual(
             'At least one constraint not met: a, b\n', errors_tuple[1].read())
 
+    @patch('pyvertica.batch.get_connection')
+    def test_get_errors_no_constraints_cached(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.get_errors` for a table without
+        constraints.
+        """
+        batch = self.get_batch()
+        batch.get_batch_count = Mock(return_value=10)
+        batch._end_batch = Mock()
+        batch._cursor = Mock()
+        batch._rejected_file_obj = tempfile.NamedTemporaryFile()
+        batch._exceptions_file_obj = tempfile.NamedTemporaryFile()
+        batch._get_num_rejected_rows = Mock(return_value=0)
+        batch._cursor.execute.return_value.fetchone.return_value = [0]
+
+        batch.get_errors()
+        batch.get_errors()
+
+        # only the catalog was queried, once
+        batch._cursor.execute.assert_called_once_with(
+            'SELECT COUNT(*) FROM v_catalog.table_constraints c '
+            'JOIN v_catalog.tables t ON c.table_id = t.table_id '
+            'WHERE LOWER(t.table_schema) = ? '
+            'AND LOWER(t.table_name) = ? '
+            "AND c.constraint_type <> 'n'",
+            'schema',
+            'test_table',
+        )
+        self.assertEqual(
+            [('schema', 'test_table')], _constraint_cache.keys())
+
+    @patch('pyvertica.batch.get_connection')
+    def test__has_constraints_similar_name(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch._has_constraints` for tables with names
+        matching each other with ``LIKE``.
+        """
+        batch = self.get_batch(table_name='Staging.My_Table')
+        batch._cursor = Mock()
+        batch._cursor.execute.return_value.fetchone.return_value = [1]
+        self.assertTrue(batch._has_constraints())
+        self.assertEqual(
+            ('staging', 'my_table'), batch._cursor.execute.call_args[0][1:])
+
+        # not taken from the cache of staging.my_table
+        other_batch = self.get_batch(table_name='staging.myXtable')
+        other_batch._cursor = Mock()
+        other_batch._cursor.execute.return_value.fetchone.return_value = [0]
+        self.assertFalse(other_batch._has_constraints())
+        self.assertEqual(
+            ('staging', 'myxtable'),
+            other_batch._cursor.execute.call_args[0][1:]
+        )
+
+    @patch('pyvertica.batch.time')
+    @patch('pyvertica.batch.get_connection')
+    def test__has_constraints_expired(self, get_connection, time):
+        """
+        Test :py:meth:`.VerticaBatch._has_constraints` with an expired cache.
+        """
+        time.time.side_effect = [100.0, 200.0, 500.0, 500.0]
+        batch = self.get_batch(constraint_cache_ttl=300)
+        batch._cursor = Mock()
+        batch._cursor.execute.return_value.fetchone.side_effect = [[1], [0]]
+
+        self.assertTrue(batch._has_constraints())
+        self.assertTrue(batch._has_constraints())
+        self.assertFalse(batch._has_constraints())
+        self.assertEqual(2, batch._cursor.execute.call_count)
+
+    @patch('pyvertica.batch.get_connection')
+    def test__has_constraints_catalog_error(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch._has_constraints` when the catalog can
+        not be queried.
+        """
+        batch = self.get_batch()
+        batch._cursor = Mock()
+        batch._cursor.execute.side_effect = Exception('Permission denied')
+
+        self.assertTrue(batch._has_constraints())
+        self.assertEqual({}, _constraint_cache)
+
     @patch('pyvertica.batch.get_connection')
     def test_get_errors_rejected(self, get_connection):
         """
@@ -540,6 +1652,7 @@ class VerticaBatchTestCase(unittest.TestCase):
         batch._end_batch = Mock()
         batch._cursor = Mock()
         batch._rejected_file_obj = tempfile.NamedTemporaryFile()
+        batch._exceptions_file_obj = tempfile.NamedTemporaryFile()
         batch._get_num_rejected_rows = Mock(return_value=123)
 
         batch._cursor.execute.return_value.rowcount = 0
@@ -555,6 +1668,151 @@ class VerticaBatchTestCase(unittest.TestCase):
             errors_tuple[1].read()
         )
 
+    @patch('pyvertica.batch.get_connection')
+    def test_iter_rejected(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.iter_rejected`.
+        """
+        batch = self.get_batch()
+        batch._in_batch = True
+        batch._end_batch = Mock()
+        batch._rejected_file_obj = tempfile.NamedTemporaryFile()
+        batch._exceptions_file_obj = tempfile.NamedTemporaryFile()
+
+        with open(batch._rejected_file_obj.name, 'w') as f:
+            f.write('a,b\x01c\x01')
+        with open(batch._exceptions_file_obj.name, 'w') as f:
+            f.write(
+                'COPY: Input record 2 has been rejected (Invalid integer '
+                'format \'a\' for column 1 (id)).  Please see '
+                '/tmp/rejected, record 1 for the rejected record.\n'
+                'COPY: Input record 5 has been rejected (Too few columns '
+                'found).  Please see /tmp/rejected, record 2 for the '
+                'rejected record.\n'
+            )
+
+        self.assertEqual([
+            RejectedRow(
+                2, 'a,b', "Invalid integer format 'a' for column 1 (id)",
+                None),
+            RejectedRow(5, 'c', 'Too few columns found', None),
+        ], list(batch.iter_rejected()))
+        batch._end_batch.assert_called_once_with()
+
+    @patch('pyvertica.batch.get_connection')
+    def test_iter_rejected_native(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.iter_rejected` with the native format.
+        """
+        batch = self.get_batch(
+            native_type_list=['INTEGER', 'VARCHAR(10)', 'DATE'])
+        batch._rejected_file_obj = tempfile.NamedTemporaryFile()
+        batch._exceptions_file_obj = tempfile.NamedTemporaryFile()
+
+        with open(batch._rejected_file_obj.name, 'w') as f:
+            f.write('\x01\x02\x03')
+        with open(batch._exceptions_file_obj.name, 'w') as f:
+            f.write('Something unexpected\n')
+
+        self.assertEqual(
+            [RejectedRow(None, None, 'Something unexpected', None)],
+            list(batch.iter_rejected())
+        )
+
+    @patch('pyvertica.batch.get_connection')
+    def test_get_errors_record_index(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.get_errors` resolving the offset of
+        rejected rows.
+        """
+        batch = self.get_batch(record_index=True)
+        batch.get_batch_count = Mock(return_value=5)
+        batch._end_batch = Mock()
+        batch._cursor = Mock()
+        batch._rejected_file_obj = tempfile.NamedTemporaryFile()
+        batch._exceptions_file_obj = tempfile.NamedTemporaryFile()
+        batch._get_num_rejected_rows = Mock(return_value=2)
+        batch._record_lengths = array.array('I', [4, 3, 5, 2, 6])
+
+        batch._cursor.execute.return_value.rowcount = 0
+
+        with open(batch._rejected_file_obj.name, 'w') as f:
+            f.write('bb\x01eeeee\x01')
+        with open(batch._exceptions_file_obj.name, 'w') as f:
+            f.write(
+                'COPY: Input record 2 has been rejected (Too few columns '
+                'found).  Please see /tmp/rejected, record 1 for the '
+                'rejected record.\n'
+                'COPY: Input record 5 has been rejected (Too few columns '
+                'found).  Please see /tmp/rejected, record 2 for the '
+                'rejected record.\n'
+            )
+
+        self.assertEqual(
+            [4, 14],
+            [rejected_row.offset for rejected_row in batch.iter_rejected()]
+        )
+        self.assertEqual(
+            'Rejected data at line: bb (record 2, offset 4)\n'
+            'Rejected data at line: eeeee (record 5, offset 14)\n',
+            batch.get_errors()[1].read()
+        )
+
+    @patch.dict(VerticaBatch.copy_options_dict)
+    @patch('pyvertica.batch.get_connection')
+    def test__index_raw(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch._index_raw` with a terminator split over
+        two raw ``str`` objects.
+        """
+        batch = self.get_batch(
+            record_index=True, copy_options={'RECORD TERMINATOR': '\r\n'})
+        batch._record_lengths = array.array('I')
+
+        batch._index_raw('ab\r')
+        batch._index_raw(u'\ncd\r\n\xe9f')
+        batch._index_records([u'gh\r\n'])
+
+        self.assertEqual([4, 4, 7], batch._record_lengths.tolist())
+        self.assertEqual(0, batch._open_record_length)
+
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_lists_record_index(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.insert_lists` with ``record_index``.
+        """
+        batch = self.get_batch(record_index=True)
+        batch._in_batch = True
+        batch._fifo_obj = Mock()
+        batch._record_lengths = array.array('I')
+
+        batch.insert_lists([['a', 'b'], [u'\xe9', 'cd']], row_count=2)
+
+        self.assertEqual([8, 10], batch._record_lengths.tolist())
+
+    @patch('pyvertica.batch.get_connection')
+    def test_insert_file_native_record_index(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.insert_file` in the native format with
+        ``record_index``.
+        """
+        batch = self.get_batch(
+            native_type_list=['INTEGER', 'VARCHAR(10)', 'DATE'],
+            record_index=True,
+        )
+        batch._in_batch = True
+
+        self.assertRaises(ValueError, batch.insert_file, '/tmp/export.bin')
+
+    @patch('pyvertica.batch.get_connection')
+    def test_iter_rejected_disabled(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.iter_rejected` without rejected file.
+        """
+        batch = self.get_batch()
+
+        self.assertEqual([], list(batch.iter_rejected()))
+
     @patch('pyvertica.batch.tempfile')
     @patch('pyvertica.batch.get_connection')
     def test_get_errors_no_batch_count(self, get_connection, tempfile):
@@ -599,6 +1857,121 @@ class VerticaBatchTestCase(unittest.TestCase):
         self.assertEqual(0, batch._end_batch.call_count)
         batch._connection.commit.assert_called_once_with()
 
+    @patch('pyvertica.batch.get_connection')
+    def test_commit_quarantine(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.commit` with a ``quarantine_table``.
+        """
+        call_list = []
+        batch = self.get_batch(quarantine_table='schema.test_table_rejects')
+        batch._batch_count = 10
+        batch._connection = Mock()
+        batch._connection.commit.side_effect = (
+            lambda: call_list.append('commit'))
+        batch.quarantine_rejected = Mock(
+            side_effect=lambda: call_list.append('quarantine'))
+
+        batch.commit()
+
+        self.assertEqual(['quarantine', 'commit'], call_list)
+
+    @patch('pyvertica.batch.get_connection')
+    def test_quarantine_rejected(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.quarantine_rejected`.
+        """
+        batch = self.get_batch(
+            quarantine_table='schema.test_table_rejects',
+            quarantine_metadata={'batch_source_path': 'test/path'},
+        )
+        batch.iter_rejected = Mock(return_value=iter([
+            RejectedRow(2, 'a\xff', 'Too few columns found', 4),
+            RejectedRow(5, None, None, None),
+        ]))
+
+        with patch('pyvertica.batch.VerticaBatch') as VerticaBatchMock:
+            quarantine_batch = VerticaBatchMock.return_value
+            quarantine_batch.get_errors.return_value = (0, Mock())
+            quarantine_batch.get_batch_count.return_value = 2
+
+            self.assertEqual(2, batch.quarantine_rejected())
+
+        VerticaBatchMock.assert_called_once_with(
+            table_name='schema.test_table_rejects',
+            connection=batch._connection,
+            analyze_constraints=False,
+            column_list=[
+                'batch_source_path', 'table_name', 'row_number',
+                'record_offset', 'reason', 'raw_data',
+            ],
+        )
+        value_lists = quarantine_batch.insert_lists.call_args[0][0]
+        self.assertEqual([
+            ['test/path', 'schema.test_table', 2, 4,
+             u'Too few columns found', u'a\ufffd'],
+            ['test/path', 'schema.test_table', 5, None, None, None],
+        ], list(value_lists))
+
+    @patch('pyvertica.batch.get_connection')
+    def test_quarantine_rejected_none(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.quarantine_rejected` without rejected
+        rows.
+        """
+        batch = self.get_batch(quarantine_table='schema.test_table_rejects')
+        batch.iter_rejected = Mock(return_value=iter([]))
+
+        with patch('pyvertica.batch.VerticaBatch') as VerticaBatchMock:
+            self.assertEqual(0, batch.quarantine_rejected())
+
+        self.assertEqual(0, VerticaBatchMock.call_count)
+
+    @patch('pyvertica.batch.time')
+    @patch('pyvertica.batch.get_connection')
+    def test_commit_metrics_callback(self, get_connection, time):
+        """
+        Test :py:meth:`.VerticaBatch.commit` reporting the metrics.
+        """
+        time.time.side_effect = [10.0, 10.5, 11.0, 11.0]
+        metrics_callback = Mock()
+        batch = self.get_batch(metrics_callback=metrics_callback)
+        batch._connection = Mock()
+        batch._metrics_pending = True
+        batch._batch_start_time = 0.0
+        batch._batch_end_time = 4.0
+        batch._batch_count = 100
+        batch._format_time = 1.0
+        batch._copy_time = 3.0
+        batch._metered_writer = Mock(
+            bytes_written=2 * 1024 * 1024, write_time=2.0)
+
+        batch.commit()
+        batch.commit()
+
+        metrics_callback.assert_called_once_with({
+            'rows': 100,
+            'bytes': 2 * 1024 * 1024,
+            'format_time': 1.0,
+            'write_time': 2.0,
+            'copy_time': 3.0,
+            'commit_time': 0.5,
+            'batch_time': 4.0,
+            'rows_per_second': 25.0,
+            'mb_per_second': 0.5,
+        })
+
+    @patch('pyvertica.batch.get_connection')
+    def test_get_metrics_not_started(self, get_connection):
+        """
+        Test :py:meth:`.VerticaBatch.get_metrics` before starting a batch.
+        """
+        metrics = self.get_batch().get_metrics()
+
+        self.assertEqual(0, metrics['rows'])
+        self.assertEqual(0, metrics['bytes'])
+        self.assertEqual(0.0, metrics['rows_per_second'])
+        self.assertEqual(None, metrics['copy_time'])
+
     @patch('pyvertica.batch.get_connection')
     def test_rollback_in_batch(self, get_connection):
         """
@@ -640,3 +2013,305 @@ class VerticaBatchTestCase(unittest.TestCase):
         self.assertEqual(
             batch._connection.cursor.return_value, batch.get_cursor())
         batch._connection.cursor.assert_called_once_with()
+
+
+class ParallelVerticaBatchTestCase(unittest.TestCase):
+    """
+    Test for :py:class:`.ParallelVerticaBatch`.
+    """
+    @patch('pyvertica.batch.VerticaBatch')
+    @patch('pyvertica.batch.get_connection_list')
+    def get_batch(self, get_connection_list, VerticaBatchMock, **kwargs):
+        get_connection_list.return_value = ['connection1', 'connection2']
+        VerticaBatchMock.side_effect = lambda **kwargs: Mock()
+
+        arguments = {
+            'table_name': 'schema.test_table',
+            'odbc_kwargs': {'dsn': 'TestDSN'},
+            'truncate_table': True,
+            'column_list': ['column_1', 'column_2'],
+            'chunk_row_count': 2,
+        }
+        arguments.update(kwargs)
+        batch = ParallelVerticaBatch(**arguments)
+
+        get_connection_list.assert_called_once_with(
+            2, reconnect=True, node_selector=None, dsn='TestDSN')
+        self.assertEqual([
+            call(
+                table_name='schema.test_table',
+                connection='connection1',
+                truncate_table=True,
+                column_list=['column_1', 'column_2'],
+            ),
+            call(
+                table_name='schema.test_table',
+                connection='connection2',
+                truncate_table=False,
+                column_list=['column_1', 'column_2'],
+            ),
+        ], VerticaBatchMock.call_args_list)
+        return batch
+
+    def test___init__no_streams(self):
+        """
+        Test initialization of :py:class:`.ParallelVerticaBatch` without
+        streams.
+        """
+        self.assertRaises(
+            ValueError, ParallelVerticaBatch, 'schema.test_table', streams=0)
+
+    @patch('pyvertica.batch.get_connection_list')
+    def test___init__commit_policy(self, get_connection_list):
+        """
+        Test initialization of :py:class:`.ParallelVerticaBatch` with a
+        commit policy.
+        """
+        for kwargs in [
+                {'commit_max_rows': 1000},
+                {'commit_max_bytes': 1024},
+                {'commit_max_seconds': 60},
+                {'commit_callback': Mock()}]:
+            self.assertRaises(
+                ValueError,
+                ParallelVerticaBatch,
+                'schema.test_table',
+                odbc_kwargs={'dsn': 'TestDSN'},
+                **kwargs
+            )
+        self.assertFalse(get_connection_list.called)
+
+    def test_insert_list(self):
+        """
+        Test :py:meth:`.ParallelVerticaBatch.insert_list`.
+        """
+        batch = self.get_batch()
+        batch_1, batch_2 = batch._batch_list
+
+        batch.insert_list(['a', 'b'])
+        batch.insert_list(['c', 'd'])
+        batch.insert_list(['e', 'f'])
+
+        self.assertEqual(
+            [call(['a', 'b']), call(['e', 'f'])],
+            batch_1.insert_list.call_args_list
+        )
+        batch_2.insert_list.assert_called_once_with(['c', 'd'])
+
+    def test_insert_lists(self):
+        """
+        Test :py:meth:`.ParallelVerticaBatch.insert_lists`.
+        """
+        batch = self.get_batch()
+        batch_1, batch_2 = batch._batch_list
+
+        batch.insert_lists(iter([['a'], ['b'], ['c']]))
+
+        batch_1.insert_lists.assert_called_once_with([['a'], ['b']])
+        batch_2.insert_lists.assert_called_once_with([['c']])
+
+    def test_get_batch_count(self):
+        """
+        Test :py:meth:`.ParallelVerticaBatch.get_batch_count`.
+        """
+        batch = self.get_batch()
+        batch._batch_list[0].get_batch_count.return_value = 10
+        batch._batch_list[1].get_batch_count.return_value = 5
+
+        self.assertEqual(15, batch.get_batch_count())
+
+    def test_get_errors(self):
+        """
+        Test :py:meth:`.ParallelVerticaBatch.get_errors`.
+        """
+        batch = self.get_batch()
+        batch_1, batch_2 = batch._batch_list
+        error_file_1 = tempfile.TemporaryFile()
+        error_file_1.write('error 1\n')
+        error_file_1.seek(0)
+        batch_1.get_errors.return_value = (1, error_file_1)
+        batch_2.get_errors.return_value = (False, tempfile.TemporaryFile())
+
+        error_count, error_file_obj = batch.get_errors()
+
+        self.assertEqual(1, error_count)
+        self.assertEqual('error 1\n', error_file_obj.read())
+
+    def test_iter_rejected(self):
+        """
+        Test :py:meth:`.ParallelVerticaBatch.iter_rejected`.
+        """
+        batch = self.get_batch()
+        batch_1, batch_2 = batch._batch_list
+        batch_1.iter_rejected.return_value = iter(['row 1'])
+        batch_2.iter_rejected.return_value = iter(['row 2', 'row 3'])
+
+        self.assertEqual(
+            ['row 1', 'row 2', 'row 3'], list(batch.iter_rejected()))
+
+    def test_commit(self):
+        """
+        Test :py:meth:`.ParallelVerticaBatch.commit`.
+        """
+        batch = self.get_batch()
+
+        batch.commit()
+
+        for stream_batch in batch._batch_list:
+            stream_batch.commit.assert_called_once_with()
+
+    def test_rollback(self):
+        """
+        Test :py:meth:`.ParallelVerticaBatch.rollback`.
+        """
+        batch = self.get_batch()
+
+        batch.rollback()
+
+        for stream_batch in batch._batch_list:
+            stream_batch.rollback.assert_called_once_with()
+
+
+class PipelinedVerticaBatchTestCase(unittest.TestCase):
+    """
+    Test for :py:class:`.PipelinedVerticaBatch`.
+    """
+    @patch('pyvertica.batch.VerticaBatch')
+    @patch('pyvertica.batch.get_connection_list')
+    def get_batch(self, get_connection_list, VerticaBatchMock, **kwargs):
+        get_connection_list.return_value = ['connection1', 'connection2']
+        VerticaBatchMock.side_effect = lambda **kwargs: Mock(**{
+            '_has_commit_policy': True,
+            '_commit_policy_reached.return_value': False,
+        })
+
+        arguments = {
+            'table_name': 'schema.test_table',
+            'odbc_kwargs': {'dsn': 'TestDSN'},
+            'truncate_table': True,
+            'column_list': ['column_1', 'column_2'],
+        }
+        arguments.update(kwargs)
+        batch = PipelinedVerticaBatch(**arguments)
+        batch.wait()
+
+        get_connection_list.assert_called_once_with(
+            2, reconnect=True, node_selector=None, dsn='TestDSN')
+        self.assertEqual([
+            call(
+                table_name='schema.test_table',
+                connection='connection1',
+                truncate_table=True,
+                multi_batch=True,
+                column_list=['column_1', 'column_2'],
+            ),
+            call(
+                table_name='schema.test_table',
+                connection='connection2',
+                truncate_table=False,
+                multi_batch=True,
+                column_list=['column_1', 'column_2'],
+            ),
+        ], VerticaBatchMock.call_args_list)
+        return batch
+
+    def test___init__(self):
+        """
+        Test initialization of :py:class:`.PipelinedVerticaBatch`.
+        """
+        batch = self.get_batch()
+        batch_1, batch_2 = batch._batch_list
+
+        self.assertTrue(batch._has_commit_policy)
+        self.assertFalse(batch_1._has_commit_policy)
+        self.assertFalse(batch_2._has_commit_policy)
+
+        # the standby batch is started in the background
+        self.assertEqual(batch_1, batch._active_batch)
+        batch_2._start_batch.assert_called_once_with()
+        self.assertEqual(0, batch_1._start_batch.call_count)
+
+    def test_commit(self):
+        """
+        Test :py:meth:`.PipelinedVerticaBatch.commit`.
+        """
+        commit_callback = Mock(return_value=True)
+        batch = self.get_batch(commit_callback=commit_callback)
+        batch_1, batch_2 = batch._batch_list
+        batch_1.get_errors.return_value = (0, 'errors')
+
+        batch.insert_list(['a', 'b'])
+        batch.commit()
+        batch.insert_list(['c', 'd'])
+        batch.wait()
+
+        batch_1.insert_list.assert_called_once_with(['a', 'b'])
+        batch_2.insert_list.assert_called_once_with(['c', 'd'])
+        commit_callback.assert_called_once_with(0, 'errors')
+        batch_1.commit.assert_called_once_with()
+        batch_1._start_batch.assert_called_once_with()
+        self.assertEqual(0, batch_2.commit.call_count)
+
+    def test_commit_callback_rollback(self):
+        """
+        Test :py:meth:`.PipelinedVerticaBatch.commit` with a commit callback
+        returning ``False``.
+        """
+        batch = self.get_batch(commit_callback=Mock(return_value=False))
+        batch_1 = batch._active_batch
+        batch_1.get_errors.return_value = (1, 'errors')
+
+        batch.commit()
+        batch.wait()
+
+        batch_1.rollback.assert_called_once_with()
+        self.assertEqual(0, batch_1.commit.call_count)
+
+    def test_commit_exception(self):
+        """
+        Test :py:meth:`.PipelinedVerticaBatch.commit` failing in the
+        background.
+        """
+        batch = self.get_batch()
+        batch._active_batch.commit.side_effect = IOError('boom!')
+
+        batch.commit()
+
+        self.assertRaises(IOError, batch.wait)
+        # the exception is only raised once
+        batch.wait()
+
+    def test_insert_lists_commit_policy(self):
+        """
+        Test :py:meth:`.PipelinedVerticaBatch.insert_lists` reaching the
+        commit policy.
+        """
+        batch = self.get_batch()
+        batch_1, batch_2 = batch._batch_list
+        batch_1._commit_policy_reached.return_value = True
+
+        batch.insert_lists([['a', 'b']], row_count=1)
+        batch.wait()
+
+        batch_1.insert_lists.assert_called_once_with([['a', 'b']])
+        batch_1.commit.assert_called_once_with()
+        self.assertEqual(batch_2, batch._active_batch)
+
+    def test_close_batch(self):
+        """
+        Test :py:meth:`.PipelinedVerticaBatch.close_batch`.
+        """
+        batch = self.get_batch()
+        batch_1, batch_2 = batch._batch_list
+        batch_1._in_batch = False
+        batch_1._batch_initialized = False
+        batch_2._in_batch = True
+        batch_2._batch_initialized = True
+        batch_2.close_batch.return_value = True
+
+        self.assertTrue(batch.close_batch())
+
+        self.assertEqual(0, batch_1.rollback.call_count)
+        self.assertEqual(0, batch_1.close_batch.call_count)
+        batch_2.rollback.assert_called_once_with()
+        batch_2.close_batch.assert_called_once_with()
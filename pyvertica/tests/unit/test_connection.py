@@ -2,53 +2,594 @@ import unittest2 as unittest
 
 from mock import Mock, call, patch
 
-from pyvertica.connection import get_connection
-from pyvertica.connection import _get_random_node_address
+from pyvertica.connection import (
+    ConnectionPool,
+    ConnectionPoolError,
+    NodeConnectionError,
+    RoundRobinNodeSelector,
+    get_connection,
+    get_connection_list,
+    select_least_loaded_nodes,
+)
+from pyvertica.connection import (
+    _blacklist_node,
+    _get_node_address_list,
+    _get_node_load_dict,
+    _node_blacklist,
+    _topology_cache,
+)
 
 
 class ModuleTestCase(unittest.TestCase):
     """
     Tests for :py:mod:`~pyvertica.connection`.
     """
-    @patch('pyvertica.connection._get_random_node_address')
+    def setUp(self):
+        _topology_cache.clear()
+        _node_blacklist.clear()
+
+    @patch('pyvertica.connection._get_node_address_list')
     @patch('pyvertica.connection.pyodbc')
-    def test_get_connection(self, pyodbc, get_random_node_address):
+    def test_get_connection(self, pyodbc, get_node_address_list):
         """
-        Test :py:func:`.get_connection`.
+        Test :py:func:`.get_connection` without the topology cache.
         """
-        pyodbc.connect.side_effect = ['connection1', 'connection2']
+        balancer_connection = Mock()
+        pyodbc.connect.side_effect = [balancer_connection, 'connection']
+        get_node_address_list.return_value = ['node1']
 
-        connection = get_connection(dsn='TestDSN', foo='bar', bar='foo')
+        connection = get_connection(
+            topology_cache_ttl=0, dsn='TestDSN', foo='bar', bar='foo')
 
         self.assertEqual([
             call(dsn='TestDSN', foo='bar', bar='foo'),
             call(
                 dsn='TestDSN',
-                servername=get_random_node_address.return_value,
+                servername='node1',
                 foo='bar',
                 bar='foo',
             ),
         ], pyodbc.connect.call_args_list)
 
-        get_random_node_address.assert_called_once_with('connection1')
+        get_node_address_list.assert_called_once_with(balancer_connection)
+        balancer_connection.close.assert_called_once_with()
+
+        self.assertEqual('connection', connection)
+        self.assertEqual({}, _topology_cache)
+
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_no_reconnect(self, pyodbc):
+        """
+        Test :py:func:`.get_connection` without reconnect.
+        """
+        self.assertEqual(
+            pyodbc.connect.return_value,
+            get_connection(
+                reconnect=False, connect_timeout=5, dsn='TestDSN')
+        )
+        pyodbc.connect.assert_called_once_with(dsn='TestDSN', timeout=5)
+
+    @patch('pyvertica.connection.time')
+    @patch('pyvertica.connection._get_node_address_list')
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_cached(
+            self, pyodbc, get_node_address_list, time):
+        """
+        Test :py:func:`.get_connection` with the topology cache.
+        """
+        balancer_connection_1, balancer_connection_2 = Mock(), Mock()
+        pyodbc.connect.side_effect = [
+            balancer_connection_1, 'connection1', 'connection2',
+            balancer_connection_2, 'connection3',
+        ]
+        get_node_address_list.return_value = ['node1']
+        time.time.return_value = 100.0
+
+        self.assertEqual('connection1', get_connection(dsn='TestDSN'))
+        self.assertEqual('connection2', get_connection(dsn='TestDSN'))
+
+        time.time.return_value = 401.0
+        self.assertEqual('connection3', get_connection(dsn='TestDSN'))
+
+        self.assertEqual([
+            call(dsn='TestDSN'),
+            call(dsn='TestDSN', servername='node1'),
+            call(dsn='TestDSN', servername='node1'),
+            call(dsn='TestDSN'),
+            call(dsn='TestDSN', servername='node1'),
+        ], pyodbc.connect.call_args_list)
+        self.assertEqual([
+            call(balancer_connection_1), call(balancer_connection_2)
+        ], get_node_address_list.call_args_list)
+        balancer_connection_1.close.assert_called_once_with()
+
+    @patch('pyvertica.connection._get_node_address_list')
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_cached_node_down(
+            self, pyodbc, get_node_address_list):
+        """
+        Test :py:func:`.get_connection` when the cached node is down.
+        """
+        balancer_connection = Mock()
+        pyodbc.connect.side_effect = [
+            Exception('node down'), balancer_connection, 'connection']
+        get_node_address_list.return_value = ['node2']
+        _topology_cache[(('dsn', 'TestDSN'),)] = (float('inf'), ['node1'])
+
+        self.assertEqual('connection', get_connection(dsn='TestDSN'))
+
+        self.assertEqual([
+            call(dsn='TestDSN', servername='node1'),
+            call(dsn='TestDSN'),
+            call(dsn='TestDSN', servername='node2'),
+        ], pyodbc.connect.call_args_list)
+        get_node_address_list.assert_called_once_with(balancer_connection)
+        self.assertEqual(
+            ['node2'], _topology_cache[(('dsn', 'TestDSN'),)][1])
+
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_failover(self, pyodbc):
+        """
+        Test :py:func:`.get_connection` when the first node fails.
+        """
+        pyodbc.connect.side_effect = [Exception('unreachable'), 'connection']
+        _topology_cache[(('dsn', 'TestDSN'),)] = (
+            float('inf'), ['node1', 'node2'])
+
+        self.assertEqual(
+            'connection',
+            get_connection(
+                node_selector=lambda l, k: l,
+                connect_timeout=5,
+                dsn='TestDSN',
+            )
+        )
+
+        self.assertEqual([
+            call(dsn='TestDSN', servername='node1', timeout=5),
+            call(dsn='TestDSN', servername='node2', timeout=5),
+        ], pyodbc.connect.call_args_list)
+        self.assertEqual(['node1'], _node_blacklist.keys())
+        self.assertEqual(1, _node_blacklist['node1'][1])
+
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_blacklisted(self, pyodbc):
+        """
+        Test :py:func:`.get_connection` trying a blacklisted node last.
+        """
+        _topology_cache[(('dsn', 'TestDSN'),)] = (
+            float('inf'), ['node1', 'node2'])
+        _node_blacklist['node1'] = (float('inf'), 1)
+        _node_blacklist['node2'] = (0, 3)
+
+        get_connection(node_selector=lambda l, k: l, dsn='TestDSN')
+
+        pyodbc.connect.assert_called_once_with(
+            dsn='TestDSN', servername='node2')
+        self.assertEqual(['node1'], _node_blacklist.keys())
+
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_retry_budget(self, pyodbc):
+        """
+        Test :py:func:`.get_connection` when the retry budget is spent.
+        """
+        _topology_cache[(('dsn', 'TestDSN'),)] = (float('inf'), ['node1'])
+
+        self.assertRaises(
+            NodeConnectionError,
+            get_connection,
+            retry_budget=0,
+            dsn='TestDSN',
+        )
+        self.assertEqual(0, pyodbc.connect.call_count)
+
+    @patch('pyvertica.connection.time')
+    def test__blacklist_node(self, time):
+        """
+        Test :py:func:`._blacklist_node`.
+        """
+        time.time.return_value = 100.0
+
+        blacklisted_until_list = []
+        for i in range(7):
+            _blacklist_node('node1')
+            blacklisted_until_list.append(_node_blacklist['node1'][0])
+
+        self.assertEqual(
+            [130.0, 160.0, 220.0, 340.0, 580.0, 1060.0, 1060.0],
+            blacklisted_until_list
+        )
+        self.assertEqual(7, _node_blacklist['node1'][1])
+
+    @patch('pyvertica.connection.random.sample', lambda l, n: list(l))
+    @patch('pyvertica.connection._get_node_address_list')
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_list(self, pyodbc, get_node_address_list):
+        """
+        Test :py:func:`.get_connection_list`.
+        """
+        balancer_connection = Mock()
+        pyodbc.connect.side_effect = [
+            balancer_connection, 'connection1', 'connection2', 'connection3']
+        get_node_address_list.return_value = ['node1', 'node2']
+
+        connection_list = get_connection_list(3, dsn='TestDSN')
+
+        self.assertEqual([
+            call(dsn='TestDSN'),
+            call(dsn='TestDSN', servername='node1'),
+            call(dsn='TestDSN', servername='node2'),
+            call(dsn='TestDSN', servername='node1'),
+        ], pyodbc.connect.call_args_list)
+        get_node_address_list.assert_called_once_with(balancer_connection)
+        balancer_connection.close.assert_called_once_with()
+
+        self.assertEqual(
+            ['connection1', 'connection2', 'connection3'], connection_list)
+
+    @patch('pyvertica.connection._get_node_address_list')
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_node_selector(
+            self, pyodbc, get_node_address_list):
+        """
+        Test :py:func:`.get_connection` with a node selector.
+        """
+        get_node_address_list.return_value = ['node1', 'node2']
+        node_selector = Mock(return_value=['node2', 'node1'])
+
+        get_connection(
+            topology_cache_ttl=0, node_selector=node_selector, dsn='TestDSN')
+
+        node_selector.assert_called_once_with(
+            ['node1', 'node2'], {'dsn': 'TestDSN'})
+        self.assertEqual(
+            call(dsn='TestDSN', servername='node2'),
+            pyodbc.connect.call_args
+        )
+        self.assertEqual({}, _topology_cache)
+
+    @patch('pyvertica.connection._get_node_address_list')
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_list_node_selector(
+            self, pyodbc, get_node_address_list):
+        """
+        Test :py:func:`.get_connection_list` with a node selector.
+        """
+        get_node_address_list.return_value = ['node1', 'node2']
+
+        get_connection_list(
+            3, node_selector=RoundRobinNodeSelector(), dsn='TestDSN')
+
+        self.assertEqual([
+            call(dsn='TestDSN'),
+            call(dsn='TestDSN', servername='node1'),
+            call(dsn='TestDSN', servername='node2'),
+            call(dsn='TestDSN', servername='node1'),
+        ], pyodbc.connect.call_args_list)
+
+    @patch('pyvertica.connection._get_node_address_list')
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_list_no_nodes(
+            self, pyodbc, get_node_address_list):
+        """
+        Test :py:func:`.get_connection_list` without ``UP`` nodes.
+        """
+        get_node_address_list.return_value = []
+
+        self.assertRaises(
+            NodeConnectionError, get_connection_list, 2, dsn='TestDSN')
+
+    def test_round_robin_node_selector(self):
+        """
+        Test :py:class:`.RoundRobinNodeSelector`.
+        """
+        node_selector = RoundRobinNodeSelector()
+        node_address_list = ['node1', 'node2', 'node3']
+
+        self.assertEqual(
+            [['node1', 'node2', 'node3'],
+             ['node2', 'node3', 'node1'],
+             ['node3', 'node1', 'node2'],
+             ['node1', 'node2', 'node3']],
+            [node_selector(node_address_list, {}) for i in range(4)]
+        )
+
+    def test_round_robin_node_selector_no_nodes(self):
+        """
+        Test :py:class:`.RoundRobinNodeSelector` without nodes.
+        """
+        self.assertRaises(
+            NodeConnectionError, RoundRobinNodeSelector(), [], {})
+
+    @patch('pyvertica.connection._get_node_load_dict')
+    @patch('pyvertica.connection.pyodbc')
+    def test_select_least_loaded_nodes(self, pyodbc, get_node_load_dict):
+        """
+        Test :py:func:`.select_least_loaded_nodes`.
+        """
+        get_node_load_dict.return_value = {
+            'node1': (2, 10, 100),
+            'node2': (0, 30, 500),
+            'node3': (0, 30, 200),
+        }
+
+        self.assertEqual(
+            ['node3', 'node2', 'node1'],
+            select_least_loaded_nodes(
+                ['node1', 'node2', 'node3'], {'dsn': 'TestDSN'})
+        )
+        pyodbc.connect.assert_called_once_with(
+            servername='node1', dsn='TestDSN')
+        get_node_load_dict.assert_called_once_with(
+            pyodbc.connect.return_value)
+        pyodbc.connect.return_value.close.assert_called_once_with()
+
+    @patch('pyvertica.connection._get_node_load_dict')
+    @patch('pyvertica.connection.pyodbc')
+    def test_select_least_loaded_nodes_blacklisted(
+            self, pyodbc, get_node_load_dict):
+        """
+        Test :py:func:`.select_least_loaded_nodes` with the first node
+        blacklisted.
+        """
+        get_node_load_dict.return_value = {}
+        _blacklist_node('node1')
+
+        select_least_loaded_nodes(['node1', 'node2'], {'dsn': 'TestDSN'})
+
+        pyodbc.connect.assert_called_once_with(
+            servername='node2', dsn='TestDSN')
+
+    @patch('pyvertica.connection._get_node_address_list')
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_node_selector_timeout(
+            self, pyodbc, get_node_address_list):
+        """
+        Test :py:func:`.get_connection` passing the ``connect_timeout`` to the
+        node selector.
+        """
+        get_node_address_list.return_value = ['node1', 'node2']
+        node_selector = Mock(return_value=['node2', 'node1'])
+
+        get_connection(
+            topology_cache_ttl=0,
+            node_selector=node_selector,
+            connect_timeout=5,
+            dsn='TestDSN',
+        )
 
-        self.assertEqual('connection2', connection)
+        node_selector.assert_called_once_with(
+            ['node1', 'node2'], {'dsn': 'TestDSN', 'timeout': 5})
 
-    def test__get_random_node_address(self):
+    @patch('pyvertica.connection.pyodbc')
+    def test_select_least_loaded_nodes_error(self, pyodbc):
         """
-        Test :py:func:`._get_random_node_address`.
+        Test :py:func:`.select_least_loaded_nodes` when the load can not be
+        retrieved.
+        """
+        pyodbc.connect.side_effect = Exception('node down')
+
+        self.assertEqual(
+            ['node1', 'node2'],
+            sorted(select_least_loaded_nodes(['node1', 'node2'], {}))
+        )
+
+    def test__get_node_load_dict(self):
+        """
+        Test :py:func:`._get_node_load_dict`.
         """
         connection = Mock()
         cursor = connection.cursor()
-        row = cursor.fetchone.return_value
+        row = Mock(
+            node_address='node1',
+            copy_count=1,
+            session_count=5,
+            memory_inuse_kb=1024,
+        )
+        cursor.fetchall.return_value = [row]
 
         self.assertEqual(
-            row.node_address,
-            _get_random_node_address(connection)
+            {'node1': (1, 5, 1024)}, _get_node_load_dict(connection))
+        self.assertEqual(('COPY%', 'UP'), cursor.execute.call_args[0][1:])
+
+    @patch('pyvertica.connection._get_node_address_list')
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_list_error(self, pyodbc, get_node_address_list):
+        """
+        Test :py:func:`.get_connection_list` when all the nodes fail.
+        """
+        connection = Mock()
+        pyodbc.connect.side_effect = [
+            Mock(), connection, Exception('unreachable'), Mock()]
+        get_node_address_list.return_value = ['node1']
+
+        self.assertRaises(
+            Exception, get_connection_list, 2, dsn='TestDSN')
+
+        connection.close.assert_called_once_with()
+        self.assertEqual(4, pyodbc.connect.call_count)
+
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_list_no_reconnect(self, pyodbc):
+        """
+        Test :py:func:`.get_connection_list` without reconnect.
+        """
+        connection_list = get_connection_list(
+            2, reconnect=False, dsn='TestDSN')
+
+        self.assertEqual(
+            [call(dsn='TestDSN'), call(dsn='TestDSN')],
+            pyodbc.connect.call_args_list
+        )
+        self.assertEqual(
+            [pyodbc.connect.return_value, pyodbc.connect.return_value],
+            connection_list
+        )
+
+    def test__get_node_address_list(self):
+        """
+        Test :py:func:`._get_node_address_list`.
+        """
+        connection = Mock()
+        cursor = connection.cursor()
+        row_1, row_2 = Mock(), Mock()
+        cursor.fetchall.return_value = [row_1, row_2]
+
+        self.assertEqual(
+            [row_1.node_address, row_2.node_address],
+            _get_node_address_list(connection)
         )
 
         cursor.execute.assert_called_once_with(
             'SELECT node_address FROM nodes WHERE node_state = ? '
-            'ORDER BY RANDOM() LIMIT 1',
+            'ORDER BY RANDOM()',
             'UP'
         )
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+    """
+    Tests for :py:class:`~pyvertica.connection.ConnectionPool`.
+    """
+    def setUp(self):
+        _topology_cache.clear()
+        _node_blacklist.clear()
+
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_reuse(self, pyodbc):
+        """
+        Test :py:meth:`.ConnectionPool.get_connection` re-using a returned
+        connection.
+        """
+        pool = ConnectionPool(reconnect=False, dsn='TestDSN')
+
+        connection = pool.get_connection()
+        pool.put_connection(connection)
+
+        self.assertEqual(connection, pool.get_connection())
+        pyodbc.connect.assert_called_once_with(dsn='TestDSN')
+        connection.rollback.assert_called_once_with()
+        connection.cursor.return_value.execute.assert_called_once_with(
+            'SELECT 1')
+
+    @patch('pyvertica.connection._get_node_address_list')
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_nodes(self, pyodbc, get_node_address_list):
+        """
+        Test :py:meth:`.ConnectionPool.get_connection` spreading the
+        connections over the nodes.
+        """
+        get_node_address_list.return_value = ['node1', 'node2']
+        connection_1, connection_2 = Mock(), Mock()
+        lb_connection = Mock()
+        pyodbc.connect.side_effect = [
+            lb_connection, connection_1, connection_2]
+
+        pool = ConnectionPool(dsn='TestDSN')
+
+        self.assertEqual(connection_1, pool.get_connection())
+        self.assertEqual(connection_2, pool.get_connection())
+        self.assertEqual([
+            call(dsn='TestDSN'),
+            call(servername='node1', dsn='TestDSN'),
+            call(servername='node2', dsn='TestDSN'),
+        ], pyodbc.connect.call_args_list)
+        get_node_address_list.assert_called_once_with(lb_connection)
+        lb_connection.close.assert_called_once_with()
+
+        pool.put_connection(connection_1)
+        pool.put_connection(connection_2)
+
+        self.assertEqual(connection_1, pool.get_connection('node1'))
+
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_timeout(self, pyodbc):
+        """
+        Test :py:meth:`.ConnectionPool.get_connection` when the pool is
+        exhausted.
+        """
+        pool = ConnectionPool(
+            max_size=1, timeout=0.01, reconnect=False, dsn='TestDSN')
+
+        pool.get_connection()
+
+        self.assertRaises(ConnectionPoolError, pool.get_connection)
+
+    @patch('pyvertica.connection.time')
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_idle_eviction(self, pyodbc, time):
+        """
+        Test :py:meth:`.ConnectionPool.get_connection` closing idle
+        connections.
+        """
+        connection_1, connection_2 = Mock(), Mock()
+        pyodbc.connect.side_effect = [connection_1, connection_2]
+        time.time.return_value = 100.0
+
+        pool = ConnectionPool(
+            max_idle_time=60, reconnect=False, dsn='TestDSN')
+        pool.put_connection(pool.get_connection())
+
+        time.time.return_value = 161.0
+
+        self.assertEqual(connection_2, pool.get_connection())
+        connection_1.close.assert_called_once_with()
+
+    @patch('pyvertica.connection.pyodbc')
+    def test_get_connection_broken(self, pyodbc):
+        """
+        Test :py:meth:`.ConnectionPool.get_connection` discarding a connection
+        which fails the validation.
+        """
+        connection_1, connection_2 = Mock(), Mock()
+        pyodbc.connect.side_effect = [connection_1, connection_2]
+
+        pool = ConnectionPool(max_size=1, reconnect=False, dsn='TestDSN')
+        pool.put_connection(pool.get_connection())
+        connection_1.cursor.return_value.execute.side_effect = Exception
+
+        self.assertEqual(connection_2, pool.get_connection())
+        connection_1.close.assert_called_once_with()
+
+    @patch('pyvertica.connection.pyodbc')
+    def test_put_connection_rollback_error(self, pyodbc):
+        """
+        Test :py:meth:`.ConnectionPool.put_connection` when the rollback
+        fails.
+        """
+        connection = pyodbc.connect.return_value
+        connection.rollback.side_effect = Exception
+
+        pool = ConnectionPool(reconnect=False, dsn='TestDSN')
+        pool.put_connection(pool.get_connection())
+
+        connection.close.assert_called_once_with()
+        self.assertEqual({}, pool._in_use_dict)
+        self.assertEqual({}, pool._idle_dict)
+
+    @patch('pyvertica.connection.pyodbc')
+    def test_connection(self, pyodbc):
+        """
+        Test :py:meth:`.ConnectionPool.connection`.
+        """
+        pool = ConnectionPool(reconnect=False, dsn='TestDSN')
+
+        with pool.connection() as connection:
+            self.assertEqual(pyodbc.connect.return_value, connection)
+            self.assertEqual({connection: None}, pool._in_use_dict)
+
+        self.assertEqual({}, pool._in_use_dict)
+        self.assertEqual(1, len(pool._idle_dict[None]))
+
+    @patch('pyvertica.connection.pyodbc')
+    def test_close(self, pyodbc):
+        """
+        Test :py:meth:`.ConnectionPool.close`.
+        """
+        pool = ConnectionPool(reconnect=False, dsn='TestDSN')
+        pool.put_connection(pool.get_connection())
+
+        pool.close()
+
+        pyodbc.connect.return_value.close.assert_called_once_with()
+        self.assertEqual({}, pool._idle_dict)
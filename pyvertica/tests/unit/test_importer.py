@@ -1,6 +1,6 @@
 import unittest2 as unittest
 
-from mock import Mock, call, patch
+from mock import MagicMock, Mock, call, patch
 
 from pyvertica.importer import (
     AlreadyImportedError,
@@ -72,8 +72,58 @@ class BaseImporterTestCase(unittest.TestCase):
             odbc_kwargs={'dsn': 'TestDSN'},
             table_name='schema.test_table',
             column_list=get_db_column_list.return_value,
+            commit_max_rows=None,
+            commit_max_bytes=None,
+            commit_max_seconds=None,
+            commit_callback=importer._check_partial_errors,
+            quarantine_table=None,
+            quarantine_metadata=None,
+            copy_options={},
         )
 
+    @patch('pyvertica.importer.BaseImporter._get_db_column_list')
+    @patch('pyvertica.importer.VerticaBatch')
+    def test__get_vertica_batch_connection(
+            self, VerticaBatch, get_db_column_list):
+        """
+        Test :py:meth:`.BaseImporter._get_vertica_batch` with a connection
+        taken from the connection pool.
+        """
+        importer = self.get_importer(connection_pool=Mock())
+        importer._connection = Mock()
+
+        importer._get_vertica_batch()
+
+        self.assertEqual(
+            importer._connection, VerticaBatch.call_args[1]['connection'])
+        self.assertFalse('odbc_kwargs' in VerticaBatch.call_args[1])
+
+    @patch('pyvertica.importer.BaseImporter._get_db_column_list')
+    @patch('pyvertica.importer.VerticaBatch')
+    def test__get_vertica_batch_quarantine(
+            self, VerticaBatch, get_db_column_list):
+        """
+        Test :py:meth:`.BaseImporter._get_vertica_batch` with a
+        ``max_reject_ratio``.
+        """
+        importer = self.get_importer()
+        importer.table_name = 'test_table'
+        importer.batch_source_name = 'test_source'
+        importer.max_reject_ratio = 0.01
+        importer._batch_import_timestamp = '2012-05-21 00:00:00'
+
+        importer._get_vertica_batch()
+
+        call_kwargs = VerticaBatch.call_args[1]
+        self.assertEqual(
+            'schema.test_table_rejects', call_kwargs['quarantine_table'])
+        self.assertEqual({
+            'batch_source_name': 'test_source',
+            'batch_source_path': 'test/path',
+            'batch_import_timestamp': '2012-05-21 00:00:00',
+        }, call_kwargs['quarantine_metadata'])
+        self.assertEqual({'REJECTEDFILE': True}, call_kwargs['copy_options'])
+
     def test__get_db_column_list(self):
         """
         Test :py:meth:`.BaseImporter._get_db_column_list`.
@@ -182,7 +232,7 @@ class BaseImporterTestCase(unittest.TestCase):
 
         importer._get_vertica_batch.assert_called_once_with()
         importer.get_batch_source_path_exists.assert_called_once_with(
-            'test/path', odbc_kwargs={'dsn': 'TestDSN'})
+            'test/path', odbc_kwargs={'dsn': 'TestDSN'}, connection_pool=None)
         self.assertEqual(
             [call(1), call(2), call(3)],
             importer._get_row_value_list.call_args_list
@@ -197,6 +247,39 @@ class BaseImporterTestCase(unittest.TestCase):
             batch_obj.get_cursor.return_value)
         batch_obj.commit.assert_called_once_with()
 
+    def test_start_import_connection_pool(self):
+        """
+        Test :py:meth:`.BaseImporter.start_import` with a connection pool.
+        """
+        batch_obj = Mock()
+        batch_obj.get_errors.return_value = (False, Mock())
+        connection_pool = Mock()
+        connection = connection_pool.get_connection.return_value
+
+        importer = self.get_importer(
+            reader_obj=[1], connection_pool=connection_pool)
+        importer.get_batch_source_path_exists = Mock(return_value=False)
+        importer._get_row_value_list = Mock(return_value='a')
+        importer._insert_into_history = Mock()
+
+        def get_vertica_batch():
+            self.assertEqual(connection, importer._connection)
+            return batch_obj
+
+        importer._get_vertica_batch = Mock(side_effect=get_vertica_batch)
+
+        importer.start_import()
+
+        importer.get_batch_source_path_exists.assert_called_once_with(
+            'test/path',
+            odbc_kwargs={'dsn': 'TestDSN'},
+            connection_pool=connection_pool,
+        )
+        importer._get_vertica_batch.assert_called_once_with()
+        batch_obj.commit.assert_called_once_with()
+        connection_pool.put_connection.assert_called_once_with(connection)
+        self.assertEqual(None, importer._connection)
+
     @patch('pyvertica.importer.logger')
     def test_start_import_errors(self, logger):
         """
@@ -221,6 +304,81 @@ class BaseImporterTestCase(unittest.TestCase):
             call('Batch error (test/path): Error 2'),
         ], logger.error.call_args_list)
 
+    def test_start_import_quarantine(self):
+        """
+        Test :py:meth:`.BaseImporter.start_import` with rejected rows below
+        the ``max_reject_ratio``.
+        """
+        batch_obj = Mock()
+        batch_obj.get_errors.return_value = (2, Mock())
+        batch_obj.get_rejected_count.return_value = 2
+        batch_obj.get_batch_count.return_value = 200
+
+        importer = self.get_importer(reader_obj=[])
+        importer.max_reject_ratio = 0.01
+        importer.get_batch_source_path_exists = Mock(return_value=False)
+        importer._get_vertica_batch = Mock(return_value=batch_obj)
+        importer._insert_into_history = Mock()
+
+        importer.start_import()
+
+        batch_obj.commit.assert_called_once_with()
+        self.assertEqual(0, batch_obj.rollback.call_count)
+
+    def test__get_errors_accepted(self):
+        """
+        Test :py:meth:`.BaseImporter._get_errors_accepted`.
+        """
+        batch_obj = Mock()
+        batch_obj.get_rejected_count.return_value = 2
+        batch_obj.get_batch_count.return_value = 100
+
+        importer = self.get_importer()
+        self.assertTrue(importer._get_errors_accepted(batch_obj, 0))
+        self.assertFalse(importer._get_errors_accepted(batch_obj, 2))
+
+        importer.max_reject_ratio = 0.05
+        self.assertTrue(importer._get_errors_accepted(batch_obj, 2))
+        # constraint errors
+        self.assertFalse(importer._get_errors_accepted(batch_obj, 3))
+
+        importer.max_reject_ratio = 0.01
+        self.assertFalse(importer._get_errors_accepted(batch_obj, 2))
+
+    def test_start_import_partial_commit_errors(self):
+        """
+        Test :py:meth:`.BaseImporter.start_import` with errors on a partial
+        commit.
+        """
+        batch_obj = Mock()
+        batch_obj.insert_list.side_effect = BatchImportError('errors')
+
+        importer = self.get_importer(reader_obj=[1])
+        importer.get_batch_source_path_exists = Mock(return_value=False)
+        importer._get_row_value_list = Mock(return_value='a')
+        importer._get_vertica_batch = Mock(return_value=batch_obj)
+
+        self.assertRaises(BatchImportError, importer.start_import)
+
+        self.assertEqual(0, batch_obj.get_errors.call_count)
+        self.assertEqual(0, batch_obj.commit.call_count)
+        batch_obj.rollback.assert_called_once_with()
+
+    @patch('pyvertica.importer.logger')
+    def test__check_partial_errors(self, logger):
+        """
+        Test :py:meth:`.BaseImporter._check_partial_errors`.
+        """
+        importer = self.get_importer()
+        importer._kwargs['batch_source_path'] = 'test/path'
+
+        importer._check_partial_errors(0, [])
+        self.assertRaises(
+            BatchImportError, importer._check_partial_errors, 1, ['Error\n'])
+
+        logger.error.assert_called_once_with(
+            'Batch error (test/path): Error')
+
     def test_start_import_already_imported(self):
         """
         Test :py:meth:`.BaseImporter.start_import` with already imported record
@@ -261,6 +419,30 @@ class BaseImporterTestCase(unittest.TestCase):
         )
         cursor.fetchone.assert_called_once_with()
 
+    @patch('pyvertica.importer.get_connection')
+    def test_get_batch_source_path_exists_connection_pool(
+            self, get_connection):
+        """
+        Test :py:meth:`.BaseImporter.get_batch_source_path_exists` with a
+        connection pool.
+        """
+        connection_pool = Mock()
+        connection_pool.connection.return_value = MagicMock()
+        connection = (
+            connection_pool.connection.return_value.__enter__.return_value)
+        connection.cursor.return_value.fetchone.return_value = None
+
+        self.assertFalse(
+            BaseImporter.get_batch_source_path_exists(
+                'test/path', connection_pool=connection_pool)
+        )
+
+        self.assertEqual(0, get_connection.call_count)
+        connection_pool.connection.assert_called_once_with()
+        connection.cursor.assert_called_once_with()
+        self.assertEqual(
+            1, connection_pool.connection.return_value.__exit__.call_count)
+
     @patch('pyvertica.importer.get_connection')
     def test_get_batch_source_path_exists_false(self, get_connection):
         """
@@ -8,6 +8,7 @@ logging.disable(logging.CRITICAL)
 
 from subprocess import CalledProcessError
 from mock import Mock, call, patch
+from pyvertica.connection import ConnectionPool
 from pyvertica.migrate import VerticaMigrator, VerticaMigratorError
 
 
@@ -29,6 +30,52 @@ class VerticaMigratorTestCase(unittest.TestCase):
         migrator = VerticaMigrator('SourceDSN', 'TargetDSN', False, **kwargs)
         return migrator
 
+    def test_close(self):
+        source_pool, target_pool = Mock(), Mock()
+        migrator = self.get_migrator(
+            source_pool=source_pool, target_pool=target_pool)
+        source_con = migrator._source_con = Mock()
+        target_con = migrator._target_con = Mock()
+
+        migrator.close()
+        migrator.close()
+
+        source_pool.put_connection.assert_called_once_with(source_con)
+        target_pool.put_connection.assert_called_once_with(target_con)
+        self.assertEqual(0, source_con.close.call_count)
+        self.assertEqual(None, migrator._source_con)
+        self.assertEqual(None, migrator._target_con)
+
+    def test_close_no_pool(self):
+        migrator = self.get_migrator()
+        source_con = migrator._source_con = Mock()
+
+        migrator.close()
+
+        source_con.close.assert_called_once_with()
+
+    @patch('pyvertica.migrate.VerticaMigrator._sanity_checks')
+    def test___init___sanity_error(self, sanity_checks):
+        source_pool, target_pool = Mock(), Mock()
+        for pool in (source_pool, target_pool):
+            cursor = pool.get_connection.return_value.cursor.return_value
+            cursor.execute.return_value.fetchone.return_value = ['1.2.3.4']
+        sanity_checks.side_effect = VerticaMigratorError
+
+        self.assertRaises(
+            VerticaMigratorError,
+            VerticaMigrator,
+            'SourceDSN',
+            'TargetDSN',
+            source_pool=source_pool,
+            target_pool=target_pool,
+        )
+
+        source_pool.put_connection.assert_called_once_with(
+            source_pool.get_connection.return_value)
+        target_pool.put_connection.assert_called_once_with(
+            target_pool.get_connection.return_value)
+
     ### different sanity options.
     @patch('pyvertica.migrate.VerticaMigrator._source_ip',
            '1.2.3.4',
@@ -481,6 +528,29 @@ class VerticaMigratorTestCase(unittest.TestCase):
         assert(migrator._source.execute.call_args_list[0][0][0].startswith(
             'AT EPOCH'))
 
+    @patch('pyvertica.migrate.VerticaMigrator._source', create=True)
+    @patch('pyvertica.migrate.VerticaMigrator._target', create=True)
+    @patch('pyvertica.migrate.VerticaBatch')
+    @patch('pyvertica.connection.pyodbc')
+    def test__migrate_table_odbc_target_pool(
+            self, pyodbc, VerticaBatch, target, source):
+        # a pool of one connection, which is taken by the migrator
+        target_pool = ConnectionPool(max_size=1, timeout=0, reconnect=False)
+        connection = target_pool.get_connection()
+        migrator = self.get_migrator(target_pool=target_pool)
+        migrator._target_con = connection
+        migrator._commit = True
+        source.fetchone.side_effect = ['1', None]
+        migrator._migrate_table('odbc', 'a.table', {'db': 'db'})
+        VerticaBatch.assert_called_once_with(
+            table_name='a.table',
+            truncate_table=False,
+            connection=connection,
+        )
+
+        migrator.close()
+        self.assertEqual(connection, target_pool.get_connection())
+
     @patch('pyvertica.migrate.VerticaMigrator._source', create=True)
     @patch('pyvertica.migrate.VerticaMigrator._target', create=True)
     @patch('pyvertica.migrate.VerticaBatch', Mock())
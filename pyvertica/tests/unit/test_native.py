@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import unittest2 as unittest
+from datetime import date, datetime, time
+
+from pyvertica.native import get_native_row_encoder
+
+
+class GetNativeRowEncoderTestCase(unittest.TestCase):
+    """
+    Tests for :py:func:`.get_native_row_encoder`.
+    """
+    def test_header(self):
+        """
+        Test the header returned by :py:func:`.get_native_row_encoder`.
+        """
+        header, encode_row = get_native_row_encoder(
+            ['INTEGER', 'varchar(10)', 'CHAR(3)', 'BOOLEAN'])
+
+        self.assertEqual(
+            'NATIVE\n\xff\r\n\x00'
+            '\x15\x00\x00\x00'
+            '\x01\x00'
+            '\x00'
+            '\x04\x00'
+            '\x08\x00\x00\x00'
+            '\xff\xff\xff\xff'
+            '\x03\x00\x00\x00'
+            '\x01\x00\x00\x00',
+            header
+        )
+
+    def test_unsupported_type(self):
+        """
+        Test :py:func:`.get_native_row_encoder` with an unsupported type.
+        """
+        self.assertRaises(
+            ValueError, get_native_row_encoder, ['INTEGER', 'NUMERIC(10,2)'])
+
+    def test_encode_row(self):
+        """
+        Test encoding a row with all supported types.
+        """
+        header, encode_row = get_native_row_encoder([
+            'INTEGER',
+            'FLOAT',
+            'CHAR(4)',
+            'VARCHAR',
+            'BOOLEAN',
+            'DATE',
+            'TIMESTAMP',
+            'TIME',
+            'INTEGER',
+        ])
+
+        self.assertEqual(
+            # row length
+            '\x35\x00\x00\x00'
+            # null bit-field, 9th column is NULL
+            '\x00\x80'
+            '\x01\x00\x00\x00\x00\x00\x00\x00'
+            '\x00\x00\x00\x00\x00\x00\xf8\xbf'
+            'f\xc3\xb6 '
+            '\x04\x00\x00\x00b\xc3\xa4r'
+            '\x01'
+            '\x9a\xfe\xff\xff\xff\xff\xff\xff'
+            '\x45\x42\x0f\x00\x00\x00\x00\x00'
+            '\xc0\x78\xe8\xdd\x00\x00\x00\x00',
+            encode_row([
+                1,
+                -1.5,
+                u'fö',
+                u'bär',
+                True,
+                date(1999, 1, 8),
+                datetime(2000, 1, 1, 0, 0, 1, 5),
+                time(1, 2, 3),
+                None,
+            ])
+        )
+
+    def test_encode_row_fixed(self):
+        """
+        Test encoding rows with only fixed width numeric columns.
+        """
+        header, encode_row = get_native_row_encoder(['INTEGER', 'FLOAT'])
+
+        self.assertEqual(
+            '\x10\x00\x00\x00\x00'
+            '\x03\x00\x00\x00\x00\x00\x00\x00'
+            '\x00\x00\x00\x00\x00\x00\x10\x40',
+            encode_row(iter([3, 4.0]))
+        )
+        self.assertEqual(
+            '\x08\x00\x00\x00\x80'
+            '\x00\x00\x00\x00\x00\x00\x10\x40',
+            encode_row([None, 4.0])
+        )
+
+    def test_encode_char_too_long(self):
+        """
+        Test encoding a value exceeding the ``CHAR`` width.
+        """
+        header, encode_row = get_native_row_encoder(['CHAR(2)'])
+
+        self.assertRaises(ValueError, encode_row, ['abc'])
@@ -26,5 +26,8 @@ setup(
         'logutils',
         'pyodbc',
         'taskthread>=1.3'
-    ]
+    ],
+    extras_require={
+        'async': ['trollius'],
+    }
 )